@@ -1,59 +1,164 @@
-from .base_station import BaseStationClient, ExperimentalCommandProfile
-from .client import ArctisNovaProApi
-from .errors import (
-    ApiRequestError,
-    ArctisNovaError,
-    ConfigDatabaseError,
-    DiscoveryError,
-    InvalidArgumentError,
-    UnsupportedFeatureError,
-)
-from .gamesense import GameSenseClient
-from .models import (
-    AncMode,
-    AncStatus,
-    BatteryStatus,
-    HeadsetConnectionStatus,
-    MicStatus,
-    OledBrightnessStatus,
-    OledFrame,
-    OledLine,
-    PresetChannel,
-    SidetoneStatus,
-    SonarChannel,
-    StreamerSlider,
-    UsbInput,
-    VolumeKnobEvent,
-)
-from .sonar import SonarClient
-from .sniffer import ParsedInputReport, decode_input_report
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Public name -> submodule defining it. Submodules are imported on first attribute access, so
+# `import arctis_nova_api.sniffer` or a tool using only the decoder never pays for requests or sqlite3.
+_EXPORTS: dict[str, str] = {
+    "AsyncSonarClient": "async_sonar",
+    "BaseStationClient": "base_station",
+    "ExperimentalCommandProfile": "base_station",
+    "ArctisNovaProApi": "client",
+    "CommandCoalescer": "commands",
+    "AsyncHttpClient": "core",
+    "HttpClient": "core",
+    "CompiledDecoder": "decoder",
+    "ApiRequestError": "errors",
+    "ArctisNovaError": "errors",
+    "ConfigDatabaseError": "errors",
+    "DiscoveryError": "errors",
+    "InvalidArgumentError": "errors",
+    "UnsupportedFeatureError": "errors",
+    "GameSenseClient": "gamesense",
+    "AncMode": "models",
+    "AncStatus": "models",
+    "BatteryStatus": "models",
+    "HeadsetConnectionStatus": "models",
+    "MicStatus": "models",
+    "OledBrightnessStatus": "models",
+    "OledFrame": "models",
+    "OledLine": "models",
+    "PresetChannel": "models",
+    "SidetoneStatus": "models",
+    "SonarChannel": "models",
+    "SonarChannelLevel": "models",
+    "SonarMixerState": "models",
+    "SonarModeWriteResult": "models",
+    "SonarVolumeSnapshot": "models",
+    "StreamerSlider": "models",
+    "UsbInput": "models",
+    "VolumeKnobEvent": "models",
+    "MockSonarServer": "mock_server",
+    "PresetCatalog": "presets",
+    "decode_input_report": "sniffer",
+    "decode_input_reports": "sniffer",
+    "ParsedInputReport": "sniffer",
+    "SonarClient": "sonar",
+    "AdaptiveScheduler": "state",
+    "FixedIntervalScheduler": "state",
+    "HeadsetState": "state",
+    "HeadsetStateEngine": "state",
+    "PollScheduler": "state",
+    "apply_state_patch": "state_store",
+    "StateDelta": "state_store",
+    "StateSnapshot": "state_store",
+    "VersionedStateStore": "state_store",
+}
+
+if TYPE_CHECKING:
+    from .async_sonar import AsyncSonarClient
+    from .base_station import BaseStationClient, ExperimentalCommandProfile
+    from .client import ArctisNovaProApi
+    from .commands import CommandCoalescer
+    from .core import AsyncHttpClient, HttpClient
+    from .decoder import CompiledDecoder
+    from .errors import (
+        ApiRequestError,
+        ArctisNovaError,
+        ConfigDatabaseError,
+        DiscoveryError,
+        InvalidArgumentError,
+        UnsupportedFeatureError,
+    )
+    from .gamesense import GameSenseClient
+    from .models import (
+        AncMode,
+        AncStatus,
+        BatteryStatus,
+        HeadsetConnectionStatus,
+        MicStatus,
+        OledBrightnessStatus,
+        OledFrame,
+        OledLine,
+        PresetChannel,
+        SidetoneStatus,
+        SonarChannel,
+        SonarChannelLevel,
+        SonarMixerState,
+        SonarModeWriteResult,
+        SonarVolumeSnapshot,
+        StreamerSlider,
+        UsbInput,
+        VolumeKnobEvent,
+    )
+    from .mock_server import MockSonarServer
+    from .presets import PresetCatalog
+    from .sonar import SonarClient
+    from .sniffer import ParsedInputReport, decode_input_report, decode_input_reports
+    from .state import AdaptiveScheduler, FixedIntervalScheduler, HeadsetState, HeadsetStateEngine, PollScheduler
+    from .state_store import StateDelta, StateSnapshot, VersionedStateStore, apply_state_patch
 
 __all__ = [
+    "AdaptiveScheduler",
     "AncMode",
     "ApiRequestError",
     "ArctisNovaError",
     "ArctisNovaProApi",
     "AncStatus",
+    "AsyncHttpClient",
+    "AsyncSonarClient",
     "BatteryStatus",
     "BaseStationClient",
+    "CommandCoalescer",
+    "CompiledDecoder",
     "ConfigDatabaseError",
     "DiscoveryError",
     "ExperimentalCommandProfile",
+    "FixedIntervalScheduler",
     "GameSenseClient",
+    "HttpClient",
     "InvalidArgumentError",
     "MicStatus",
+    "MockSonarServer",
     "OledBrightnessStatus",
     "OledFrame",
     "OledLine",
+    "PollScheduler",
     "PresetChannel",
     "HeadsetConnectionStatus",
+    "HeadsetState",
+    "HeadsetStateEngine",
     "SidetoneStatus",
     "SonarChannel",
+    "SonarChannelLevel",
     "SonarClient",
+    "SonarMixerState",
+    "SonarModeWriteResult",
+    "SonarVolumeSnapshot",
+    "StateDelta",
+    "StateSnapshot",
     "StreamerSlider",
     "UnsupportedFeatureError",
     "UsbInput",
+    "VersionedStateStore",
     "VolumeKnobEvent",
     "ParsedInputReport",
+    "PresetCatalog",
     "decode_input_report",
+    "apply_state_patch",
+    "decode_input_reports",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
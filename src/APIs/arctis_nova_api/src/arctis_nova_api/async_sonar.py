@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from .core import DEFAULT_POOL_SIZE, AsyncHttpClient
+from .models import (
+    PresetChannel,
+    SonarChannel,
+    SonarMixerState,
+    SonarModeWriteResult,
+    SonarPreset,
+    SonarVolumeSnapshot,
+    StreamerSlider,
+)
+from .sonar import SonarClient
+
+
+class AsyncSonarClient:
+    """
+    asyncio counterpart of `SonarClient`.
+
+    Calls run on the `AsyncHttpClient` worker pool over the wrapped client's
+    keep-alive session, so independent reads can be awaited concurrently while
+    endpoint, mode and preset caches stay shared with the synchronous client.
+    """
+
+    def __init__(self, sonar: SonarClient, http: AsyncHttpClient | None = None) -> None:
+        self.sync = sonar
+        self._http = http or AsyncHttpClient(http=sonar.http_client)
+
+    @classmethod
+    async def create(
+        cls,
+        core_props_path: Path | None = None,
+        sonar_db_path: Path | None = None,
+        timeout: float = 5.0,
+        endpoint_cache_path: Path | None = None,
+        max_workers: int = DEFAULT_POOL_SIZE,
+    ) -> AsyncSonarClient:
+        http = AsyncHttpClient(max_workers=max_workers, timeout=timeout)
+        sonar = await http.run(
+            SonarClient,
+            core_props_path=core_props_path,
+            sonar_db_path=sonar_db_path,
+            timeout=timeout,
+            endpoint_cache_path=endpoint_cache_path,
+            http_client=http.http,
+        )
+        return cls(sonar, http)
+
+    async def refresh_discovery(self) -> None:
+        await self._http.run(self.sync.refresh_discovery)
+
+    async def is_streamer_mode(self, use_cache: bool = False) -> bool:
+        return await self._http.run(self.sync.is_streamer_mode, use_cache=use_cache)
+
+    async def set_streamer_mode(self, enabled: bool) -> bool:
+        return await self._http.run(self.sync.set_streamer_mode, enabled)
+
+    async def get_volume_data(self, streamer: bool | None = None) -> dict[str, Any]:
+        return await self._http.run(self.sync.get_volume_data, streamer=streamer)
+
+    async def get_volume_snapshot(self) -> SonarVolumeSnapshot:
+        return await self._http.run(self.sync.get_volume_snapshot)
+
+    async def get_channel_volume(
+        self,
+        channel: SonarChannel,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+        streamer: bool | None = None,
+    ) -> float:
+        return await self._http.run(self.sync.get_channel_volume, channel, streamer_slider, streamer)
+
+    async def set_channel_volume(
+        self,
+        channel: SonarChannel,
+        volume: float,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+        streamer: bool | None = None,
+    ) -> dict[str, Any]:
+        return await self._http.run(self.sync.set_channel_volume, channel, volume, streamer_slider, streamer)
+
+    async def get_channel_mute(
+        self,
+        channel: SonarChannel,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+        streamer: bool | None = None,
+    ) -> bool:
+        return await self._http.run(self.sync.get_channel_mute, channel, streamer_slider, streamer)
+
+    async def set_channel_mute(
+        self,
+        channel: SonarChannel,
+        muted: bool,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+        streamer: bool | None = None,
+    ) -> dict[str, Any]:
+        return await self._http.run(self.sync.set_channel_mute, channel, muted, streamer_slider, streamer)
+
+    async def set_channel_volume_all_modes(self, channel: SonarChannel, volume: float) -> SonarModeWriteResult:
+        return await self._http.run(self.sync.set_channel_volume_all_modes, channel, volume)
+
+    async def set_channel_mute_all_modes(self, channel: SonarChannel, muted: bool) -> SonarModeWriteResult:
+        return await self._http.run(self.sync.set_channel_mute_all_modes, channel, muted)
+
+    async def get_chat_mix(self) -> dict[str, Any]:
+        return await self._http.run(self.sync.get_chat_mix)
+
+    async def set_chat_mix(self, balance: float) -> dict[str, Any]:
+        return await self._http.run(self.sync.set_chat_mix, balance)
+
+    async def get_routing_data(self) -> dict[str, Any] | list[Any]:
+        return await self._http.run(self.sync.get_routing_data)
+
+    async def get_routed_apps_by_channel(self) -> dict[str, list[str]]:
+        return await self._http.run(self.sync.get_routed_apps_by_channel)
+
+    async def list_presets(self, channel: PresetChannel) -> list[SonarPreset]:
+        return await self._http.run(self.sync.list_presets, channel)
+
+    async def list_favorite_presets(self, channel: PresetChannel) -> list[SonarPreset]:
+        return await self._http.run(self.sync.list_favorite_presets, channel)
+
+    async def list_favorite_presets_by_channel(self) -> dict[PresetChannel, list[SonarPreset]]:
+        return await self._http.run(self.sync.list_favorite_presets_by_channel)
+
+    async def get_selected_preset(self, channel: PresetChannel) -> SonarPreset | None:
+        return await self._http.run(self.sync.get_selected_preset, channel)
+
+    async def get_selected_presets_all(self) -> dict[PresetChannel, SonarPreset | None]:
+        return await self._http.run(self.sync.get_selected_presets_all)
+
+    async def select_preset(self, preset_id: str) -> None:
+        await self._http.run(self.sync.select_preset, preset_id)
+
+    async def select_preset_for_channel(self, channel: PresetChannel, preset_name: str) -> SonarPreset:
+        return await self._http.run(self.sync.select_preset_for_channel, channel, preset_name)
+
+    async def read_mixer_state(self, include_chat_mix: bool = True) -> SonarMixerState:
+        """
+        Read volumes, chat mix, routed apps and selected presets concurrently.
+
+        Total latency is that of the slowest read rather than their sum.
+        """
+        volumes, chat_mix, routed_apps, selected_presets = await asyncio.gather(
+            self.get_volume_snapshot(),
+            self.get_chat_mix() if include_chat_mix else _none(),
+            self.get_routed_apps_by_channel(),
+            self.get_selected_presets_all(),
+            return_exceptions=True,
+        )
+        return SonarMixerState(
+            volumes=None if isinstance(volumes, Exception) else volumes,
+            chat_mix=None if isinstance(chat_mix, Exception) else chat_mix,
+            routed_apps=None if isinstance(routed_apps, Exception) else routed_apps,
+            selected_presets=None if isinstance(selected_presets, Exception) else selected_presets,
+        )
+
+    def close(self) -> None:
+        self._http.close()
+        self.sync.close()
+
+
+async def _none() -> None:
+    return None
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+import queue
+import threading
 import time
-from typing import Any, Protocol
+from typing import Any, Callable, Protocol, TypeVar
 
+from .decoder import CompiledDecoder
 from .errors import DiscoveryError, InvalidArgumentError, UnsupportedFeatureError
+from .hid_reader import DEFAULT_EVENT_BUFFER_SIZE, EventRing, HidReportReader
 from .models import (
     AncMode,
     AncStatus,
     BatteryStatus,
     DeviceEvent,
-    HeadsetConnectionStatus,
     MicStatus,
     OledBrightnessStatus,
     SidetoneStatus,
@@ -21,6 +24,9 @@ from .models import (
 STEELSERIES_VENDOR_ID = 0x1038
 SUPPORTED_PRODUCT_IDS = (0x12CB, 0x12CD, 0x12E0, 0x12E5, 0x225D)
 INTERFACE_NUMBER = 4
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 256
+
+E = TypeVar("E", bound=DeviceEvent)
 
 
 @dataclass(frozen=True)
@@ -77,15 +83,26 @@ class HidBackendLike(Protocol):
 
 
 class BaseStationClient:
-    """Direct USB control for Arctis Nova Pro base station."""
+    """
+    Direct USB control for Arctis Nova Pro base station.
+
+    By default events are read by polling each HID path from the calling
+    thread. With `background_reader=True`, `connect()` starts one blocking
+    reader thread per opened path instead; parsed events land in a bounded
+    ring buffer (`event_buffer_size`) drained by `get_pending_events`, and can
+    also be pushed to `subscribe` callbacks or `subscribe_queue` queues.
+    """
 
     def __init__(
         self,
         hid_backend: HidBackendLike | None = None,
         command_profile: ExperimentalCommandProfile | None = None,
+        background_reader: bool = False,
+        event_buffer_size: int = DEFAULT_EVENT_BUFFER_SIZE,
     ) -> None:
         self._hid_backend = hid_backend or _load_hid_backend()
         self._command_profile = command_profile or ExperimentalCommandProfile()
+        self._decoder = CompiledDecoder(self._command_profile)
         self._oled_device: HidDeviceLike | None = None
         self._info_device: HidDeviceLike | None = None
         self._event_devices: list[HidDeviceLike] = []
@@ -96,11 +113,21 @@ class BaseStationClient:
         self._last_volume_status: VolumeKnobEvent | None = None
         self._last_usb_input: UsbInput | None = None
         self._last_oled_brightness: int | None = None
+        self._background_reader = background_reader
+        self._readers: list[HidReportReader] = []
+        self._events: EventRing[DeviceEvent] = EventRing(event_buffer_size)
+        self._reports: EventRing[tuple[HidDeviceLike, list[int]]] = EventRing(event_buffer_size)
+        self._subscribers_lock = threading.Lock()
+        self._subscribers: list[Callable[[DeviceEvent], None]] = []
+        self._queue_subscriptions: dict[queue.Queue[DeviceEvent], Callable[[], None]] = {}
 
     def connect(self) -> None:
-        interfaces: list[dict[str, Any]] = []
-        for pid in SUPPORTED_PRODUCT_IDS:
-            interfaces.extend(self._hid_backend.enumerate(STEELSERIES_VENDOR_ID, pid))
+        # One vendor-wide enumeration (product id 0 matches any) instead of one per supported product.
+        interfaces = [
+            d
+            for d in self._hid_backend.enumerate(STEELSERIES_VENDOR_ID, 0)
+            if int(d.get("product_id", -1)) in SUPPORTED_PRODUCT_IDS
+        ]
 
         candidates = [d for d in interfaces if int(d.get("interface_number", -1)) == INTERFACE_NUMBER]
         if len(candidates) < 1:
@@ -113,8 +140,11 @@ class BaseStationClient:
         self._event_devices = [self._info_device]
         if self._oled_device is not self._info_device:
             self._event_devices.append(self._oled_device)
+        if self._background_reader:
+            self.start_background_reader()
 
     def close(self) -> None:
+        self.stop_background_reader()
         if self._oled_device:
             self._oled_device.close()
         if self._info_device:
@@ -157,7 +187,76 @@ class BaseStationClient:
         report[6 : 6 + len(payload)] = payload
         self._require_oled().send_feature_report(report)
 
+    @property
+    def background_reader_running(self) -> bool:
+        return any(reader.is_alive() for reader in self._readers)
+
+    @property
+    def dropped_events(self) -> int:
+        """Events overwritten in the ring buffer before `get_pending_events` drained them."""
+        return self._events.dropped
+
+    def start_background_reader(self) -> None:
+        """Start one blocking reader thread per opened HID path (no-op if already running)."""
+        self._require_info()
+        if self.background_reader_running:
+            return
+        self._readers = [
+            HidReportReader(dev, lambda data, dev=dev: self._on_report(dev, data), name=f"arctis-hid-reader-{index}")
+            for index, dev in enumerate(self._event_devices)
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def stop_background_reader(self) -> None:
+        readers, self._readers = self._readers, []
+        for reader in readers:
+            reader.stop()
+
+    def subscribe(self, callback: Callable[[DeviceEvent], None]) -> Callable[[], None]:
+        """
+        Call `callback(event)` from the reader thread for every parsed event.
+
+        Only fires in background reader mode. Exceptions raised by the callback
+        are swallowed so one subscriber cannot stop the reader. Returns a
+        function that removes the subscription.
+        """
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._subscribers_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def subscribe_queue(self, maxsize: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE) -> queue.Queue[DeviceEvent]:
+        """Return a queue fed with parsed events; when full, the oldest event is discarded."""
+        events: queue.Queue[DeviceEvent] = queue.Queue(maxsize=maxsize)
+
+        def put(event: DeviceEvent) -> None:
+            while True:
+                try:
+                    events.put_nowait(event)
+                    return
+                except queue.Full:
+                    try:
+                        events.get_nowait()
+                    except queue.Empty:
+                        pass
+
+        self._queue_subscriptions[events] = self.subscribe(put)
+        return events
+
+    def unsubscribe_queue(self, events: queue.Queue[DeviceEvent]) -> None:
+        unsubscribe = self._queue_subscriptions.pop(events, None)
+        if unsubscribe is not None:
+            unsubscribe()
+
     def get_pending_events(self) -> list[DeviceEvent]:
+        if self._readers:
+            return self._events.drain()
         events: list[DeviceEvent] = []
         while True:
             polled = self._poll_event_devices_once(timeout_ms=1)
@@ -178,13 +277,7 @@ class BaseStationClient:
         if refresh_timeout_seconds <= 0:
             return self._last_battery_status
 
-        deadline = time.monotonic() + refresh_timeout_seconds
-        while time.monotonic() < deadline:
-            for parsed in self._poll_event_devices_once(timeout_ms=20):
-                self._update_cached_state(parsed)
-                if isinstance(parsed, BatteryStatus):
-                    return parsed
-        return self._last_battery_status
+        return self._await_event(BatteryStatus, refresh_timeout_seconds) or self._last_battery_status
 
     def request_battery_status(self, timeout_seconds: float = 0.5) -> BatteryStatus | None:
         """
@@ -194,8 +287,10 @@ class BaseStationClient:
             raise UnsupportedFeatureError(
                 "Battery query command is not configured. Provide ExperimentalCommandProfile.battery_query_command."
             )
+        # Snapshot before writing: a reply that lands before the wait starts still counts.
+        since = self._events.seq
         self._require_info().write(self._pad_64(self._command_profile.battery_query_command))
-        return self.get_battery_status(refresh_timeout_seconds=timeout_seconds)
+        return self._await_event(BatteryStatus, timeout_seconds, since) or self._last_battery_status
 
     def get_headset_battery(self, refresh_timeout_seconds: float = 0.0) -> int | None:
         status = self.get_battery_status(refresh_timeout_seconds=refresh_timeout_seconds)
@@ -223,13 +318,7 @@ class BaseStationClient:
         if refresh_timeout_seconds <= 0:
             return self._last_sidetone_status
 
-        deadline = time.monotonic() + refresh_timeout_seconds
-        while time.monotonic() < deadline:
-            for parsed in self._poll_event_devices_once(timeout_ms=20):
-                self._update_cached_state(parsed)
-                if isinstance(parsed, SidetoneStatus):
-                    return parsed
-        return self._last_sidetone_status
+        return self._await_event(SidetoneStatus, refresh_timeout_seconds) or self._last_sidetone_status
 
     def get_sidetone_label(self) -> str | None:
         if self._last_sidetone_status is None:
@@ -243,33 +332,22 @@ class BaseStationClient:
         if refresh_timeout_seconds <= 0:
             return self._last_anc_status
 
-        deadline = time.monotonic() + refresh_timeout_seconds
-        while time.monotonic() < deadline:
-            for parsed in self._poll_event_devices_once(timeout_ms=20):
-                self._update_cached_state(parsed)
-                if isinstance(parsed, AncStatus):
-                    return parsed
-        return self._last_anc_status
+        return self._await_event(AncStatus, refresh_timeout_seconds) or self._last_anc_status
 
     def get_mic_status(self, refresh_timeout_seconds: float = 0.0) -> MicStatus | None:
         if refresh_timeout_seconds <= 0:
             return self._last_mic_status
 
-        deadline = time.monotonic() + refresh_timeout_seconds
-        while time.monotonic() < deadline:
-            for parsed in self._poll_event_devices_once(timeout_ms=20):
-                self._update_cached_state(parsed)
-                if isinstance(parsed, MicStatus):
-                    return parsed
-        return self._last_mic_status
+        return self._await_event(MicStatus, refresh_timeout_seconds) or self._last_mic_status
 
     def request_sidetone_status(self, timeout_seconds: float = 0.5) -> SidetoneStatus | None:
         if not self._command_profile.sidetone_get_command:
             raise UnsupportedFeatureError(
                 "Sidetone get command is not configured. Provide ExperimentalCommandProfile.sidetone_get_command."
             )
+        since = self._events.seq
         self._require_info().write(self._pad_64(self._command_profile.sidetone_get_command))
-        return self.get_sidetone_status(refresh_timeout_seconds=timeout_seconds)
+        return self._await_event(SidetoneStatus, timeout_seconds, since) or self._last_sidetone_status
 
     def set_sidetone_level(self, level: int) -> None:
         if level < 0:
@@ -295,6 +373,11 @@ class BaseStationClient:
                 "ANC status command is not configured. Provide ExperimentalCommandProfile with anc_status_command."
             )
         dev = self._require_info()
+        if self._readers:
+            since = self._reports.seq
+            dev.write(self._pad_64(self._command_profile.anc_status_command))
+            report = self._reports.wait_for(lambda item: item[0] is dev, since, 0.1)
+            return bytes(report[1]) if report else b""
         dev.write(self._pad_64(self._command_profile.anc_status_command))
         return bytes(dev.read(64, timeout_ms=100))
 
@@ -314,17 +397,11 @@ class BaseStationClient:
             raise UnsupportedFeatureError(
                 "USB input status command is not configured. Provide ExperimentalCommandProfile.usb_input_status_command."
             )
-        dev = self._require_info()
-        dev.write(self._pad_64(self._command_profile.usb_input_status_command))
-        deadline = time.monotonic() + timeout_seconds
-        while time.monotonic() < deadline:
-            data = dev.read(64, timeout_ms=20)
-            if not data:
-                continue
-            usb_input = self._extract_usb_input_from_report(data)
-            if usb_input is not None:
-                self._last_usb_input = usb_input
-                return usb_input
+        usb_input = self._request_report_value(
+            self._command_profile.usb_input_status_command, self._extract_usb_input_from_report, timeout_seconds
+        )
+        if usb_input is not None:
+            self._last_usb_input = usb_input
         return self._last_usb_input
 
     def get_oled_brightness(self) -> int | None:
@@ -335,59 +412,82 @@ class BaseStationClient:
             raise UnsupportedFeatureError(
                 "OLED brightness status command is not configured. Provide ExperimentalCommandProfile.oled_brightness_status_command."
             )
+        value = self._request_report_value(
+            self._command_profile.oled_brightness_status_command, self._extract_brightness_from_report, timeout_seconds
+        )
+        if value is not None:
+            self._last_oled_brightness = value
+        return self._last_oled_brightness
+
+    def _await_event(self, event_type: type[E], timeout_seconds: float, since: int | None = None) -> E | None:
+        """
+        Wait up to `timeout_seconds` for a fresh event of `event_type`.
+
+        In reader mode, events appended after sequence number `since` count as
+        fresh (default: only events arriving from now on).
+        """
+        if self._readers:
+            found = self._events.wait_for(
+                lambda event: isinstance(event, event_type),
+                self._events.seq if since is None else since,
+                timeout_seconds,
+            )
+            return found  # type: ignore[return-value]
+        deadline = time.monotonic() + timeout_seconds
+        while time.monotonic() < deadline:
+            for parsed in self._poll_event_devices_once(timeout_ms=20):
+                self._update_cached_state(parsed)
+                if isinstance(parsed, event_type):
+                    return parsed
+        return None
+
+    def _request_report_value(
+        self,
+        command: list[int],
+        extract: Callable[[list[int]], Any],
+        timeout_seconds: float,
+    ) -> Any:
+        """Write `command` to the info device and return the first non-None `extract(report)` reply."""
         dev = self._require_info()
-        dev.write(self._pad_64(self._command_profile.oled_brightness_status_command))
+        if self._readers:
+            since = self._reports.seq
+            dev.write(self._pad_64(command))
+            report = self._reports.wait_for(
+                lambda item: item[0] is dev and extract(item[1]) is not None, since, timeout_seconds
+            )
+            return extract(report[1]) if report else None
+        dev.write(self._pad_64(command))
         deadline = time.monotonic() + timeout_seconds
         while time.monotonic() < deadline:
             data = dev.read(64, timeout_ms=20)
             if not data:
                 continue
-            value = self._extract_brightness_from_report(data)
+            value = extract(data)
             if value is not None:
-                self._last_oled_brightness = value
                 return value
-        return self._last_oled_brightness
+        return None
+
+    def _on_report(self, dev: HidDeviceLike, data: list[int]) -> None:
+        # Runs on a reader thread.
+        self._reports.append((dev, data))
+        parsed = self._decoder.decode(data)
+        if parsed is None:
+            return
+        self._update_cached_state(parsed)
+        self._events.append(parsed)
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(parsed)
+            except Exception:
+                continue
 
     def _open(self, path: Any) -> HidDeviceLike:
         dev = self._hid_backend.device()
         dev.open_path(path)
         return dev
 
-    @staticmethod
-    def _parse_event(data: list[int], profile: ExperimentalCommandProfile | None = None) -> DeviceEvent | None:
-        if len(data) < 5 or data[0] not in (0x06, 0x07):
-            return None
-        if data[1] == 0x25:
-            return VolumeKnobEvent(volume=max(0, 0x38 - data[2]))
-        if data[1] == 0xB5:
-            return HeadsetConnectionStatus(wireless=data[4] == 8, bluetooth=data[3] == 1, bluetooth_on=data[2] == 4)
-        if data[1] == 0xB7:
-            return BatteryStatus(headset=data[2], charging=data[3])
-        # OLED brightness event from captured packets:
-        # 07 85 <level> 00 ...
-        if data[1] == 0x85:
-            level = int(data[2])
-            if 1 <= level <= 10:
-                return OledBrightnessStatus(level=level)
-        if profile and profile.sidetone_event_command_id is not None and data[1] == profile.sidetone_event_command_id:
-            idx = profile.sidetone_value_index
-            if 0 <= idx < len(data):
-                return SidetoneStatus(level=int(data[idx]))
-        if profile and profile.anc_event_command_id is not None and data[1] == profile.anc_event_command_id:
-            idx = profile.anc_value_index
-            if 0 <= idx < len(data):
-                value = int(data[idx])
-                value_map = profile.anc_value_map or {0: AncMode.OFF, 1: AncMode.TRANSPARENCY, 2: AncMode.ANC}
-                if value in value_map:
-                    return AncStatus(mode=value_map[value])
-        if profile and profile.mic_event_command_id is not None and data[1] == profile.mic_event_command_id:
-            idx = profile.mic_value_index
-            if 0 <= idx < len(data):
-                value = int(data[idx])
-                muted_values = profile.mic_muted_values or {1}
-                return MicStatus(enabled=value not in muted_values)
-        return None
-
     def _update_cached_state(self, event: DeviceEvent) -> None:
         if isinstance(event, BatteryStatus):
             self._last_battery_status = event
@@ -421,7 +521,7 @@ class BaseStationClient:
             data = dev.read(64, timeout_ms=timeout_ms)
             if not data:
                 continue
-            parsed = self._parse_event(data, self._command_profile)
+            parsed = self._decoder.decode(data)
             if parsed:
                 events.append(parsed)
         return events
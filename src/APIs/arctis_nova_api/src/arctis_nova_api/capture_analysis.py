@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .capture_format import RAW_SIZE, datetime_to_ns, is_capture_file, load_numpy
+from .capture_parser import CaptureRecord, iter_capture, open_capture
+
+# Bytes 0 (report header) and 1 (command id) identify a report; values start at byte 2.
+FIRST_VALUE_INDEX = 2
+
+
+@dataclass(frozen=True)
+class ReportMatrix:
+    """
+    Capture loaded as NumPy arrays for vectorized analysis.
+
+    `reports` is an (N, 64) uint8 matrix with one HID report per row;
+    `ts_ns` and `path_ids` are the matching (N,) wall-clock timestamps and
+    indices into `paths`.
+    """
+
+    reports: Any
+    ts_ns: Any
+    path_ids: Any
+    paths: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return int(self.reports.shape[0])
+
+    @property
+    def commands(self) -> Any:
+        return self.reports[:, 1]
+
+    def for_command(self, command: int) -> ReportMatrix:
+        mask = self.reports[:, 1] == command
+        return ReportMatrix(self.reports[mask], self.ts_ns[mask], self.path_ids[mask], self.paths)
+
+
+@dataclass(frozen=True)
+class ChangePoint:
+    """Byte positions of one command whose value differs between two action windows."""
+
+    command: int
+    window_before: int
+    window_after: int
+    positions: tuple[int, ...]
+    before: tuple[int, ...]
+    after: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class ValueIndexCandidate:
+    """
+    A byte position that looks like the value field of a status event.
+
+    `values` are listed in order of first appearance, which matches the order
+    controls were toggled during a capture session. `stability` is the share
+    of action windows in which the byte holds a single value.
+    """
+
+    command: int
+    value_index: int
+    values: tuple[int, ...]
+    counts: tuple[int, ...]
+    stability: float
+
+    def value_map(self, labels: Sequence[Any]) -> dict[int, Any]:
+        """Pair observed values with labels given in toggle order."""
+        return dict(zip(self.values, labels))
+
+    def profile_fields(self, prefix: str, labels: Sequence[Any] | None = None) -> dict[str, Any]:
+        """
+        Keyword arguments for `ExperimentalCommandProfile`, e.g. prefix "anc".
+
+        The value map is only included when `labels` is given.
+        """
+        fields: dict[str, Any] = {
+            f"{prefix}_event_command_id": self.command,
+            f"{prefix}_value_index": self.value_index,
+        }
+        if labels is not None:
+            fields[f"{prefix}_value_map"] = self.value_map(labels)
+        return fields
+
+
+def load_report_matrix(source: Path | Iterable[CaptureRecord]) -> ReportMatrix:
+    """
+    Load a capture file or record stream into a `ReportMatrix`.
+
+    Binary captures are copied out of the memory map in one vectorized step;
+    JSONL logs and record iterables are packed row by row into one buffer.
+    """
+    np = load_numpy()
+    if isinstance(source, Path) and is_capture_file(source):
+        with open_capture(source) as capture:
+            array = capture.to_numpy()
+            delta = capture.wall_anchor_ns - capture.mono_anchor_ns
+            matrix = ReportMatrix(
+                reports=np.array(array["raw"], dtype=np.uint8),
+                ts_ns=array["ts_ns"].astype(np.int64) + delta,
+                path_ids=array["path_id"].astype(np.uint16),
+                paths=capture.paths,
+            )
+            del array
+            return matrix
+
+    records = iter_capture(source) if isinstance(source, Path) else source
+    raw = bytearray()
+    timestamps: list[int] = []
+    path_ids: list[int] = []
+    paths: dict[str, int] = {}
+    for rec in records:
+        report = bytes.fromhex(rec.raw_hex)[:RAW_SIZE]
+        raw += report + bytes(RAW_SIZE - len(report))
+        timestamps.append(datetime_to_ns(rec.ts))
+        path_ids.append(paths.setdefault(rec.path, len(paths)))
+    return ReportMatrix(
+        reports=np.frombuffer(bytes(raw), dtype=np.uint8).reshape(-1, RAW_SIZE),
+        ts_ns=np.asarray(timestamps, dtype=np.int64),
+        path_ids=np.asarray(path_ids, dtype=np.uint16),
+        paths=tuple(paths),
+    )
+
+
+def command_counts(matrix: ReportMatrix) -> dict[int, int]:
+    """Report count per command byte, most frequent first."""
+    np = load_numpy()
+    counts = np.bincount(matrix.commands, minlength=256)
+    order = np.argsort(counts, kind="stable")[::-1]
+    return {int(command): int(counts[command]) for command in order if counts[command]}
+
+
+def position_histograms(matrix: ReportMatrix, command: int) -> Any:
+    """(64, 256) matrix counting each byte value at each position for one command."""
+    np = load_numpy()
+    reports = matrix.reports[matrix.commands == command]
+    flat = (np.arange(RAW_SIZE, dtype=np.int64) * 256 + reports).ravel()
+    return np.bincount(flat, minlength=RAW_SIZE * 256).reshape(RAW_SIZE, 256)
+
+
+def position_entropy(histograms: Any) -> Any:
+    """Shannon entropy in bits per byte position of a `position_histograms` result."""
+    np = load_numpy()
+    totals = histograms.sum(axis=1, keepdims=True)
+    probabilities = np.divide(histograms, totals, out=np.zeros(histograms.shape), where=totals > 0)
+    logs = np.log2(probabilities, out=np.zeros(histograms.shape), where=probabilities > 0)
+    return -(probabilities * logs).sum(axis=1)
+
+
+def window_ids(matrix: ReportMatrix, gap_seconds: float = 2.0) -> Any:
+    """Action window index per report, starting a new window after each inactivity gap."""
+    np = load_numpy()
+    if len(matrix) == 0:
+        return np.zeros(0, dtype=np.int64)
+    gaps = np.diff(matrix.ts_ns) > int(gap_seconds * 1_000_000_000)
+    return np.concatenate(([0], np.cumsum(gaps)))
+
+
+def change_points(matrix: ReportMatrix, command: int, gap_seconds: float = 2.0) -> list[ChangePoint]:
+    """
+    Compare the last report of `command` in each window with the previous window's.
+
+    Positions 0 and 1 never change for a fixed command, so only value bytes
+    are reported.
+    """
+    np = load_numpy()
+    windows = window_ids(matrix, gap_seconds)
+    mask = matrix.commands == command
+    reports, windows = matrix.reports[mask], windows[mask]
+    if len(reports) < 2:
+        return []
+    last = np.flatnonzero(np.append(windows[1:] != windows[:-1], True))
+    states, state_windows = reports[last], windows[last]
+    changed = states[1:] != states[:-1]
+    result: list[ChangePoint] = []
+    for row in np.flatnonzero(changed.any(axis=1)):
+        positions = np.flatnonzero(changed[row])
+        result.append(
+            ChangePoint(
+                command=command,
+                window_before=int(state_windows[row]),
+                window_after=int(state_windows[row + 1]),
+                positions=tuple(int(p) for p in positions),
+                before=tuple(int(v) for v in states[row, positions]),
+                after=tuple(int(v) for v in states[row + 1, positions]),
+            )
+        )
+    return result
+
+
+def value_index_candidates(
+    matrix: ReportMatrix,
+    command: int,
+    gap_seconds: float = 2.0,
+    max_values: int = 16,
+) -> list[ValueIndexCandidate]:
+    """
+    Rank value-byte positions of `command` that behave like a status field.
+
+    A candidate takes between 2 and `max_values` distinct values and tends
+    to hold one value per action window. Best candidates come first.
+    """
+    np = load_numpy()
+    mask = matrix.commands == command
+    reports = matrix.reports[mask]
+    if len(reports) == 0:
+        return []
+    windows = window_ids(matrix, gap_seconds)[mask]
+    histograms = position_histograms(matrix, command)
+    distinct = (histograms > 0).sum(axis=1)
+    positions = np.flatnonzero((distinct >= 2) & (distinct <= max_values))
+    positions = positions[positions >= FIRST_VALUE_INDEX]
+    if len(positions) == 0:
+        return []
+
+    # A window is stable at a position when every report in it carries the same value there.
+    starts = np.flatnonzero(np.append(True, windows[1:] != windows[:-1]))
+    columns = reports[:, positions].astype(np.int16)
+    lows = np.minimum.reduceat(columns, starts, axis=0)
+    highs = np.maximum.reduceat(columns, starts, axis=0)
+    stability = (lows == highs).mean(axis=0)
+
+    candidates: list[ValueIndexCandidate] = []
+    for column, position in enumerate(positions):
+        values, first_seen = np.unique(reports[:, position], return_index=True)
+        ordered = values[np.argsort(first_seen)]
+        candidates.append(
+            ValueIndexCandidate(
+                command=command,
+                value_index=int(position),
+                values=tuple(int(v) for v in ordered),
+                counts=tuple(int(histograms[position, v]) for v in ordered),
+                stability=float(stability[column]),
+            )
+        )
+    # Prefer stable positions, then fewer distinct values, then the earliest byte.
+    candidates.sort(key=lambda c: (-c.stability, len(c.values), c.value_index))
+    return candidates
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .errors import InvalidArgumentError
+
+# File layout (little endian):
+#   header        HEADER: magic, format version, record size, path count,
+#                 wall-clock anchor (ns since epoch), monotonic anchor (ns), records offset
+#   path table    path count x (u16 length, utf-8 bytes), zero padded to 8 bytes
+#   records       RECORD: monotonic ns timestamp, u16 path id, 6 pad bytes, 64 raw report bytes
+MAGIC = b"ARCAP\x00\x00\x01"
+FORMAT_VERSION = 1
+RAW_SIZE = 64
+HEADER = struct.Struct("<8sHHIqqI")
+RECORD = struct.Struct("<qH6x64s")
+RAW_OFFSET = 16
+_RECORD_PREFIX = struct.Struct("<qH")
+_PATH_LENGTH = struct.Struct("<H")
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def is_capture_file(path: Path) -> bool:
+    try:
+        with path.open("rb") as fp:
+            return fp.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def numpy_record_dtype() -> Any:
+    """Structured NumPy dtype matching one on-disk record."""
+    np = load_numpy()
+    return np.dtype(
+        {
+            "names": ["ts_ns", "path_id", "raw"],
+            "formats": ["<i8", "<u2", ("u1", (RAW_SIZE,))],
+            "offsets": [0, 8, RAW_OFFSET],
+            "itemsize": RECORD.size,
+        }
+    )
+
+
+class CaptureWriter:
+    """
+    Append HID reports to a columnar capture file.
+
+    Device paths are stored once in the header and records refer to them by
+    index. Writes are buffered; data reaches disk on `flush()` or `close()`,
+    and a reader ignores a trailing partial record from an interrupted run.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        device_paths: Sequence[str],
+        wall_anchor_ns: int | None = None,
+        mono_anchor_ns: int | None = None,
+    ) -> None:
+        if len(device_paths) > 0xFFFF:
+            raise InvalidArgumentError("Capture files support at most 65535 device paths")
+        self.paths: tuple[str, ...] = tuple(device_paths)
+        self._index = {device_path: i for i, device_path in enumerate(self.paths)}
+        mono_anchor_ns = time.monotonic_ns() if mono_anchor_ns is None else mono_anchor_ns
+        wall_anchor_ns = time.time_ns() if wall_anchor_ns is None else wall_anchor_ns
+        self.count = 0
+
+        table = bytearray()
+        for device_path in self.paths:
+            encoded = device_path.encode("utf-8")
+            table += _PATH_LENGTH.pack(len(encoded)) + encoded
+        records_offset = HEADER.size + len(table)
+        padding = -records_offset % 8
+        records_offset += padding
+
+        self._fp: BinaryIO = path.open("wb", buffering=_WRITE_BUFFER_SIZE)
+        self._fp.write(
+            HEADER.pack(
+                MAGIC, FORMAT_VERSION, RECORD.size, len(self.paths), wall_anchor_ns, mono_anchor_ns, records_offset
+            )
+        )
+        self._fp.write(bytes(table) + b"\x00" * padding)
+
+    def path_id(self, device_path: str) -> int:
+        try:
+            return self._index[device_path]
+        except KeyError as exc:
+            raise InvalidArgumentError(f"Device path not declared in capture header: {device_path}") from exc
+
+    def write(self, ts_ns: int, path_id: int, raw: bytes | bytearray | memoryview) -> None:
+        if not 0 <= path_id < len(self.paths):
+            raise InvalidArgumentError(f"Unknown path id {path_id}")
+        # struct pads or truncates the report to RAW_SIZE bytes.
+        self._fp.write(RECORD.pack(ts_ns, path_id, bytes(raw)))
+        self.count += 1
+
+    def write_records(self, block: bytes | bytearray | memoryview) -> None:
+        """Append already-encoded records, e.g. `CaptureFile.records` of a capture with the same path table."""
+        size = memoryview(block).nbytes
+        if size % RECORD.size:
+            raise InvalidArgumentError(f"Record block of {size} bytes is not a multiple of {RECORD.size}")
+        self._fp.write(block)
+        self.count += size // RECORD.size
+
+    def flush(self) -> None:
+        self._fp.flush()
+
+    def close(self) -> None:
+        if not self._fp.closed:
+            self._fp.close()
+
+    def __enter__(self) -> CaptureWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class CaptureFile:
+    """
+    Read-only, memory-mapped view of a capture file.
+
+    Accessors return memoryview slices into the map rather than copies, and
+    `to_numpy()` exposes the records as a zero-copy structured array. Drop
+    those views before `close()`; a map with live views is released by the
+    garbage collector instead.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as fp:
+            if os.fstat(fp.fileno()).st_size < HEADER.size:
+                raise InvalidArgumentError(f"{path} is too short to be a capture file")
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse_header()
+        except Exception:
+            self._mm.close()
+            raise
+        self._view = memoryview(self._mm)
+
+    def _parse_header(self) -> None:
+        magic, version, record_size, path_count, wall_anchor, mono_anchor, records_offset = HEADER.unpack_from(
+            self._mm, 0
+        )
+        if magic != MAGIC:
+            raise InvalidArgumentError(f"{self.path} is not an HID capture file")
+        if version != FORMAT_VERSION or record_size != RECORD.size:
+            raise InvalidArgumentError(f"Unsupported capture format version {version} (record size {record_size})")
+        paths: list[str] = []
+        offset = HEADER.size
+        for _ in range(path_count):
+            (length,) = _PATH_LENGTH.unpack_from(self._mm, offset)
+            offset += _PATH_LENGTH.size
+            paths.append(bytes(self._mm[offset : offset + length]).decode("utf-8", errors="replace"))
+            offset += length
+        self.paths: tuple[str, ...] = tuple(paths)
+        self.wall_anchor_ns: int = wall_anchor
+        self.mono_anchor_ns: int = mono_anchor
+        self.records_offset: int = records_offset
+        self._count = max(0, (len(self._mm) - records_offset) // RECORD.size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def records(self) -> memoryview:
+        """Contiguous view over all complete records."""
+        return self._view[self.records_offset : self.records_offset + self._count * RECORD.size]
+
+    def monotonic_ns(self, index: int) -> int:
+        return struct.unpack_from("<q", self._mm, self._record_offset(index))[0]
+
+    def wall_ns(self, index: int) -> int:
+        return self.wall_anchor_ns + self.monotonic_ns(index) - self.mono_anchor_ns
+
+    def path_id(self, index: int) -> int:
+        return struct.unpack_from("<H", self._mm, self._record_offset(index) + 8)[0]
+
+    def raw(self, index: int) -> memoryview:
+        start = self._record_offset(index) + RAW_OFFSET
+        return self._view[start : start + RAW_SIZE]
+
+    def iter_records(self) -> Iterator[tuple[int, int, memoryview]]:
+        """Yield `(wall_ns, path_id, raw)` per record in file order."""
+        delta = self.wall_anchor_ns - self.mono_anchor_ns
+        view = self._view
+        offset = self.records_offset
+        for _ in range(self._count):
+            ts_ns, path_id = _RECORD_PREFIX.unpack_from(self._mm, offset)
+            yield ts_ns + delta, path_id, view[offset + RAW_OFFSET : offset + RAW_OFFSET + RAW_SIZE]
+            offset += RECORD.size
+
+    def to_numpy(self) -> Any:
+        """Structured array (`ts_ns`, `path_id`, `raw`) backed directly by the map."""
+        np = load_numpy()
+        return np.frombuffer(self._mm, dtype=numpy_record_dtype(), count=self._count, offset=self.records_offset)
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> CaptureFile:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _record_offset(self, index: int) -> int:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self.records_offset + index * RECORD.size
+
+
+def datetime_to_ns(ts: datetime) -> int:
+    """Wall-clock nanoseconds for a record timestamp; naive datetimes are taken as UTC."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp()) * 1_000_000_000 + ts.microsecond * 1_000
+
+
+def ns_to_datetime(wall_ns: int) -> datetime:
+    seconds, ns = divmod(wall_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=ns // 1_000)
+
+
+def load_numpy() -> Any:
+    """Import numpy for the array views, with an install hint when the analysis extra is missing."""
+    try:
+        import numpy  # type: ignore
+    except ImportError as exc:
+        raise ImportError("Install optional dependency: pip install 'arctis-nova-api[analysis]'") from exc
+    return numpy
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import heapq
 import json
+import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from .capture_format import CaptureFile, CaptureWriter, datetime_to_ns, is_capture_file, ns_to_datetime
+from .errors import InvalidArgumentError
+from .sniffer import decode_input_report
+
 
 @dataclass(frozen=True)
 class CaptureRecord:
@@ -38,26 +45,142 @@ class WindowSummary:
     sample_hex_by_type: dict[str, str]
 
 
+def open_capture(path: Path) -> CaptureFile:
+    """Memory-map a binary capture written by `hid_sniffer.py --capture` or `import_jsonl_capture`."""
+    return CaptureFile(path)
+
+
+def iter_capture(path: Path) -> Iterator[CaptureRecord]:
+    """
+    Stream records from a JSONL or binary capture in time order.
+
+    A capture written by one sniffer is already in time order: a cheap
+    first pass over the timestamps confirms it, and the records are then
+    streamed without holding more than the current one. Concatenated or
+    otherwise out-of-order captures fall back to loading and sorting (stable,
+    so records with equal timestamps keep their file order).
+    """
+    if is_capture_file(path):
+        return _iter_binary_capture(path)
+    return _iter_jsonl_ordered(path)
+
+
+def iter_captures(paths: Iterable[Path]) -> Iterator[CaptureRecord]:
+    """Merge several captures (e.g. one per session or device) into one time-ordered stream."""
+    return merge_capture_streams(*(iter_capture(path) for path in paths))
+
+
+def merge_capture_streams(*streams: Iterable[CaptureRecord]) -> Iterator[CaptureRecord]:
+    """
+    K-way merge of streams that are each already in time order.
+
+    Raises `InvalidArgumentError` when a stream goes back in time instead of
+    silently misordering the merge; `iter_capture` streams are always ordered.
+    """
+    checked = [_checked_order(stream, index) for index, stream in enumerate(streams)]
+    return heapq.merge(*checked, key=lambda rec: rec.ts)
+
+
 def load_capture(path: Path) -> list[CaptureRecord]:
-    records: list[CaptureRecord] = []
-    for line_no, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
-        line = line.strip()
-        if not line:
-            continue
-        obj = json.loads(line)
-        ts = datetime.fromisoformat(obj["ts"])
-        decoded = obj.get("decoded", {})
-        decoded_type = decoded.get("type") if isinstance(decoded, dict) else None
-        records.append(
-            CaptureRecord(
-                ts=ts,
-                path=str(obj.get("path", "")),
-                raw_hex=str(obj.get("raw_hex", "")),
-                decoded_type=decoded_type,
-            )
+    """Load a JSONL or binary capture into time-ordered records."""
+    return list(iter_capture(path))
+
+
+def import_jsonl_capture(source: Path, destination: Path) -> int:
+    """Convert a JSONL sniffer log into the binary capture format. Returns the record count."""
+    # First pass only collects the path dictionary the header needs.
+    paths: dict[str, None] = {}
+    first_ts: datetime | None = None
+    for rec in iter_capture(source):
+        paths.setdefault(rec.path)
+        first_ts = first_ts or rec.ts
+    # JSONL has no monotonic clock, so wall-clock ns double as the record timeline.
+    anchor = datetime_to_ns(first_ts) if first_ts else time.time_ns()
+    with CaptureWriter(destination, list(paths), wall_anchor_ns=anchor, mono_anchor_ns=anchor) as writer:
+        for rec in iter_capture(source):
+            writer.write(datetime_to_ns(rec.ts), writer.path_id(rec.path), bytes.fromhex(rec.raw_hex))
+        return writer.count
+
+
+def export_capture_jsonl(source: Path, destination: Path) -> int:
+    """Write a binary capture back out as sniffer-style JSONL. Returns the record count."""
+    count = 0
+    with open_capture(source) as capture, destination.open("w", encoding="utf-8") as out:
+        for wall_ns, path_id, raw in capture.iter_records():
+            record: dict[str, Any] = {
+                "ts": ns_to_datetime(wall_ns).isoformat(),
+                "path": capture.paths[path_id],
+                "raw_hex": raw.hex(),
+            }
+            parsed = decode_input_report(raw)
+            if parsed:
+                record["decoded"] = {"type": parsed.report_type, "details": parsed.details}
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+class UnknownTypeCounter:
+    """Running per-type counts and first sample hex for unknown reports."""
+
+    def __init__(self) -> None:
+        self.total_records = 0
+        self.unknown_records = 0
+        self.start: datetime | None = None
+        self.end: datetime | None = None
+        self.counts: dict[str, int] = {}
+        self.samples: dict[str, str] = {}
+
+    def add(self, rec: CaptureRecord) -> None:
+        self.total_records += 1
+        if self.start is None:
+            self.start = rec.ts
+        self.end = rec.ts
+        if rec.is_unknown and rec.decoded_type:
+            self.unknown_records += 1
+            self.counts[rec.decoded_type] = self.counts.get(rec.decoded_type, 0) + 1
+            self.samples.setdefault(rec.decoded_type, rec.raw_hex)
+
+    def top(self, limit: int | None = None) -> list[tuple[str, int, str]]:
+        items = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return [(t, c, self.samples[t]) for t, c in items[:limit]]
+
+    def window_summary(self) -> WindowSummary:
+        assert self.start is not None and self.end is not None
+        return WindowSummary(
+            start=self.start,
+            end=self.end,
+            total_records=self.total_records,
+            unknown_records=self.unknown_records,
+            unknown_by_type=dict(sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)),
+            sample_hex_by_type=dict(self.samples),
         )
-    records.sort(key=lambda r: r.ts)
-    return records
+
+
+def iter_window_summaries(
+    records: Iterable[CaptureRecord],
+    gap_seconds: float = 2.0,
+    totals: UnknownTypeCounter | None = None,
+) -> Iterator[WindowSummary]:
+    """
+    Window a time-ordered record stream by inactivity gap in one pass.
+
+    Each window's summary is yielded as soon as the next gap closes it, and
+    `totals`, when given, accumulates capture-wide counts along the way.
+    """
+    gap = timedelta(seconds=gap_seconds)
+    window: UnknownTypeCounter | None = None
+    for rec in records:
+        if totals is not None:
+            totals.add(rec)
+        if window is not None and window.end is not None and rec.ts - window.end > gap:
+            yield window.window_summary()
+            window = None
+        if window is None:
+            window = UnknownTypeCounter()
+        window.add(rec)
+    if window is not None:
+        yield window.window_summary()
 
 
 def split_time_windows(records: list[CaptureRecord], gap_seconds: float = 2.0) -> list[list[CaptureRecord]]:
@@ -77,34 +200,77 @@ def split_time_windows(records: list[CaptureRecord], gap_seconds: float = 2.0) -
 def summarize_windows(windows: list[list[CaptureRecord]]) -> list[WindowSummary]:
     summaries: list[WindowSummary] = []
     for window in windows:
-        unknown_by_type: dict[str, int] = {}
-        sample_hex_by_type: dict[str, str] = {}
-        unknown_count = 0
+        counter = UnknownTypeCounter()
         for rec in window:
-            if rec.is_unknown and rec.decoded_type:
-                unknown_count += 1
-                unknown_by_type[rec.decoded_type] = unknown_by_type.get(rec.decoded_type, 0) + 1
-                sample_hex_by_type.setdefault(rec.decoded_type, rec.raw_hex)
-        summaries.append(
-            WindowSummary(
-                start=window[0].ts,
-                end=window[-1].ts,
-                total_records=len(window),
-                unknown_records=unknown_count,
-                unknown_by_type=dict(sorted(unknown_by_type.items(), key=lambda kv: kv[1], reverse=True)),
-                sample_hex_by_type=sample_hex_by_type,
-            )
-        )
+            counter.add(rec)
+        summaries.append(counter.window_summary())
     return summaries
 
 
-def top_unknown_types(records: list[CaptureRecord]) -> list[tuple[str, int, str]]:
-    counts: dict[str, int] = {}
-    samples: dict[str, str] = {}
+def top_unknown_types(records: Iterable[CaptureRecord]) -> list[tuple[str, int, str]]:
+    counter = UnknownTypeCounter()
     for rec in records:
-        if rec.is_unknown and rec.decoded_type:
-            counts[rec.decoded_type] = counts.get(rec.decoded_type, 0) + 1
-            samples.setdefault(rec.decoded_type, rec.raw_hex)
-    items = [(t, c, samples[t]) for t, c in counts.items()]
-    return sorted(items, key=lambda item: item[1], reverse=True)
+        counter.add(rec)
+    return counter.top()
+
+
+def _iter_jsonl_capture(path: Path) -> Iterator[CaptureRecord]:
+    with path.open(encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            decoded = obj.get("decoded", {})
+            yield CaptureRecord(
+                ts=datetime.fromisoformat(obj["ts"]),
+                path=str(obj.get("path", "")),
+                raw_hex=str(obj.get("raw_hex", "")),
+                decoded_type=decoded.get("type") if isinstance(decoded, dict) else None,
+            )
+
+
+def _iter_jsonl_ordered(path: Path) -> Iterator[CaptureRecord]:
+    if _is_time_ordered(rec.ts for rec in _iter_jsonl_capture(path)):
+        yield from _iter_jsonl_capture(path)
+    else:
+        yield from sorted(_iter_jsonl_capture(path), key=lambda rec: rec.ts)
+
+
+def _iter_binary_capture(path: Path) -> Iterator[CaptureRecord]:
+    # One writer appends in time order, so a single scan covers every device path.
+    with open_capture(path) as capture:
+        if _is_time_ordered(wall_ns for wall_ns, _, _ in capture.iter_records()):
+            yield from _iter_binary_records(capture)
+        else:
+            yield from sorted(_iter_binary_records(capture), key=lambda rec: rec.ts)
+
+
+def _iter_binary_records(capture: CaptureFile) -> Iterator[CaptureRecord]:
+    paths = capture.paths
+    for wall_ns, path_id, raw in capture.iter_records():
+        parsed = decode_input_report(raw)
+        yield CaptureRecord(
+            ts=ns_to_datetime(wall_ns),
+            path=paths[path_id],
+            raw_hex=raw.hex(),
+            decoded_type=parsed.report_type if parsed else None,
+        )
+
+
+def _is_time_ordered(timestamps: Iterable[Any]) -> bool:
+    previous: Any = None
+    for ts in timestamps:
+        if previous is not None and ts < previous:
+            return False
+        previous = ts
+    return True
+
 
+def _checked_order(stream: Iterable[CaptureRecord], index: int) -> Iterator[CaptureRecord]:
+    previous: datetime | None = None
+    for rec in stream:
+        if previous is not None and rec.ts < previous:
+            raise InvalidArgumentError(f"Capture stream {index} is not in time order at {rec.ts.isoformat()}")
+        previous = rec.ts
+        yield rec
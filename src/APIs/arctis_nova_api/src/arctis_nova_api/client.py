@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, TypeVar
 
 from .base_station import BaseStationClient, ExperimentalCommandProfile
 from .gamesense import GameSenseClient
 from .sonar import SonarClient
 
+T = TypeVar("T")
+
+# Components `discover` can warm up, in the order errors are reported.
+COMPONENTS: tuple[str, ...] = ("sonar", "base_station", "gamesense")
+
 
 class ArctisNovaProApi:
-    """High-level facade over Sonar, GameSense, and USB base-station control."""
+    """
+    High-level facade over Sonar, GameSense, and USB base-station control.
+
+    Sub-clients are built on first access, so constructing the facade does
+    no I/O. `discover` builds the requested ones concurrently (Sonar and
+    GameSense discovery read coreProps and query GG; the base station
+    enumerates HID devices and connects) instead of one after another.
+    """
 
     def __init__(
         self,
@@ -16,8 +31,93 @@ class ArctisNovaProApi:
         sonar_db_path: Path | None = None,
         timeout: float = 5.0,
         command_profile: ExperimentalCommandProfile | None = None,
+        endpoint_cache_path: Path | None = None,
+        background_hid_reader: bool = False,
     ) -> None:
-        self.sonar = SonarClient(core_props_path=core_props_path, sonar_db_path=sonar_db_path, timeout=timeout)
-        self.gamesense = GameSenseClient(core_props_path=core_props_path, timeout=timeout)
-        self.base_station = BaseStationClient(command_profile=command_profile)
+        self._core_props_path = core_props_path
+        self._sonar_db_path = sonar_db_path
+        self._timeout = timeout
+        self._command_profile = command_profile
+        self._endpoint_cache_path = endpoint_cache_path
+        self._background_hid_reader = background_hid_reader
+        self._locks = {name: threading.Lock() for name in COMPONENTS}
+        self._sonar: SonarClient | None = None
+        self._gamesense: GameSenseClient | None = None
+        self._base_station: BaseStationClient | None = None
+
+    @property
+    def sonar(self) -> SonarClient:
+        if self._sonar is None:
+            self._sonar = self._build("sonar", lambda: self._sonar, self._create_sonar)
+        return self._sonar
+
+    @property
+    def gamesense(self) -> GameSenseClient:
+        if self._gamesense is None:
+            self._gamesense = self._build("gamesense", lambda: self._gamesense, self._create_gamesense)
+        return self._gamesense
+
+    @property
+    def base_station(self) -> BaseStationClient:
+        if self._base_station is None:
+            self._base_station = self._build("base_station", lambda: self._base_station, self._create_base_station)
+        return self._base_station
+
+    def discover(
+        self,
+        sonar: bool = True,
+        gamesense: bool = True,
+        base_station: bool = True,
+    ) -> dict[str, Exception]:
+        """
+        Build the selected sub-clients in parallel and connect the base station.
+
+        Returns the error raised for each component that failed, keyed
+        "sonar", "gamesense" or "base_station"; an empty dict means all
+        selected components are ready. Failed components are retried on
+        their next access.
+        """
+        tasks: dict[str, Callable[[], object]] = {}
+        if sonar:
+            tasks["sonar"] = lambda: self.sonar
+        if gamesense:
+            tasks["gamesense"] = lambda: self.gamesense
+        if base_station:
+            tasks["base_station"] = lambda: self.base_station.connect()
+        if not tasks:
+            return {}
+        errors: dict[str, Exception] = {}
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="arctis-discovery") as pool:
+            futures = {name: pool.submit(task) for name, task in tasks.items()}
+        for name in COMPONENTS:
+            exc = futures[name].exception() if name in futures else None
+            if isinstance(exc, Exception):
+                errors[name] = exc
+        return errors
+
+    def close(self) -> None:
+        """Release the sub-clients built so far: Sonar's write pool and database handle, the HID devices."""
+        if self._sonar is not None:
+            self._sonar.close()
+        if self._base_station is not None:
+            self._base_station.close()
+
+    def _build(self, name: str, current: Callable[[], T | None], create: Callable[[], T]) -> T:
+        # One lock per component: a slow Sonar discovery never blocks the base station.
+        with self._locks[name]:
+            existing = current()
+            return existing if existing is not None else create()
+
+    def _create_sonar(self) -> SonarClient:
+        return SonarClient(
+            core_props_path=self._core_props_path,
+            sonar_db_path=self._sonar_db_path,
+            timeout=self._timeout,
+            endpoint_cache_path=self._endpoint_cache_path,
+        )
+
+    def _create_gamesense(self) -> GameSenseClient:
+        return GameSenseClient(core_props_path=self._core_props_path, timeout=self._timeout)
 
+    def _create_base_station(self) -> BaseStationClient:
+        return BaseStationClient(command_profile=self._command_profile, background_reader=self._background_hid_reader)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Unkeyed:
+    """Queue slot for a command that is never merged."""
+
+    __slots__ = ()
+
+
+class CommandCoalescer(Generic[T]):
+    """
+    Thread-safe command queue that collapses repeated writes.
+
+    `key` maps a command to a coalescing key, or None for commands that must
+    all run (preset changes, OLED actions). A keyed command replaces any
+    queued command with the same key in place, so a slider drag leaves at most
+    one pending write per channel. Keyed commands are also held back until
+    `min_interval` seconds after the previous write for that key; the latest
+    value is kept and always runs once its slot is due.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[T], Hashable | None],
+        min_interval: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._key = key
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[Hashable, T] = OrderedDict()
+        self._last_run: dict[Hashable, float] = {}
+        self.coalesced = 0
+
+    def put(self, command: T) -> None:
+        key = self._key(command)
+        with self._lock:
+            if key is None:
+                self._pending[_Unkeyed()] = command
+                return
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = command
+
+    def drain(self) -> list[T]:
+        """Pop every command that is due, in arrival order; rate-limited writes stay queued."""
+        now = self._clock()
+        ready: list[T] = []
+        with self._lock:
+            for key in list(self._pending):
+                if key in self._last_run and now - self._last_run[key] < self.min_interval:
+                    continue
+                ready.append(self._pending.pop(key))
+                if not isinstance(key, _Unkeyed):
+                    self._last_run[key] = now
+        return ready
+
+    def next_due(self) -> float | None:
+        """Seconds until the next held command may run; None when nothing is queued."""
+        now = self._clock()
+        with self._lock:
+            if not self._pending:
+                return None
+            waits = [
+                max(0.0, self.min_interval - (now - self._last_run[key])) if key in self._last_run else 0.0
+                for key in self._pending
+            ]
+        return min(waits)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
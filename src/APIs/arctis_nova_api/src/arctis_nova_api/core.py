@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .errors import ApiRequestError, DiscoveryError
 
@@ -24,6 +28,9 @@ DEFAULT_SONAR_DB_PATH = (
     / "db"
     / "database.db"
 )
+DEFAULT_POOL_SIZE = 8
+
+T = TypeVar("T")
 
 
 def read_core_props(path: Path = DEFAULT_CORE_PROPS_PATH) -> dict[str, Any]:
@@ -46,15 +53,22 @@ def get_gg_encrypted_address(core_props: dict[str, Any]) -> str:
     address = core_props.get("ggEncryptedAddress")
     if not address:
         raise DiscoveryError("coreProps.json does not include 'ggEncryptedAddress'")
+    # GG writes host:port; stand-in servers (mock_server.py) may give a full URL instead.
+    if address.startswith(("http://", "https://")):
+        return address.rstrip("/")
     return f"https://{address}"
 
 
 class HttpClient:
     """Small helper around requests with consistent error handling."""
 
-    def __init__(self, timeout: float = 5.0, verify_tls: bool = False) -> None:
+    def __init__(self, timeout: float = 5.0, verify_tls: bool = False, pool_size: int = DEFAULT_POOL_SIZE) -> None:
         self.timeout = timeout
         self.session = requests.Session()
+        # Bounded keep-alive pool per host; callers block rather than open extra sockets.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.verify_tls = verify_tls
 
     def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
@@ -72,3 +86,26 @@ class HttpClient:
             )
         return response
 
+
+class AsyncHttpClient:
+    """Run `HttpClient` requests from asyncio on a bounded worker pool sharing one keep-alive session."""
+
+    def __init__(
+        self,
+        http: HttpClient | None = None,
+        max_workers: int = DEFAULT_POOL_SIZE,
+        timeout: float = 5.0,
+        verify_tls: bool = False,
+    ) -> None:
+        self.http = http or HttpClient(timeout=timeout, verify_tls=verify_tls, pool_size=max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arctis-http")
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return await self.run(self.http.request, method, url, **kwargs)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
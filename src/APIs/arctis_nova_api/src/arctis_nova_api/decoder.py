@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Callable
+
+from .models import (
+    AncMode,
+    AncStatus,
+    BatteryStatus,
+    DeviceEvent,
+    HeadsetConnectionStatus,
+    MicStatus,
+    OledBrightnessStatus,
+    SidetoneStatus,
+    VolumeKnobEvent,
+)
+
+if TYPE_CHECKING:
+    from .base_station import ExperimentalCommandProfile
+
+REPORT_SIZE = 64
+REPORT_HEADERS = (0x06, 0x07)
+MIN_REPORT_LENGTH = 5
+DEFAULT_ANC_VALUE_MAP = {0: AncMode.OFF, 1: AncMode.TRANSPARENCY, 2: AncMode.ANC}
+
+Report = Sequence[int]
+Handler = Callable[[Report], "DeviceEvent | None"]
+
+# Events that only depend on one byte are immutable, so one instance per value is shared.
+_VOLUME_EVENTS = tuple(VolumeKnobEvent(volume=max(0, 0x38 - value)) for value in range(256))
+_BRIGHTNESS_EVENTS = tuple(
+    OledBrightnessStatus(level=value) if 1 <= value <= 10 else None for value in range(256)
+)
+
+
+def _decode_volume(data: Report) -> DeviceEvent | None:
+    return _VOLUME_EVENTS[data[2]]
+
+
+def _decode_connection(data: Report) -> DeviceEvent | None:
+    return HeadsetConnectionStatus(wireless=data[4] == 8, bluetooth=data[3] == 1, bluetooth_on=data[2] == 4)
+
+
+def _decode_battery(data: Report) -> DeviceEvent | None:
+    return BatteryStatus(headset=data[2], charging=data[3])
+
+
+# From captured packets: 07 85 <level> 00 ...
+def _decode_brightness(data: Report) -> DeviceEvent | None:
+    return _BRIGHTNESS_EVENTS[data[2]]
+
+
+def _value_handler(index: int, events: Sequence[DeviceEvent | None]) -> Handler:
+    def handler(data: Report) -> DeviceEvent | None:
+        if not 0 <= index < len(data):
+            return None
+        return events[data[index]]
+
+    return handler
+
+
+class CompiledDecoder:
+    """
+    HID input report decoder compiled from an `ExperimentalCommandProfile`.
+
+    Dispatch is a 256-entry table indexed by the command byte (`data[1]`), and
+    profile value maps are expanded once into per-byte event tables, so
+    decoding a report is one lookup plus one handler call. Built-in commands
+    (volume knob, connection, battery, OLED brightness) take precedence over
+    profile commands that reuse the same byte.
+    """
+
+    def __init__(self, profile: ExperimentalCommandProfile | None = None) -> None:
+        self.profile = profile
+        self._table: list[Handler | None] = [None] * 256
+        if profile is not None:
+            self._compile_profile(profile)
+        self._table[0x25] = _decode_volume
+        self._table[0xB5] = _decode_connection
+        self._table[0xB7] = _decode_battery
+        self._table[0x85] = self._with_fallback(_decode_brightness, self._table[0x85])
+
+    def decode(self, data: Report) -> DeviceEvent | None:
+        if len(data) < MIN_REPORT_LENGTH or data[0] not in REPORT_HEADERS:
+            return None
+        handler = self._table[data[1]]
+        return handler(data) if handler else None
+
+    def decode_many(
+        self,
+        buffer: bytes | bytearray | memoryview,
+        report_size: int = REPORT_SIZE,
+        stride: int | None = None,
+        offset: int = 0,
+    ) -> list[DeviceEvent | None]:
+        """
+        Decode a contiguous buffer of fixed-size reports.
+
+        Reports start at `offset` and every `stride` bytes (default
+        `report_size`), so interleaved record layouts can be decoded in place.
+        Returns one entry per complete report, None where nothing was decoded,
+        so results line up with per-report metadata such as timestamps.
+        """
+        view = memoryview(buffer).cast("B")
+        step = stride or report_size
+        table = self._table
+        events: list[DeviceEvent | None] = []
+        append = events.append
+        for start in range(offset, len(view) - report_size + 1, step):
+            report = view[start : start + report_size]
+            handler = table[report[1]] if report[0] in REPORT_HEADERS else None
+            append(handler(report) if handler else None)
+        return events
+
+    def handles(self, command: int) -> bool:
+        return self._table[command] is not None
+
+    def _compile_profile(self, profile: ExperimentalCommandProfile) -> None:
+        # Compiled lowest precedence first: on a shared command byte, sidetone wins over ANC over mic.
+        if profile.mic_event_command_id is not None:
+            muted_values = profile.mic_muted_values or {1}
+            on, off = MicStatus(enabled=True), MicStatus(enabled=False)
+            mic = tuple(off if value in muted_values else on for value in range(256))
+            self._table[profile.mic_event_command_id] = _value_handler(profile.mic_value_index, mic)
+        if profile.anc_event_command_id is not None:
+            value_map = profile.anc_value_map or DEFAULT_ANC_VALUE_MAP
+            anc_by_mode = {mode: AncStatus(mode=mode) for mode in set(value_map.values())}
+            anc = tuple(anc_by_mode[value_map[value]] if value in value_map else None for value in range(256))
+            self._table[profile.anc_event_command_id] = _value_handler(profile.anc_value_index, anc)
+        if profile.sidetone_event_command_id is not None:
+            sidetone = tuple(SidetoneStatus(level=value) for value in range(256))
+            self._table[profile.sidetone_event_command_id] = _value_handler(profile.sidetone_value_index, sidetone)
+
+    @staticmethod
+    def _with_fallback(primary: Handler, fallback: Handler | None) -> Handler:
+        if fallback is None:
+            return primary
+
+        def handler(data: Report) -> DeviceEvent | None:
+            return primary(data) or fallback(data)
+
+        return handler
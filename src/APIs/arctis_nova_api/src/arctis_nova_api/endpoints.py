@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+UNKNOWN_SERVER_VERSION = "unknown"
+# Where the bundled apps share learned endpoints. The library itself persists nothing unless given a path.
+DEFAULT_ENDPOINT_CACHE_PATH = (
+    Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    / "ArctisCentre"
+    / "sonar_endpoints.json"
+)
+
+
+class EndpointResolver:
+    """
+    Remember which candidate path template each Sonar operation resolved to.
+
+    Sonar's route shapes vary across GG versions, so callers probe a list of
+    candidates. The resolver records the template that answered for each
+    operation so later calls can go straight to it. Learned maps are keyed by
+    the Sonar server version and, when `cache_path` is set, persisted as JSON.
+    """
+
+    def __init__(self, cache_path: Path | None = None) -> None:
+        self._cache_path = cache_path
+        self._server_version = UNKNOWN_SERVER_VERSION
+        self._learned: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def server_version(self) -> str:
+        return self._server_version
+
+    def bind(self, server_version: str | None) -> None:
+        """Switch to the learned map for `server_version`, loading it from disk if available."""
+        version = server_version or UNKNOWN_SERVER_VERSION
+        with self._lock:
+            self._server_version = version
+            self._learned = dict(self._read_store().get(version, {}))
+
+    def get(self, operation: str) -> str | None:
+        with self._lock:
+            return self._learned.get(operation)
+
+    def learned(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._learned)
+
+    def remember(self, operation: str, template: str) -> None:
+        with self._lock:
+            if self._learned.get(operation) == template:
+                return
+            self._learned[operation] = template
+            self._persist()
+
+    def forget(self, operation: str) -> None:
+        with self._lock:
+            if self._learned.pop(operation, None) is None:
+                return
+            self._persist()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._learned = {}
+            self._persist()
+
+    def _read_store(self) -> dict[str, dict[str, str]]:
+        if self._cache_path is None or not self._cache_path.exists():
+            return {}
+        try:
+            loaded = json.loads(self._cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(loaded, dict):
+            return {}
+        store: dict[str, dict[str, str]] = {}
+        for version, mapping in loaded.items():
+            if isinstance(mapping, dict):
+                store[str(version)] = {str(k): str(v) for k, v in mapping.items() if isinstance(v, str)}
+        return store
+
+    def _persist(self) -> None:
+        if self._cache_path is None:
+            return
+        store = self._read_store()
+        store[self._server_version] = dict(self._learned)
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self._cache_path.with_suffix(self._cache_path.suffix + ".tmp")
+            temp.write_text(json.dumps(store, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(temp, self._cache_path)
+        except OSError:
+            # The learned map is an optimization; losing it only costs a re-probe.
+            return
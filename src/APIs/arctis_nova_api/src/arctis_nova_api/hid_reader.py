@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+REPORT_SIZE = 64
+# Reads block until a report arrives; the timeout only bounds how long stop() waits.
+READ_TIMEOUT_MS = 250
+DEFAULT_EVENT_BUFFER_SIZE = 1024
+
+
+class EventRing(Generic[T]):
+    """
+    Bounded, sequence-numbered buffer shared by a producer thread and readers.
+
+    `drain` returns items not returned by a previous drain; `wait_for` blocks
+    until an item newer than a given sequence number matches. When the buffer
+    is full the oldest item is overwritten and counted in `dropped`.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_EVENT_BUFFER_SIZE) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._items: deque[tuple[int, T]] = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._drained = 0
+        self.dropped = 0
+
+    @property
+    def seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def append(self, item: T) -> None:
+        with self._cond:
+            self._seq += 1
+            self._items.append((self._seq, item))
+            self._cond.notify_all()
+
+    def drain(self) -> list[T]:
+        with self._cond:
+            fresh = [(seq, item) for seq, item in self._items if seq > self._drained]
+            if fresh and fresh[0][0] > self._drained + 1:
+                self.dropped += fresh[0][0] - self._drained - 1
+            self._drained = self._seq
+            return [item for _, item in fresh]
+
+    def wait_for(self, predicate: Callable[[T], bool], since: int, timeout: float) -> T | None:
+        deadline = time.monotonic() + timeout
+        checked = since
+        with self._cond:
+            while True:
+                for seq, item in self._items:
+                    if seq > checked and predicate(item):
+                        return item
+                checked = self._seq
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+class HidReportReader:
+    """
+    Background thread doing blocking reads on one opened HID path.
+
+    Each non-empty report is handed to `on_report` from the reader thread;
+    an exception from the handler is logged and the next report is read.
+    The thread ends on `stop()` or when the device raises (e.g. unplugged);
+    the exception is kept in `error`.
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        on_report: Callable[[list[int]], None],
+        name: str = "arctis-hid-reader",
+        read_timeout_ms: int = READ_TIMEOUT_MS,
+    ) -> None:
+        self._device = device
+        self._on_report = on_report
+        self._read_timeout_ms = read_timeout_ms
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.error: BaseException | None = None
+
+    @property
+    def device(self) -> Any:
+        return self._device
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout if timeout is not None else self._read_timeout_ms / 1000.0 * 2)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data = self._device.read(REPORT_SIZE, timeout_ms=self._read_timeout_ms)
+            except (OSError, ValueError) as exc:
+                self.error = exc
+                return
+            if data and not self._stop.is_set():
+                try:
+                    self._on_report(list(data))
+                except Exception:
+                    logger.exception("HID report handler failed on %s", self._thread.name)
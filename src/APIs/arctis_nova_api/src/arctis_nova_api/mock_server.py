@@ -0,0 +1,523 @@
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+import ssl
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from .models import PresetChannel, SonarChannel, StreamerSlider
+
+# Volume targets the stand-in keeps per channel: classic mode and the two streamer sliders.
+TARGETS: tuple[str, ...] = ("classic", StreamerSlider.STREAMING.value, StreamerSlider.MONITORING.value)
+
+# Request kinds used for counters, latency overrides and error injection.
+ROUTE_KINDS: tuple[str, ...] = (
+    "subApps",
+    "mode",
+    "volume",
+    "volume_set",
+    "chatMix",
+    "routing",
+    "preset_select",
+    "gamesense",
+    "unknown",
+)
+
+_GAMESENSE_PATHS = frozenset(
+    {
+        "/game_metadata",
+        "/register_game_event",
+        "/bind_game_event",
+        "/game_event",
+        "/multiple_game_events",
+        "/game_heartbeat",
+        "/remove_game_event",
+        "/remove_game",
+    }
+)
+
+
+@dataclass(frozen=True)
+class EndpointProfile:
+    """
+    Route shapes served by one GG generation; every other path answers 404.
+
+    `volume_shape` is "legacy" (per-mode `/classic` and `/streamer` routes with
+    `Volume`/`Mute` keys; the bare prefix answers in the active mode's shape)
+    or "modes" (one `masters`/`devices` payload with classic and stream
+    entries). `routing_shape` is "sessions" (roles with `audioSessions`) or
+    "applications" (flat app list with a channel each).
+    The version string is nominal: it only keys the client's endpoint cache.
+    """
+
+    name: str
+    gg_version: str
+    volume_prefix: str
+    volume_shape: str
+    routing_path: str
+    routing_shape: str
+
+
+PROFILES: dict[str, EndpointProfile] = {
+    profile.name: profile
+    for profile in (
+        EndpointProfile("legacy", "28.0.0", "/volumeSettings", "legacy", "/AudioDeviceRouting", "sessions"),
+        EndpointProfile("capitalized", "40.0.0", "/VolumeSettings", "legacy", "/Applications", "applications"),
+        EndpointProfile("modern", "60.0.0", "/volumeSettings", "modes", "/AudioDeviceRouting", "sessions"),
+    )
+}
+
+
+def _default_levels(value: Any) -> dict[tuple[str, str], Any]:
+    return {(channel.value, target): value for channel in SonarChannel for target in TARGETS}
+
+
+@dataclass
+class MockSonarState:
+    """Mixer state behind the stand-in server; tests may read or change it between requests."""
+
+    mode: str = "classic"
+    chat_mix: float = 0.0
+    volumes: dict[tuple[str, str], float] = field(default_factory=lambda: _default_levels(0.5))
+    muted: dict[tuple[str, str], bool] = field(default_factory=lambda: _default_levels(False))
+    routing: dict[str, list[str]] = field(
+        default_factory=lambda: {
+            SonarChannel.GAME.value: ["game.exe"],
+            SonarChannel.CHAT_RENDER.value: ["Discord.exe"],
+            SonarChannel.MEDIA.value: ["Spotify.exe"],
+        }
+    )
+    sonar_enabled: bool = True
+    sonar_ready: bool = True
+    sonar_running: bool = True
+    preset_selections: list[str] = field(default_factory=list)
+
+
+class _HttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], mock: MockSonarServer) -> None:
+        self.mock = mock
+        super().__init__(address, _Handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled client sessions pay the same connection costs as against GG.
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per response.
+    disable_nagle_algorithm = True
+    server: _HttpServer
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        status, payload = self.server.mock.handle(method, self.path)
+        body = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockSonarServer:
+    """
+    Offline stand-in for the SteelSeries GG and Sonar HTTP servers.
+
+    One local server answers `/subApps` (GG), the Sonar routes of the chosen
+    `EndpointProfile` (mode, volume settings, chat mix, routing, preset
+    select) and the GameSense POST endpoints. `write_core_props` points
+    `SonarClient`, `GameSenseClient` or `ArctisNovaProApi` at it.
+
+    Every request sleeps `latency` seconds (or the `route_latency` entry for
+    its kind) plus up to `jitter` seconds. It then fails with `error_status`
+    at `error_rate` probability, or with the status queued by `inject_error`.
+    Jitter and random failures come from a generator seeded with `seed`, so
+    one client thread sees the same sequence on every run. Without
+    `certfile` the server speaks plain HTTP and writes coreProps with an
+    explicit `http://` GG address.
+    """
+
+    def __init__(
+        self,
+        profile: str | EndpointProfile = "modern",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        route_latency: Mapping[str, float] | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: int = 0,
+        sonar_db_path: Path | None = None,
+        certfile: Path | None = None,
+        keyfile: Path | None = None,
+        state: MockSonarState | None = None,
+    ) -> None:
+        self.profile = PROFILES[profile] if isinstance(profile, str) else profile
+        self.latency = latency
+        self.jitter = jitter
+        self.route_latency = dict(route_latency or {})
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.sonar_db_path = sonar_db_path
+        self.state = state or MockSonarState()
+        self._address = (host, port)
+        self._certfile = certfile
+        self._keyfile = keyfile
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Counter[str] = Counter()
+        self._injected: dict[str, list[int]] = {}
+        self._server: _HttpServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def scheme(self) -> str:
+        return "https" if self._certfile else "http"
+
+    @property
+    def address(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Mock Sonar server is not running")
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        return f"{self.scheme}://{self.address}"
+
+    def start(self) -> MockSonarServer:
+        if self._server is not None:
+            return self
+        server = _HttpServer(self._address, self)
+        if self._certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self._certfile, self._keyfile)
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, name="mock-sonar-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def __enter__(self) -> MockSonarServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def write_core_props(self, path: Path, overwrite: bool = False) -> Path:
+        """
+        Write a coreProps.json whose GG and GameSense addresses point at this server.
+
+        An existing file, such as a real GG install's, is left alone and raises
+        FileExistsError unless `overwrite` is set.
+        """
+        _refuse_existing(path, overwrite)
+        gg_address = self.address if self._certfile else self.url
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"address": self.address, "ggEncryptedAddress": gg_address}), encoding="utf-8")
+        return path
+
+    def inject_error(self, kind: str, status: int = 500, count: int = 1) -> None:
+        """Fail the next `count` requests of `kind` (see `ROUTE_KINDS`) with `status`."""
+        if kind not in ROUTE_KINDS:
+            raise ValueError(f"Unknown route kind: {kind}")
+        with self._lock:
+            self._injected.setdefault(kind, []).extend([status] * count)
+
+    def request_counts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def handle(self, method: str, raw_path: str) -> tuple[int, Any]:
+        """Answer one request; returns the HTTP status and a JSON payload (None for an empty body)."""
+        parts = urlsplit(raw_path)
+        kind, route = self._route(method, parts.path)
+        with self._lock:
+            self._counts[kind] += 1
+            delay = self.route_latency.get(kind, self.latency) + self.jitter * self._rng.random()
+            queued = self._injected.get(kind)
+            failure = queued.pop(0) if queued else None
+            if failure is None and self.error_rate and self._rng.random() < self.error_rate:
+                failure = self.error_status
+        if delay > 0:
+            time.sleep(delay)
+        if failure is not None:
+            return failure, {"error": "injected failure"}
+        if route is None:
+            return 404, {"error": f"No route for {method} {parts.path}"}
+        try:
+            with self._lock:
+                return 200, route(parse_qs(parts.query))
+        except _HttpError as exc:
+            return exc.status, {"error": str(exc)}
+
+    def _route(self, method: str, path: str) -> tuple[str, Any]:
+        profile = self.profile
+        if method == "GET" and path == "/subApps":
+            return "subApps", lambda query: self._sub_apps()
+        if path == "/mode/" and method == "GET":
+            return "mode", lambda query: self.state.mode
+        if path.startswith("/mode/") and method == "PUT":
+            return "mode", lambda query: self._set_mode(path[len("/mode/") :])
+        if path == "/chatMix":
+            if method == "GET":
+                return "chatMix", lambda query: self._chat_mix()
+            if method == "PUT":
+                return "chatMix", self._set_chat_mix
+        if path == profile.routing_path and method == "GET":
+            return "routing", lambda query: self._routing()
+        segments = path.strip("/").split("/")
+        if method == "PUT" and len(segments) == 3 and segments[0] == "configs" and segments[2] == "select":
+            return "preset_select", lambda query: self._select_preset(segments[1])
+        if path == profile.volume_prefix or path.startswith(profile.volume_prefix + "/"):
+            rest = [segment for segment in path[len(profile.volume_prefix) :].split("/") if segment]
+            if method == "GET":
+                return "volume", self._volume_reader(rest)
+            if method == "PUT":
+                return "volume_set", self._volume_writer(rest)
+        if method == "POST" and path in _GAMESENSE_PATHS:
+            return "gamesense", lambda query: {}
+        return "unknown", None
+
+    def _sub_apps(self) -> dict[str, Any]:
+        state = self.state
+        return {
+            "subApps": {
+                "sonar": {
+                    "isEnabled": state.sonar_enabled,
+                    "isReady": state.sonar_ready,
+                    "isRunning": state.sonar_running,
+                    "metadata": {"webServerAddress": self.url, "version": self.profile.gg_version},
+                }
+            }
+        }
+
+    def _set_mode(self, target: str) -> str:
+        if target not in ("classic", "stream"):
+            raise _HttpError(404, f"Unknown mode: {target}")
+        self.state.mode = target
+        return target
+
+    def _chat_mix(self) -> dict[str, Any]:
+        return {"balance": self.state.chat_mix, "state": "enabled"}
+
+    def _set_chat_mix(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        try:
+            balance = float(query["balance"][0])
+        except (KeyError, IndexError, ValueError) as exc:
+            raise _HttpError(400, "balance is required") from exc
+        if not -1 <= balance <= 1:
+            raise _HttpError(400, "balance must be between -1 and 1")
+        self.state.chat_mix = balance
+        return self._chat_mix()
+
+    def _routing(self) -> Any:
+        routing = self.state.routing
+        if self.profile.routing_shape == "applications":
+            return {
+                "applications": [
+                    {"name": app, "channel": channel} for channel, apps in routing.items() for app in apps
+                ]
+            }
+        process_ids = iter(range(1000, 1000 + sum(len(apps) for apps in routing.values())))
+        return [
+            {
+                "role": channel,
+                "audioSessions": [
+                    {"processName": app, "processId": next(process_ids), "state": "active", "isSystemSound": False}
+                    for app in apps
+                ],
+            }
+            for channel, apps in routing.items()
+        ]
+
+    def _select_preset(self, preset_id: str) -> None:
+        if self.sonar_db_path is not None:
+            # Written like GG does, so clients reading the database see the selection.
+            conn = sqlite3.connect(self.sonar_db_path)
+            try:
+                with conn:
+                    row = conn.execute("select vad from configs where id = ?", (preset_id,)).fetchone()
+                    if row is None:
+                        raise _HttpError(404, f"Unknown preset: {preset_id}")
+                    conn.execute("delete from selected_config where vad = ?", (row[0],))
+                    conn.execute("insert into selected_config (config_id, vad) values (?, ?)", (preset_id, row[0]))
+            finally:
+                conn.close()
+        self.state.preset_selections.append(preset_id)
+
+    def _volume_reader(self, rest: list[str]) -> Any:
+        if self.profile.volume_shape == "modes":
+            return (lambda query: self._modes_payload()) if not rest else None
+        if not rest:
+            # The bare route answers with the active mode's shape.
+            return lambda query: (
+                self._legacy_streamer_payload() if self.state.mode == "stream" else self._legacy_classic_payload()
+            )
+        if rest == ["classic"]:
+            return lambda query: self._legacy_classic_payload()
+        if rest == ["streamer"]:
+            return lambda query: self._legacy_streamer_payload()
+        return None
+
+    def _volume_writer(self, rest: list[str]) -> Any:
+        if self.profile.volume_shape == "modes":
+            # /masters/{mode}/{key}/{value} or /devices/{channel}/{mode}/{key}/{value}
+            if len(rest) == 4 and rest[0] == "masters":
+                channel, (mode, key, value) = SonarChannel.MASTER.value, rest[1:]
+            elif len(rest) == 5 and rest[0] == "devices" and rest[1] != SonarChannel.MASTER.value:
+                channel, mode, key, value = rest[1:]
+            else:
+                return None
+            if mode not in ("classic", "stream") or key not in ("volume", "muted"):
+                return None
+            target = "classic" if mode == "classic" else StreamerSlider.STREAMING.value
+            return lambda query: self._write_level(channel, target, key == "volume", value, modes=True)
+        # /classic/{channel}/Volume|Mute|muted/{value} or /streamer/{slider}/{channel}/Volume|isMuted/{value}
+        if len(rest) == 4 and rest[0] == "classic" and rest[2] in ("Volume", "Mute", "muted"):
+            channel, key, value = rest[1:]
+            return lambda query: self._write_level(channel, "classic", key == "Volume", value, modes=False)
+        if len(rest) == 5 and rest[0] == "streamer" and rest[1] in TARGETS[1:] and rest[3] in ("Volume", "isMuted"):
+            slider, channel, key, value = rest[1:]
+            return lambda query: self._write_level(channel, slider, key == "Volume", value, modes=False)
+        return None
+
+    def _write_level(self, channel: str, target: str, is_volume: bool, raw: str, modes: bool) -> dict[str, Any]:
+        if channel not in {item.value for item in SonarChannel}:
+            raise _HttpError(404, f"Unknown channel: {channel}")
+        if is_volume:
+            try:
+                volume = float(raw)
+            except ValueError as exc:
+                raise _HttpError(400, f"Invalid volume: {raw}") from exc
+            if not 0 <= volume <= 1:
+                raise _HttpError(400, "volume must be between 0 and 1")
+            self.state.volumes[(channel, target)] = volume
+        else:
+            if raw not in ("true", "false"):
+                raise _HttpError(400, f"Invalid mute value: {raw}")
+            self.state.muted[(channel, target)] = raw == "true"
+        if modes:
+            return self._modes_entry(channel, target)
+        return self._legacy_entry(channel, target, "Mute" if target == "classic" else "isMuted")
+
+    def _modes_entry(self, channel: str, target: str) -> dict[str, Any]:
+        return {"volume": self.state.volumes[(channel, target)], "muted": self.state.muted[(channel, target)]}
+
+    def _legacy_entry(self, channel: str, target: str, mute_key: str) -> dict[str, Any]:
+        return {"Volume": self.state.volumes[(channel, target)], mute_key: self.state.muted[(channel, target)]}
+
+    def _modes_payload(self) -> dict[str, Any]:
+        def modes(channel: str) -> dict[str, Any]:
+            return {
+                "classic": self._modes_entry(channel, "classic"),
+                "stream": self._modes_entry(channel, StreamerSlider.STREAMING.value),
+            }
+
+        return {
+            "masters": modes(SonarChannel.MASTER.value),
+            "devices": {channel.value: modes(channel.value) for channel in SonarChannel if channel is not SonarChannel.MASTER},
+        }
+
+    def _legacy_classic_payload(self) -> dict[str, Any]:
+        return {channel.value: self._legacy_entry(channel.value, "classic", "Mute") for channel in SonarChannel}
+
+    def _legacy_streamer_payload(self) -> dict[str, Any]:
+        return {
+            slider: {channel.value: self._legacy_entry(channel.value, slider, "isMuted") for channel in SonarChannel}
+            for slider in TARGETS[1:]
+        }
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def write_sonar_database(
+    path: Path,
+    presets: Mapping[PresetChannel, Sequence[str]] | None = None,
+    overwrite: bool = False,
+) -> Path:
+    """
+    Create a Sonar-style preset database at `path`.
+
+    `presets` maps each channel to preset names (default: "Default" and
+    "Flat" for every channel). Preset ids are "<channel>-<index>"; the first
+    preset of each channel is selected and marked favorite. An existing
+    database raises FileExistsError unless `overwrite` is set.
+    """
+    _refuse_existing(path, overwrite)
+    if presets is None:
+        presets = {channel: ("Default", "Flat") for channel in PresetChannel}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.executescript(
+                """
+                create table configs (id text, name text, vad integer, is_favorite integer);
+                create table selected_config (config_id text, vad integer);
+                """
+            )
+            for channel, names in presets.items():
+                for index, name in enumerate(names):
+                    preset_id = f"{channel.name.lower()}-{index}"
+                    conn.execute(
+                        "insert into configs (id, name, vad, is_favorite) values (?, ?, ?, ?)",
+                        (preset_id, name, channel.value, int(index == 0)),
+                    )
+                    if index == 0:
+                        conn.execute(
+                            "insert into selected_config (config_id, vad) values (?, ?)", (preset_id, channel.value)
+                        )
+    finally:
+        conn.close()
+    return path
+
+
+def _refuse_existing(path: Path, overwrite: bool) -> None:
+    if not overwrite and path.exists():
+        raise FileExistsError(f"Refusing to overwrite existing file: {path}")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
 from enum import Enum
 from typing import Any
 
@@ -46,6 +47,87 @@ class SonarPreset:
     channel: PresetChannel
 
 
+@dataclass(frozen=True)
+class SonarChannelLevel:
+    volume: float | None
+    muted: bool | None
+
+
+@dataclass(frozen=True)
+class SonarVolumeSnapshot:
+    """Parsed Sonar mixer state for every channel, taken from a single volume payload."""
+
+    streamer_mode: bool
+    classic: Mapping[SonarChannel, SonarChannelLevel]
+    streaming: Mapping[SonarChannel, SonarChannelLevel]
+    monitoring: Mapping[SonarChannel, SonarChannelLevel]
+
+    def levels(
+        self,
+        streamer: bool | None = None,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+    ) -> Mapping[SonarChannel, SonarChannelLevel]:
+        active_stream = self.streamer_mode if streamer is None else streamer
+        if not active_stream:
+            return self.classic
+        if streamer_slider is StreamerSlider.MONITORING:
+            return self.monitoring
+        return self.streaming
+
+    def get_volume(
+        self,
+        channel: SonarChannel,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+        streamer: bool | None = None,
+    ) -> float | None:
+        level = self.levels(streamer, streamer_slider).get(channel)
+        return level.volume if level else None
+
+    def get_mute(
+        self,
+        channel: SonarChannel,
+        streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
+        streamer: bool | None = None,
+    ) -> bool | None:
+        level = self.levels(streamer, streamer_slider).get(channel)
+        return level.muted if level else None
+
+
+@dataclass(frozen=True)
+class SonarMixerState:
+    """Result of one concurrent Sonar read; a field is None when its read failed."""
+
+    volumes: SonarVolumeSnapshot | None
+    chat_mix: Any
+    routed_apps: dict[str, list[str]] | None
+    selected_presets: dict[PresetChannel, SonarPreset | None] | None
+
+
+@dataclass(frozen=True)
+class SonarModeWriteResult:
+    """
+    Outcome of writing one channel value to every Sonar mode target.
+
+    Targets are `classic`, `streaming` and `monitoring`. `applied` holds the
+    value for each target that accepted the write, `errors` the message for
+    each one that did not.
+    """
+
+    channel: SonarChannel
+    key: str
+    value: float | bool
+    applied: Mapping[str, float | bool]
+    errors: Mapping[str, str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.errors) and bool(self.applied)
+
+
 @dataclass(frozen=True)
 class BatteryStatus:
     headset: int
@@ -117,6 +199,23 @@ DeviceEvent = (
 )
 
 
+def event_details(event: DeviceEvent) -> dict[str, int | bool | str]:
+    """
+    Data fields of a decoded event as plain values, e.g. {"headset": 4, "charging": 8}.
+
+    Enums become their values. Scale constants such as `MAX_LEVEL` are
+    dataclass fields too, but describe the device rather than the event, so
+    upper-case fields are left out.
+    """
+    details: dict[str, int | bool | str] = {}
+    for item in fields(event):
+        if item.name.isupper():
+            continue
+        value = getattr(event, item.name)
+        details[item.name] = value.value if isinstance(value, Enum) else value
+    return details
+
+
 @dataclass(frozen=True)
 class OledLine:
     text: str
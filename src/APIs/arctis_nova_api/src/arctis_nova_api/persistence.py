@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable
+
+# Seconds a state change may wait on disk so later changes can share one write.
+DEFAULT_PERSIST_DELAY = 1.0
+
+
+class StateFileWriter:
+    """
+    Background JSON state persistence with write coalescing.
+
+    `schedule` only records the latest snapshot; a worker thread writes it
+    `delay` seconds after the first unsaved change, so a burst of battery,
+    knob or slider updates costs one write. The file is compact JSON
+    replaced atomically, and a write is skipped when the serialised bytes
+    match what is already on disk. `flush` writes any pending snapshot on
+    the calling thread; `close` flushes and stops the worker.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        delay: float = DEFAULT_PERSIST_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = path
+        self.delay = delay
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending: Mapping[str, Any] | None = None
+        self._due: float | None = None
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._last_bytes = _read_bytes(path)
+        self.writes = 0
+        self.skipped = 0
+
+    def schedule(self, state: Mapping[str, Any]) -> None:
+        """Queue `state` for writing; it must not be mutated afterwards."""
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = state
+            if self._due is None:
+                self._due = self._clock() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="state-file-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        with self._cond:
+            state = self._take_locked()
+        if state is not None:
+            self._write(state)
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                if not self._closed:
+                    wait = (self._due or 0.0) - self._clock()
+                    if wait > 0:
+                        self._cond.wait(wait)
+                        continue
+                state = self._take_locked()
+            if state is not None:
+                self._write(state)
+
+    def _take_locked(self) -> Mapping[str, Any] | None:
+        state, self._pending, self._due = self._pending, None, None
+        return state
+
+    def _write(self, state: Mapping[str, Any]) -> None:
+        try:
+            data = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return
+        with self._write_lock:
+            if data == self._last_bytes:
+                self.skipped += 1
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp = self.path.with_suffix(self.path.suffix + ".tmp")
+                temp.write_bytes(data)
+                os.replace(temp, self.path)
+            except OSError:
+                # State persistence should not stop live polling.
+                return
+            self._last_bytes = data
+            self.writes += 1
+
+
+def _read_bytes(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from .models import PresetChannel, SonarPreset
+
+QueryFn = Callable[[str, tuple[Any, ...]], list[tuple[Any, ...]]]
+
+FAVORITE_COLUMN_CANDIDATES = ("is_favorite", "favorite", "starred", "is_starred", "isfavorite")
+
+
+class PresetCatalog:
+    """
+    In-memory index of Sonar's `configs` and `selected_config` tables.
+
+    The index is rebuilt only when the database file, its `-wal` file or
+    `PRAGMA data_version` changes, so repeated lookups cost a couple of
+    `stat` calls and one pragma instead of full table scans.
+    """
+
+    def __init__(self, db_path: Path, query: QueryFn) -> None:
+        self._db_path = db_path
+        self._query = query
+        self._lock = threading.RLock()
+        self._fingerprint: tuple[Any, ...] | None = None
+        self._by_id: dict[str, SonarPreset] = {}
+        self._by_channel: dict[PresetChannel, list[SonarPreset]] = {}
+        self._favorites: dict[PresetChannel, list[SonarPreset]] = {}
+        self._by_name: dict[tuple[PresetChannel, str], SonarPreset] = {}
+        self._selected: dict[PresetChannel, SonarPreset | None] = {}
+        self.generation = 0
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the index if the database changed. Returns True when it was rebuilt."""
+        with self._lock:
+            fingerprint = self._current_fingerprint()
+            if not force and fingerprint == self._fingerprint:
+                return False
+            self._load()
+            self._fingerprint = fingerprint
+            self.generation += 1
+            return True
+
+    def get(self, preset_id: str) -> SonarPreset | None:
+        with self._lock:
+            self.refresh()
+            return self._by_id.get(preset_id)
+
+    def presets(self, channel: PresetChannel) -> list[SonarPreset]:
+        with self._lock:
+            self.refresh()
+            return list(self._by_channel.get(channel, []))
+
+    def favorites(self, channel: PresetChannel) -> list[SonarPreset]:
+        with self._lock:
+            self.refresh()
+            return list(self._favorites.get(channel, []))
+
+    def find(self, channel: PresetChannel, name: str) -> SonarPreset | None:
+        with self._lock:
+            self.refresh()
+            return self._by_name.get((channel, name.strip().lower()))
+
+    def selected(self, channel: PresetChannel) -> SonarPreset | None:
+        with self._lock:
+            self.refresh()
+            return self._selected.get(channel)
+
+    def selected_all(self) -> dict[PresetChannel, SonarPreset | None]:
+        with self._lock:
+            self.refresh()
+            return dict(self._selected)
+
+    def _current_fingerprint(self) -> tuple[Any, ...]:
+        wal_path = self._db_path.with_name(self._db_path.name + "-wal")
+        data_version = self._query("pragma data_version", ())
+        return (
+            _stat_signature(self._db_path),
+            _stat_signature(wal_path),
+            data_version[0][0] if data_version else None,
+        )
+
+    def _load(self) -> None:
+        columns = {str(row[1]).lower(): str(row[1]) for row in self._query("pragma table_info(configs)", ()) if len(row) > 1}
+        favorite_col = next((columns[c] for c in FAVORITE_COLUMN_CANDIDATES if c in columns), None)
+        favorite_expr = f"{favorite_col} in (1, '1', true, 'true')" if favorite_col else "0"
+        rows = self._query(
+            f"select id, name, vad, {favorite_expr} from configs order by name collate nocase",
+            (),
+        )
+
+        by_id: dict[str, SonarPreset] = {}
+        by_channel: dict[PresetChannel, list[SonarPreset]] = {channel: [] for channel in PresetChannel}
+        favorites: dict[PresetChannel, list[SonarPreset]] = {channel: [] for channel in PresetChannel}
+        by_name: dict[tuple[PresetChannel, str], SonarPreset] = {}
+        for preset_id, name, vad, is_favorite in rows:
+            try:
+                channel = PresetChannel(vad)
+            except ValueError:
+                continue
+            preset = SonarPreset(preset_id=preset_id, name=name, channel=channel)
+            by_id[preset_id] = preset
+            by_channel[channel].append(preset)
+            if is_favorite:
+                favorites[channel].append(preset)
+            by_name.setdefault((channel, str(name).lower()), preset)
+
+        selected: dict[PresetChannel, SonarPreset | None] = {channel: None for channel in PresetChannel}
+        for config_id, vad in self._query("select config_id, vad from selected_config", ()):
+            try:
+                channel = PresetChannel(vad)
+            except ValueError:
+                continue
+            if selected[channel] is None:
+                selected[channel] = by_id.get(config_id)
+
+        self._by_id = by_id
+        self._by_channel = by_channel
+        self._favorites = favorites
+        self._by_name = by_name
+        self._selected = selected
+
+
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -2,37 +2,74 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .decoder import MIN_REPORT_LENGTH, REPORT_HEADERS, REPORT_SIZE, CompiledDecoder
+from .models import (
+    AncStatus,
+    BatteryStatus,
+    DeviceEvent,
+    HeadsetConnectionStatus,
+    MicStatus,
+    OledBrightnessStatus,
+    SidetoneStatus,
+    VolumeKnobEvent,
+    event_details,
+)
+
+_REPORT_TYPES: dict[type, str] = {
+    VolumeKnobEvent: "volume",
+    HeadsetConnectionStatus: "headset_connection",
+    BatteryStatus: "battery",
+    OledBrightnessStatus: "oled_brightness",
+    SidetoneStatus: "sidetone",
+    AncStatus: "anc",
+    MicStatus: "mic",
+}
+_DEFAULT_DECODER = CompiledDecoder()
+
 
 @dataclass(frozen=True)
 class ParsedInputReport:
     report_type: str
-    details: dict[str, int | bool]
+    details: dict[str, int | bool | str]
+
 
+def decode_input_report(
+    data: bytes | list[int], decoder: CompiledDecoder | None = None
+) -> ParsedInputReport | None:
+    """
+    Decode one report with the same compiled decoder `BaseStationClient` uses.
 
-def decode_input_report(data: bytes | list[int]) -> ParsedInputReport | None:
+    Without `decoder`, only the built-in commands are decoded; pass
+    `CompiledDecoder(profile)` to also decode profile-defined events.
+    """
     raw = bytes(data)
-    if len(raw) < 5 or raw[0] not in (0x06, 0x07):
+    if len(raw) < MIN_REPORT_LENGTH or raw[0] not in REPORT_HEADERS:
         return None
+    return _to_report(raw, (decoder or _DEFAULT_DECODER).decode(raw))
 
-    command = raw[1]
-    if command == 0x25:
-        return ParsedInputReport(
-            report_type="volume",
-            details={"volume": max(0, 0x38 - raw[2])},
-        )
-    if command == 0xB5:
-        return ParsedInputReport(
-            report_type="headset_connection",
-            details={
-                "wireless": raw[4] == 8,
-                "bluetooth": raw[3] == 1,
-                "bluetooth_on": raw[2] == 4,
-            },
-        )
-    if command == 0xB7:
+
+def decode_input_reports(
+    buffer: bytes | bytearray | memoryview,
+    decoder: CompiledDecoder | None = None,
+    report_size: int = REPORT_SIZE,
+    stride: int | None = None,
+    offset: int = 0,
+) -> list[ParsedInputReport | None]:
+    """Bulk `decode_input_report` over fixed-size reports laid out as in `CompiledDecoder.decode_many`."""
+    view = memoryview(buffer).cast("B")
+    step = stride or report_size
+    events = (decoder or _DEFAULT_DECODER).decode_many(view, report_size, step, offset)
+    reports: list[ParsedInputReport | None] = []
+    for index, event in enumerate(events):
+        start = offset + index * step
+        raw = view[start : start + report_size]
+        reports.append(_to_report(raw, event) if raw[0] in REPORT_HEADERS else None)
+    return reports
+
+
+def _to_report(raw: bytes | memoryview, event: DeviceEvent | None) -> ParsedInputReport:
+    if event is None:
         return ParsedInputReport(
-            report_type="battery",
-            details={"headset": raw[2], "charging": raw[3]},
+            report_type=f"unknown_0x{raw[1]:02x}", details={"b2": raw[2], "b3": raw[3], "b4": raw[4]}
         )
-
-    return ParsedInputReport(report_type=f"unknown_0x{command:02x}", details={"b2": raw[2], "b3": raw[3], "b4": raw[4]})
+    return ParsedInputReport(report_type=_REPORT_TYPES[type(event)], details=event_details(event))
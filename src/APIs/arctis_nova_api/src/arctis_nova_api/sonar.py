@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable
 from urllib.parse import urlparse
 
 from .core import DEFAULT_SONAR_DB_PATH, HttpClient, get_gg_encrypted_address, read_core_props
-from .errors import ApiRequestError, ConfigDatabaseError, DiscoveryError, InvalidArgumentError
-from .models import PresetChannel, SonarChannel, SonarPreset, StreamerSlider
+from .endpoints import EndpointResolver
+from .presets import PresetCatalog
+from .errors import ApiRequestError, ArctisNovaError, ConfigDatabaseError, DiscoveryError, InvalidArgumentError
+from .models import (
+    PresetChannel,
+    SonarChannel,
+    SonarChannelLevel,
+    SonarModeWriteResult,
+    SonarPreset,
+    SonarVolumeSnapshot,
+    StreamerSlider,
+)
 
 
 class SonarClient:
@@ -18,12 +32,32 @@ class SonarClient:
         core_props_path: Path | None = None,
         sonar_db_path: Path | None = None,
         timeout: float = 5.0,
+        endpoint_cache_path: Path | None = None,
+        mode_cache_ttl: float = 2.0,
+        db_immutable: bool = False,
+        http_client: HttpClient | None = None,
     ) -> None:
         self._core_props_path = core_props_path
         self._sonar_db_path = sonar_db_path or DEFAULT_SONAR_DB_PATH
-        self._http = HttpClient(timeout=timeout, verify_tls=False)
+        self._http = http_client or HttpClient(timeout=timeout, verify_tls=False)
+        self._endpoints = EndpointResolver(cache_path=endpoint_cache_path)
+        self.mode_cache_ttl = mode_cache_ttl
+        self.mode_cache_hits = 0
+        self.mode_cache_misses = 0
+        self._mode_lock = threading.Lock()
+        self._cached_streamer_mode: bool | None = None
+        self._cached_mode_at = 0.0
+        self._write_lock = threading.Lock()
+        self._write_pool: ThreadPoolExecutor | None = None
+        self._db_immutable = db_immutable
+        self._db_lock = threading.Lock()
+        self._db_conn: sqlite3.Connection | None = None
+        self._favorite_column: str | None = None
+        self._favorite_column_detected = False
+        self._preset_catalog = PresetCatalog(self._sonar_db_path, self._query_db)
         self.gg_base_url: str = ""
         self.sonar_server_url: str = ""
+        self.sonar_server_version: str | None = None
         self.refresh_discovery()
 
     def refresh_discovery(self) -> None:
@@ -45,37 +79,64 @@ class SonarClient:
         if not web_server:
             raise DiscoveryError("Sonar web server address missing in subApps metadata")
         self.sonar_server_url = web_server.rstrip("/")
+        self.sonar_server_version = _extract_server_version(sonar)
+        self._endpoints.bind(self.sonar_server_version)
 
-    def is_streamer_mode(self) -> bool:
+    @property
+    def http_client(self) -> HttpClient:
+        return self._http
+
+    @property
+    def endpoints(self) -> EndpointResolver:
+        return self._endpoints
+
+    @property
+    def preset_catalog(self) -> PresetCatalog:
+        return self._preset_catalog
+
+    def is_streamer_mode(self, use_cache: bool = False) -> bool:
+        """
+        Return whether Sonar is in streamer mode.
+
+        With `use_cache`, a value read within `mode_cache_ttl` seconds is reused
+        instead of issuing `GET /mode/`. Every live read refreshes the cache.
+        """
+        if use_cache:
+            with self._mode_lock:
+                cached = self._cached_streamer_mode
+                fresh = time.monotonic() - self._cached_mode_at < self.mode_cache_ttl
+                if cached is not None and fresh:
+                    self.mode_cache_hits += 1
+                    return cached
+                self.mode_cache_misses += 1
         mode = self._http.request("GET", f"{self.sonar_server_url}/mode/").json()
-        return mode == "stream"
+        streamer = mode == "stream"
+        self._store_streamer_mode(streamer)
+        return streamer
 
     def set_streamer_mode(self, enabled: bool) -> bool:
         target = "stream" if enabled else "classic"
         current = self._http.request("PUT", f"{self.sonar_server_url}/mode/{target}").json()
-        return current == "stream"
+        streamer = current == "stream"
+        self._store_streamer_mode(streamer)
+        return streamer
+
+    def invalidate_mode_cache(self) -> None:
+        with self._mode_lock:
+            self._cached_streamer_mode = None
+            self._cached_mode_at = 0.0
 
     def get_volume_data(self, streamer: bool | None = None) -> dict[str, Any]:
-        paths = self._volume_get_paths(streamer)
-        last_error: ApiRequestError | None = None
-        fallback_empty_payload: dict[str, Any] | None = None
-        for path in paths:
-            try:
-                payload = self._http.request("GET", f"{self.sonar_server_url}{path}").json()
-                if self._looks_like_volume_payload(payload):
-                    return payload
-                if isinstance(payload, dict) and not payload:
-                    fallback_empty_payload = payload
-                    continue
-                return payload
-            except ApiRequestError as exc:
-                last_error = exc
-                continue
-        if fallback_empty_payload is not None:
-            return fallback_empty_payload
-        if last_error:
-            raise last_error
-        raise InvalidArgumentError("Could not resolve Sonar volume endpoint")
+        mode_key = "auto" if streamer is None else ("stream" if streamer else "classic")
+        payload = self._probe(
+            f"volume_get:{mode_key}",
+            "GET",
+            self._volume_get_paths(streamer),
+            classify=_classify_volume_payload,
+            missing_message="Could not resolve Sonar volume endpoint",
+        )
+        self._observe_mode_from_volume_payload(payload, auto_route=streamer is None)
+        return payload
 
     def get_channel_volume(
         self,
@@ -85,37 +146,52 @@ class SonarClient:
     ) -> float:
         volume_data = self.get_volume_data(streamer=streamer)
         mode = self._resolve_mode_key(streamer)
-
-        # New payload style:
-        # {
-        #   "masters": {"classic": {"volume": ...}, "stream": {...}},
-        #   "devices": {"game": {"classic": {"volume": ...}, "stream": {...}}, ...}
-        # }
-        new_style_value = self._extract_channel_volume_from_mode_payload(volume_data, channel, mode)
-        if new_style_value is not None:
-            return new_style_value
-
-        # Legacy payload style fallbacks.
-        if mode == "stream":
-            channel_data = volume_data.get(streamer_slider.value, {}).get(channel.value, {})
-            volume = self._extract_volume_value(channel_data)
-            if volume is not None:
-                return self._normalize_volume(volume)
-        else:
-            channel_data = volume_data.get(channel.value, {})
-            volume = self._extract_volume_value(channel_data)
-            if volume is not None:
-                return self._normalize_volume(volume)
-
-        # Newer Sonar payloads can be shaped like {"masters": [...], "devices": [...]}.
-        mapped = self._extract_channel_volume_from_collections(volume_data, channel)
-        if mapped is not None:
-            return mapped
-
+        volume = self._parse_channel_volume(volume_data, channel, mode, streamer_slider)
+        if volume is not None:
+            return volume
         raise InvalidArgumentError(
             f"Could not read volume for channel '{channel.value}'. Response keys: {list(volume_data.keys())}"
         )
 
+    def get_volume_snapshot(self) -> SonarVolumeSnapshot:
+        """
+        Return volume and mute state for every channel from one volume payload.
+
+        Costs one mode read plus one volume read, instead of two requests per
+        channel and value with `get_channel_volume` / `get_channel_mute`.
+        Classic and stream values are both filled when the payload carries them
+        (newer `masters`/`devices` shape); otherwise only the active mode is.
+        """
+        streamer = self.is_streamer_mode(use_cache=True)
+        volume_data = self.get_volume_data(streamer=streamer)
+        active_mode = "stream" if streamer else "classic"
+        if not isinstance(volume_data, dict):
+            volume_data = {}
+
+        def parse(mode: str, streamer_slider: StreamerSlider) -> MappingProxyType[SonarChannel, SonarChannelLevel]:
+            # Only the active mode may fall back to mode-agnostic payload shapes.
+            include_fallbacks = mode == active_mode
+            return MappingProxyType(
+                {
+                    channel: SonarChannelLevel(
+                        volume=self._parse_channel_volume(
+                            volume_data, channel, mode, streamer_slider, include_fallbacks
+                        ),
+                        muted=self._parse_channel_mute(
+                            volume_data, channel, mode, streamer_slider, include_fallbacks
+                        ),
+                    )
+                    for channel in SonarChannel
+                }
+            )
+
+        return SonarVolumeSnapshot(
+            streamer_mode=streamer,
+            classic=parse("classic", StreamerSlider.STREAMING),
+            streaming=parse("stream", StreamerSlider.STREAMING),
+            monitoring=parse("stream", StreamerSlider.MONITORING),
+        )
+
     def set_channel_volume(
         self,
         channel: SonarChannel,
@@ -126,14 +202,7 @@ class SonarClient:
         if not 0 <= volume <= 1:
             raise InvalidArgumentError("volume must be between 0.0 and 1.0")
         mode = self._resolve_mode_key(streamer)
-        candidates = self._volume_set_paths(
-            channel=channel,
-            mode=mode,
-            key="volume",
-            value=volume,
-            streamer_slider=streamer_slider,
-        )
-        return self._put_first_success(candidates)
+        return self._put_volume_setting(channel, mode, "volume", volume, streamer_slider)
 
     def set_channel_mute(
         self,
@@ -143,14 +212,23 @@ class SonarClient:
         streamer: bool | None = None,
     ) -> dict[str, Any]:
         mode = self._resolve_mode_key(streamer)
-        candidates = self._volume_set_paths(
-            channel=channel,
-            mode=mode,
-            key="muted",
-            value=str(muted).lower(),
-            streamer_slider=streamer_slider,
-        )
-        return self._put_first_success(candidates)
+        return self._put_volume_setting(channel, mode, "muted", str(muted).lower(), streamer_slider)
+
+    def set_channel_volume_all_modes(self, channel: SonarChannel, volume: float) -> SonarModeWriteResult:
+        """
+        Write `volume` to the classic, streaming and monitoring targets at once.
+
+        The three PUTs run concurrently over the pooled session and go straight
+        to learned endpoint templates. No mode lookup or read-back is made; a
+        failing target is reported in the result instead of raising.
+        """
+        if not 0 <= volume <= 1:
+            raise InvalidArgumentError("volume must be between 0.0 and 1.0")
+        return self._put_all_modes(channel, "volume", volume, volume)
+
+    def set_channel_mute_all_modes(self, channel: SonarChannel, muted: bool) -> SonarModeWriteResult:
+        """Mute equivalent of `set_channel_volume_all_modes`."""
+        return self._put_all_modes(channel, "muted", str(muted).lower(), muted)
 
     def get_channel_mute(
         self,
@@ -160,26 +238,9 @@ class SonarClient:
     ) -> bool:
         volume_data = self.get_volume_data(streamer=streamer)
         mode = self._resolve_mode_key(streamer)
-
-        new_style_value = self._extract_channel_mute_from_mode_payload(volume_data, channel, mode)
-        if new_style_value is not None:
-            return new_style_value
-
-        if mode == "stream":
-            channel_data = volume_data.get(streamer_slider.value, {}).get(channel.value, {})
-            muted = self._extract_mute_value(channel_data)
-            if muted is not None:
-                return muted
-        else:
-            channel_data = volume_data.get(channel.value, {})
-            muted = self._extract_mute_value(channel_data)
-            if muted is not None:
-                return muted
-
-        mapped = self._extract_channel_mute_from_collections(volume_data, channel)
-        if mapped is not None:
-            return mapped
-
+        muted = self._parse_channel_mute(volume_data, channel, mode, streamer_slider)
+        if muted is not None:
+            return muted
         raise InvalidArgumentError(
             f"Could not read mute state for channel '{channel.value}'. Response keys: {list(volume_data.keys())}"
         )
@@ -199,50 +260,14 @@ class SonarClient:
         Sonar endpoint shape varies across GG versions, so this probes multiple
         known/observed routes and returns the first payload that looks usable.
         """
-        paths = [
-            "/AudioDeviceRouting",
-            "/AudioDeviceRouting/",
-            "/audioDeviceRouting",
-            "/audioDeviceRouting/",
-            "/Applications",
-            "/Applications/",
-            "/routing",
-            "/routing/",
-            "/routingSettings",
-            "/routingSettings/",
-            "/appRouting",
-            "/appRouting/",
-            "/audioRouting",
-            "/audioRouting/",
-            "/applications",
-            "/applications/",
-            "/sessions",
-            "/sessions/",
-            "/audioSessions",
-            "/audioSessions/",
-        ]
-        last_error: ApiRequestError | None = None
-        fallback_empty_payload: dict[str, Any] | list[Any] | None = None
-        for path in paths:
-            try:
-                response = self._http.request("GET", f"{self.sonar_server_url}{path}")
-                try:
-                    payload = response.json()
-                except ValueError:
-                    # Some candidates can return non-JSON bodies; try the next path.
-                    continue
-                if isinstance(payload, (dict, list)):
-                    if payload:
-                        return payload
-                    fallback_empty_payload = payload
-            except ApiRequestError as exc:
-                last_error = exc
-                continue
-        if fallback_empty_payload is not None:
-            return fallback_empty_payload
-        if last_error:
-            raise last_error
-        raise InvalidArgumentError("Could not resolve Sonar routing endpoint")
+        return self._probe(
+            "routing_get",
+            "GET",
+            _ROUTING_PATHS,
+            classify=_classify_routing_payload,
+            skip_non_json=True,
+            missing_message="Could not resolve Sonar routing endpoint",
+        )
 
     def get_routed_apps_by_channel(self) -> dict[str, list[str]]:
         """
@@ -272,31 +297,57 @@ class SonarClient:
         return [SonarPreset(preset_id=row[0], name=row[1], channel=PresetChannel(row[2])) for row in rows]
 
     def list_favorite_presets_by_channel(self) -> dict[PresetChannel, list[SonarPreset]]:
-        return {channel: self.list_favorite_presets(channel) for channel in PresetChannel}
+        favorites: dict[PresetChannel, list[SonarPreset]] = {channel: [] for channel in PresetChannel}
+        favorite_col = self._detect_favorite_column()
+        if favorite_col is None:
+            return favorites
+        sql = (
+            f"select id, name, vad from configs "
+            f"where {favorite_col} in (1, '1', true, 'true') "
+            f"order by name collate nocase"
+        )
+        for row in self._query_db(sql, ()):
+            preset = _preset_from_row(row)
+            if preset is not None:
+                favorites[preset.channel].append(preset)
+        return favorites
 
     def get_selected_preset(self, channel: PresetChannel) -> SonarPreset | None:
-        selected_rows = self._query_db(
-            "select config_id from selected_config where vad = ?",
+        rows = self._query_db(
+            "select c.id, c.name, c.vad from selected_config s "
+            "join configs c on c.id = s.config_id "
+            "where s.vad = ? limit 1",
             (channel.value,),
         )
-        if not selected_rows:
-            return None
-        selected_id = selected_rows[0][0]
-        match_rows = self._query_db("select id, name, vad from configs where id = ?", (selected_id,))
-        if not match_rows:
+        if not rows:
             return None
-        row = match_rows[0]
-        return SonarPreset(preset_id=row[0], name=row[1], channel=PresetChannel(row[2]))
+        return _preset_from_row(rows[0])
+
+    def get_selected_presets_all(self) -> dict[PresetChannel, SonarPreset | None]:
+        """Return the selected preset for every channel with a single query."""
+        selected: dict[PresetChannel, SonarPreset | None] = {channel: None for channel in PresetChannel}
+        rows = self._query_db(
+            "select s.vad, c.id, c.name, c.vad from selected_config s "
+            "join configs c on c.id = s.config_id",
+            (),
+        )
+        for row in rows:
+            try:
+                channel = PresetChannel(row[0])
+            except ValueError:
+                continue
+            if selected[channel] is None:
+                selected[channel] = _preset_from_row(row[1:])
+        return selected
 
     def select_preset(self, preset_id: str) -> None:
         self._http.request("PUT", f"{self._get_sonar_local_url()}/configs/{preset_id}/select", data="")
 
     def select_preset_for_channel(self, channel: PresetChannel, preset_name: str) -> SonarPreset:
-        normalized_name = preset_name.strip().lower()
-        for preset in self.list_presets(channel):
-            if preset.name.lower() == normalized_name:
-                self.select_preset(preset.preset_id)
-                return preset
+        preset = self._preset_catalog.find(channel, preset_name)
+        if preset is not None:
+            self.select_preset(preset.preset_id)
+            return preset
         raise InvalidArgumentError(f"Preset '{preset_name}' not found for {channel.name}")
 
     def _volume_path(
@@ -305,7 +356,7 @@ class SonarClient:
         streamer_slider: StreamerSlider = StreamerSlider.STREAMING,
     ) -> str:
         if streamer is None:
-            streamer = self.is_streamer_mode()
+            streamer = self.is_streamer_mode(use_cache=True)
         base = "/volumeSettings/streamer" if streamer else "/volumeSettings/classic"
         if streamer:
             return f"{base}/{streamer_slider.value}"
@@ -326,79 +377,249 @@ class SonarClient:
         return ["/volumeSettings/classic", "/VolumeSettings/classic", "/volumeSettings", "/VolumeSettings"]
 
     def _resolve_mode_key(self, streamer: bool | None) -> str:
-        active_stream = self.is_streamer_mode() if streamer is None else streamer
+        active_stream = self.is_streamer_mode(use_cache=True) if streamer is None else streamer
         return "stream" if active_stream else "classic"
 
-    def _volume_set_paths(
+    def _store_streamer_mode(self, streamer: bool) -> None:
+        with self._mode_lock:
+            self._cached_streamer_mode = streamer
+            self._cached_mode_at = time.monotonic()
+
+    def _observe_mode_from_volume_payload(self, payload: Any, auto_route: bool) -> None:
+        """Drop or correct the cached mode when a volume payload disagrees with it."""
+        if not isinstance(payload, dict):
+            return
+        explicit = _explicit_mode_from_payload(payload)
+        if explicit is not None:
+            self._store_streamer_mode(explicit)
+            return
+        if not auto_route:
+            # Mode-specific routes return that mode's shape regardless of the active mode.
+            return
+        has_sliders = any(isinstance(payload.get(key), dict) for key in ("streaming", "monitoring"))
+        has_channels = any(isinstance(payload.get(channel.value), dict) for channel in SonarChannel)
+        if has_sliders == has_channels:
+            return
+        with self._mode_lock:
+            if self._cached_streamer_mode is not None and self._cached_streamer_mode != has_sliders:
+                self._cached_streamer_mode = None
+                self._cached_mode_at = 0.0
+
+    def _put_all_modes(
+        self,
+        channel: SonarChannel,
+        key: str,
+        wire_value: float | str,
+        value: float | bool,
+    ) -> SonarModeWriteResult:
+        pool = self._write_executor()
+        futures = {
+            target: pool.submit(self._put_volume_setting, channel, mode, key, wire_value, streamer_slider)
+            for target, mode, streamer_slider in _MODE_TARGETS
+        }
+        applied: dict[str, float | bool] = {}
+        errors: dict[str, str] = {}
+        for target, future in futures.items():
+            try:
+                future.result()
+            except (ArctisNovaError, ValueError) as exc:
+                errors[target] = str(exc)
+            else:
+                applied[target] = value
+        return SonarModeWriteResult(
+            channel=channel,
+            key=key,
+            value=value,
+            applied=MappingProxyType(applied),
+            errors=MappingProxyType(errors),
+        )
+
+    def _write_executor(self) -> ThreadPoolExecutor:
+        with self._write_lock:
+            if self._write_pool is None:
+                self._write_pool = ThreadPoolExecutor(
+                    max_workers=len(_MODE_TARGETS), thread_name_prefix="sonar-write"
+                )
+            return self._write_pool
+
+    def _put_volume_setting(
         self,
         channel: SonarChannel,
         mode: str,
         key: str,
         value: float | str,
         streamer_slider: StreamerSlider,
-    ) -> list[str]:
+    ) -> dict[str, Any]:
         section = "masters" if channel is SonarChannel.MASTER else f"devices/{channel.value}"
+        scope = "master" if channel is SonarChannel.MASTER else "device"
+        return self._probe(
+            f"volume_set:{mode}:{key}:{scope}",
+            "PUT",
+            self._volume_set_templates(mode, key),
+            params={
+                "section": section,
+                "mode": mode,
+                "channel": channel.value,
+                "slider": streamer_slider.value,
+                "value": value,
+            },
+            classify=_classify_put_payload,
+            missing_message="No volume endpoint candidates were generated",
+            data="",
+        )
+
+    @staticmethod
+    def _volume_set_templates(mode: str, key: str) -> list[str]:
         candidates = [
-            f"/volumeSettings/{section}/{mode}/{key}/{value}",
-            f"/volumeSettings/{section}/{mode}/{key.capitalize()}/{value}",
-            f"/VolumeSettings/{section}/{mode}/{key}/{value}",
-            f"/VolumeSettings/{section}/{mode}/{key.capitalize()}/{value}",
+            f"/volumeSettings/{{section}}/{{mode}}/{key}/{{value}}",
+            f"/volumeSettings/{{section}}/{{mode}}/{key.capitalize()}/{{value}}",
+            f"/VolumeSettings/{{section}}/{{mode}}/{key}/{{value}}",
+            f"/VolumeSettings/{{section}}/{{mode}}/{key.capitalize()}/{{value}}",
         ]
 
         # Legacy endpoints.
         if mode == "stream":
             if key == "volume":
-                candidates.append(
-                    f"/volumeSettings/streamer/{streamer_slider.value}/{channel.value}/Volume/{value}"
-                )
-                candidates.append(
-                    f"/VolumeSettings/streamer/{streamer_slider.value}/{channel.value}/Volume/{value}"
-                )
+                candidates.append("/volumeSettings/streamer/{slider}/{channel}/Volume/{value}")
+                candidates.append("/VolumeSettings/streamer/{slider}/{channel}/Volume/{value}")
             else:
-                candidates.append(
-                    f"/volumeSettings/streamer/{streamer_slider.value}/{channel.value}/isMuted/{value}"
-                )
-                candidates.append(
-                    f"/VolumeSettings/streamer/{streamer_slider.value}/{channel.value}/isMuted/{value}"
-                )
+                candidates.append("/volumeSettings/streamer/{slider}/{channel}/isMuted/{value}")
+                candidates.append("/VolumeSettings/streamer/{slider}/{channel}/isMuted/{value}")
         else:
             if key == "volume":
-                candidates.append(f"/volumeSettings/classic/{channel.value}/Volume/{value}")
-                candidates.append(f"/VolumeSettings/classic/{channel.value}/Volume/{value}")
+                candidates.append("/volumeSettings/classic/{channel}/Volume/{value}")
+                candidates.append("/VolumeSettings/classic/{channel}/Volume/{value}")
             else:
-                candidates.append(f"/volumeSettings/classic/{channel.value}/Mute/{value}")
-                candidates.append(f"/volumeSettings/classic/{channel.value}/muted/{value}")
-                candidates.append(f"/VolumeSettings/classic/{channel.value}/Mute/{value}")
-                candidates.append(f"/VolumeSettings/classic/{channel.value}/muted/{value}")
+                candidates.append("/volumeSettings/classic/{channel}/Mute/{value}")
+                candidates.append("/volumeSettings/classic/{channel}/muted/{value}")
+                candidates.append("/VolumeSettings/classic/{channel}/Mute/{value}")
+                candidates.append("/VolumeSettings/classic/{channel}/muted/{value}")
         return candidates
 
-    def _put_first_success(self, paths: list[str]) -> dict[str, Any]:
+    def _probe(
+        self,
+        operation: str,
+        method: str,
+        templates: list[str] | tuple[str, ...],
+        classify: Callable[[Any], str],
+        missing_message: str,
+        params: dict[str, Any] | None = None,
+        skip_non_json: bool = False,
+        **request_kwargs: Any,
+    ) -> Any:
+        """
+        Request the first candidate template that yields a usable payload.
+
+        The template that answered last time is tried first. The full candidate
+        list is only walked again when it 404s or its payload changes shape.
+        """
+        params = params or {}
+
+        def attempt(template: str) -> tuple[str, Any]:
+            response = self._http.request(
+                method, f"{self.sonar_server_url}{template.format(**params)}", **request_kwargs
+            )
+            try:
+                payload = response.json()
+            except ValueError:
+                if not skip_non_json:
+                    raise
+                return _PROBE_SKIP, None
+            return classify(payload), payload
+
         last_error: ApiRequestError | None = None
-        fallback_empty_payload: dict[str, Any] | None = None
-        for path in paths:
+        fallback_payload: Any = None
+        has_fallback = False
+
+        learned = self._endpoints.get(operation)
+        if learned is not None and learned in templates:
             try:
-                payload = self._http.request("PUT", f"{self.sonar_server_url}{path}", data="").json()
-                if isinstance(payload, dict) and not payload:
-                    fallback_empty_payload = payload
-                    continue
-                return payload
+                outcome, payload = attempt(learned)
             except ApiRequestError as exc:
+                if exc.status_code != 404:
+                    raise
                 last_error = exc
+            else:
+                if outcome == _PROBE_MATCH:
+                    return payload
+                if outcome == _PROBE_FALLBACK:
+                    fallback_payload = payload
+                    has_fallback = True
+            self._endpoints.forget(operation)
+        elif learned is not None:
+            # Candidate list changed shape since this template was learned.
+            self._endpoints.forget(operation)
+
+        for template in templates:
+            if template == learned:
                 continue
-        if fallback_empty_payload is not None:
-            return fallback_empty_payload
+            try:
+                outcome, payload = attempt(template)
+            except ApiRequestError as exc:
+                last_error = exc
+                continue
+            if outcome == _PROBE_MATCH:
+                self._endpoints.remember(operation, template)
+                return payload
+            if outcome == _PROBE_ACCEPT:
+                return payload
+            if outcome == _PROBE_FALLBACK and not has_fallback:
+                fallback_payload = payload
+                has_fallback = True
+        if has_fallback:
+            return fallback_payload
         if last_error:
             raise last_error
-        raise InvalidArgumentError("No volume endpoint candidates were generated")
+        raise InvalidArgumentError(missing_message)
+
+    def close(self) -> None:
+        with self._write_lock:
+            if self._write_pool is not None:
+                self._write_pool.shutdown(wait=False)
+                self._write_pool = None
+        with self._db_lock:
+            self._close_db_locked()
 
     def _query_db(self, sql: str, params: tuple[Any, ...]) -> list[tuple[Any, ...]]:
+        with self._db_lock:
+            for attempt in range(2):
+                conn = self._connect_db_locked()
+                try:
+                    return conn.execute(sql, params).fetchall()
+                except sqlite3.OperationalError as exc:
+                    # GG can replace or migrate the file under us; reopen once before giving up.
+                    self._close_db_locked()
+                    if attempt == 1:
+                        raise ConfigDatabaseError(f"Failed querying Sonar DB: {exc}") from exc
+                except sqlite3.Error as exc:
+                    raise ConfigDatabaseError(f"Failed querying Sonar DB: {exc}") from exc
+        raise ConfigDatabaseError("Failed querying Sonar DB")
+
+    def _connect_db_locked(self) -> sqlite3.Connection:
+        if self._db_conn is not None:
+            return self._db_conn
         if not self._sonar_db_path.exists():
             raise ConfigDatabaseError(f"Sonar database not found: {self._sonar_db_path}")
+        # Read-only URI connection; `immutable` additionally skips locking for
+        # snapshot copies of the database that nothing else writes to.
+        uri = f"{self._sonar_db_path.resolve().as_uri()}?mode=ro"
+        if self._db_immutable:
+            uri += "&immutable=1"
         try:
-            with sqlite3.connect(self._sonar_db_path) as conn:
-                return conn.execute(sql, params).fetchall()
+            self._db_conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=64)
         except sqlite3.Error as exc:
-            raise ConfigDatabaseError(f"Failed querying Sonar DB: {exc}") from exc
+            raise ConfigDatabaseError(f"Failed opening Sonar DB: {exc}") from exc
+        return self._db_conn
+
+    def _close_db_locked(self) -> None:
+        if self._db_conn is not None:
+            try:
+                self._db_conn.close()
+            except sqlite3.Error:
+                pass
+        self._db_conn = None
+        self._favorite_column = None
+        self._favorite_column_detected = False
 
     def _extract_routed_apps_by_channel(self, payload: Any) -> dict[str, list[str]]:
         channels = ("master", "game", "chatRender", "media", "aux", "chatCapture")
@@ -520,12 +741,79 @@ class SonarClient:
         return routed
 
     def _detect_favorite_column(self) -> str | None:
+        if self._favorite_column_detected:
+            return self._favorite_column
         rows = self._query_db("pragma table_info(configs)", ())
         column_names = {str(row[1]).lower(): str(row[1]) for row in rows if len(row) > 1}
+        detected: str | None = None
         for candidate in ("is_favorite", "favorite", "starred", "is_starred", "isfavorite"):
             if candidate in column_names:
-                return column_names[candidate]
-        return None
+                detected = column_names[candidate]
+                break
+        self._favorite_column = detected
+        self._favorite_column_detected = True
+        return detected
+
+    def _parse_channel_volume(
+        self,
+        payload: dict[str, Any],
+        channel: SonarChannel,
+        mode: str,
+        streamer_slider: StreamerSlider,
+        include_fallbacks: bool = True,
+    ) -> float | None:
+        # New payload style:
+        # {
+        #   "masters": {"classic": {"volume": ...}, "stream": {...}},
+        #   "devices": {"game": {"classic": {"volume": ...}, "stream": {...}}, ...}
+        # }
+        new_style_value = self._extract_channel_volume_from_mode_payload(payload, channel, mode)
+        if new_style_value is not None:
+            return new_style_value
+        if not include_fallbacks:
+            return None
+
+        # Legacy payload style fallbacks.
+        volume = self._extract_volume_value(self._legacy_channel_entry(payload, channel, mode, streamer_slider))
+        if volume is not None:
+            return self._normalize_volume(volume)
+
+        # Newer Sonar payloads can be shaped like {"masters": [...], "devices": [...]}.
+        return self._extract_channel_volume_from_collections(payload, channel)
+
+    def _parse_channel_mute(
+        self,
+        payload: dict[str, Any],
+        channel: SonarChannel,
+        mode: str,
+        streamer_slider: StreamerSlider,
+        include_fallbacks: bool = True,
+    ) -> bool | None:
+        new_style_value = self._extract_channel_mute_from_mode_payload(payload, channel, mode)
+        if new_style_value is not None:
+            return new_style_value
+        if not include_fallbacks:
+            return None
+
+        muted = self._extract_mute_value(self._legacy_channel_entry(payload, channel, mode, streamer_slider))
+        if muted is not None:
+            return muted
+
+        return self._extract_channel_mute_from_collections(payload, channel)
+
+    @staticmethod
+    def _legacy_channel_entry(
+        payload: dict[str, Any],
+        channel: SonarChannel,
+        mode: str,
+        streamer_slider: StreamerSlider,
+    ) -> dict[str, Any]:
+        if mode == "stream":
+            slider_data = payload.get(streamer_slider.value, {})
+            entry = slider_data.get(channel.value, {}) if isinstance(slider_data, dict) else {}
+        else:
+            entry = payload.get(channel.value, {})
+        return entry if isinstance(entry, dict) else {}
 
     def _extract_channel_volume_from_mode_payload(
         self,
@@ -717,3 +1005,90 @@ class SonarClient:
         if not parsed.hostname or not parsed.port:
             raise DiscoveryError(f"Could not parse Sonar server URL: {self.sonar_server_url}")
         return f"http://{parsed.hostname}:{parsed.port}"
+
+
+# (result target, volume mode key, streamer slider) written by the *_all_modes setters.
+_MODE_TARGETS: tuple[tuple[str, str, StreamerSlider], ...] = (
+    ("classic", "classic", StreamerSlider.STREAMING),
+    ("streaming", "stream", StreamerSlider.STREAMING),
+    ("monitoring", "stream", StreamerSlider.MONITORING),
+)
+
+_ROUTING_PATHS: tuple[str, ...] = (
+    "/AudioDeviceRouting",
+    "/AudioDeviceRouting/",
+    "/audioDeviceRouting",
+    "/audioDeviceRouting/",
+    "/Applications",
+    "/Applications/",
+    "/routing",
+    "/routing/",
+    "/routingSettings",
+    "/routingSettings/",
+    "/appRouting",
+    "/appRouting/",
+    "/audioRouting",
+    "/audioRouting/",
+    "/applications",
+    "/applications/",
+    "/sessions",
+    "/sessions/",
+    "/audioSessions",
+    "/audioSessions/",
+)
+
+# Probe outcomes: use and remember the path, use without remembering, keep as a
+# last-resort result, or ignore and keep probing.
+_PROBE_MATCH = "match"
+_PROBE_ACCEPT = "accept"
+_PROBE_FALLBACK = "fallback"
+_PROBE_SKIP = "skip"
+
+
+def _classify_volume_payload(payload: Any) -> str:
+    if SonarClient._looks_like_volume_payload(payload):
+        return _PROBE_MATCH
+    if isinstance(payload, dict) and not payload:
+        return _PROBE_FALLBACK
+    return _PROBE_ACCEPT
+
+
+def _classify_routing_payload(payload: Any) -> str:
+    if not isinstance(payload, (dict, list)):
+        return _PROBE_SKIP
+    return _PROBE_MATCH if payload else _PROBE_FALLBACK
+
+
+def _classify_put_payload(payload: Any) -> str:
+    if isinstance(payload, dict) and not payload:
+        return _PROBE_FALLBACK
+    return _PROBE_MATCH
+
+
+def _preset_from_row(row: tuple[Any, ...]) -> SonarPreset | None:
+    try:
+        channel = PresetChannel(row[2])
+    except ValueError:
+        return None
+    return SonarPreset(preset_id=row[0], name=row[1], channel=channel)
+
+
+def _explicit_mode_from_payload(payload: dict[str, Any]) -> bool | None:
+    for key in ("mode", "currentMode", "activeMode"):
+        value = payload.get(key)
+        if isinstance(value, str) and value.strip().lower() in {"stream", "classic"}:
+            return value.strip().lower() == "stream"
+    value = payload.get("isStreamerMode")
+    if isinstance(value, bool):
+        return value
+    return None
+
+
+def _extract_server_version(sonar_meta: dict[str, Any]) -> str | None:
+    metadata = sonar_meta.get("metadata", {})
+    for source in (metadata if isinstance(metadata, dict) else {}, sonar_meta):
+        for key in ("version", "appVersion", "sonarVersion", "ggVersion"):
+            value = source.get(key)
+            if isinstance(value, (str, int, float)) and str(value).strip():
+                return str(value).strip()
+    return None
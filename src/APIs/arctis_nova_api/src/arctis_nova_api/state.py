@@ -0,0 +1,733 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from collections.abc import Collection, Hashable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Protocol, TypedDict
+
+from .base_station import ExperimentalCommandProfile
+from .commands import CommandCoalescer
+from .models import (
+    AncMode,
+    AncStatus,
+    BatteryStatus,
+    DeviceEvent,
+    HeadsetConnectionStatus,
+    MicStatus,
+    OledBrightnessStatus,
+    PresetChannel,
+    SidetoneStatus,
+    SonarChannel,
+    SonarPreset,
+    VolumeKnobEvent,
+)
+from .persistence import DEFAULT_PERSIST_DELAY, StateFileWriter
+from .state_store import StateDelta, StateSnapshot, VersionedStateStore
+
+if TYPE_CHECKING:
+    # The HTTP stack (requests, sqlite3) loads when the engine opens, not when a frontend imports it.
+    from .async_sonar import AsyncSonarClient
+    from .client import ArctisNovaProApi
+
+logger = logging.getLogger(__name__)
+
+CHANNELS: tuple[str, ...] = ("master", "game", "chatRender", "media", "aux", "chatCapture")
+CHANNEL_MAP: dict[str, SonarChannel] = {
+    "master": SonarChannel.MASTER,
+    "game": SonarChannel.GAME,
+    "chatRender": SonarChannel.CHAT_RENDER,
+    "media": SonarChannel.MEDIA,
+    "aux": SonarChannel.AUX,
+    "chatCapture": SonarChannel.CHAT_CAPTURE,
+}
+PRESET_CHANNEL_MAP: dict[str, PresetChannel] = {
+    "master": PresetChannel.MASTER,
+    "game": PresetChannel.GAMING,
+    "chatRender": PresetChannel.CHAT,
+    "media": PresetChannel.MEDIA,
+    "aux": PresetChannel.AUX,
+    "chatCapture": PresetChannel.MIC,
+}
+
+# Poll sources, in the order they run within one engine tick.
+SOURCES: tuple[str, ...] = ("events", "sonar", "hardware", "presets")
+DEFAULT_INTERVALS: dict[str, float] = {"events": 0.12, "sonar": 0.6, "hardware": 0.8, "presets": 4.0}
+HARDWARE_QUERIES: tuple[str, ...] = ("oled_brightness", "headset_volume", "anc", "mic", "sidetone", "battery")
+# Minimum seconds between two queued writes with the same key; newer values replace queued ones.
+DEFAULT_WRITE_INTERVAL = 0.08
+DEFAULT_TICK = 0.02
+# Longest the engine thread sleeps when no source or command is due.
+MAX_IDLE_WAIT = 1.0
+# Adaptive scheduling: ceilings reached by idle backoff, and the tight intervals used right after activity.
+DEFAULT_MAX_INTERVALS: dict[str, float] = {"events": 0.5, "sonar": 5.0, "hardware": 10.0, "presets": 30.0}
+DEFAULT_BURST_INTERVALS: dict[str, float] = {"events": 0.02, "sonar": 0.15, "hardware": 0.25}
+DEFAULT_BURST_SECONDS = 3.0
+# Frontend commands whose queued writes collapse per channel; see `coalesce_key`.
+COALESCED_COMMANDS = frozenset({"set_channel_volume", "set_channel_mute"})
+
+
+def coalesce_key(name: str, payload: Mapping[str, Any] | None) -> tuple[str, str] | None:
+    """`submit` key shared by the frontends: `(name, channel)` for volume and mute writes, else None."""
+    if name in COALESCED_COMMANDS:
+        return name, str((payload or {}).get("channel"))
+    return None
+
+
+class HeadsetState(TypedDict, total=False):
+    headset_battery_percent: int | None
+    base_battery_percent: int | None
+    headset_volume_percent: int | None
+    anc_mode: str | None
+    mic_mute: bool | None
+    sidetone_level: int | None
+    connected: bool | None
+    wireless: bool | None
+    bluetooth: bool | None
+    chat_mix_balance: int | None
+    oled_brightness: int | None
+    active_usb_input: str | None
+    channel_volume: dict[str, int]
+    channel_mute: dict[str, bool]
+    channel_preset: dict[str, str | None]
+    channel_preset_name: dict[str, str | None]
+    channel_apps: dict[str, list[str]]
+    updated_at: str | None
+
+
+DEFAULT_STATE: HeadsetState = {
+    "headset_battery_percent": None,
+    "base_battery_percent": None,
+    "headset_volume_percent": None,
+    "anc_mode": None,
+    "mic_mute": None,
+    "sidetone_level": None,
+    "connected": None,
+    "wireless": None,
+    "bluetooth": None,
+    "chat_mix_balance": None,
+    "oled_brightness": None,
+    "active_usb_input": None,
+    "channel_volume": {},
+    "channel_mute": {},
+    "channel_preset": {},
+    "channel_preset_name": {},
+    "channel_apps": {},
+    "updated_at": None,
+}
+
+StateListener = Callable[[StateDelta], None]
+PresetListener = Callable[[dict[str, list[SonarPreset]]], None]
+EventListener = Callable[[DeviceEvent], None]
+Command = Callable[["ArctisNovaProApi"], Any]
+
+
+def default_command_profile() -> ExperimentalCommandProfile:
+    """Event decoding used by the bundled apps for ANC, mic and sidetone reports."""
+    return ExperimentalCommandProfile(
+        anc_event_command_id=0xBD,
+        anc_value_index=2,
+        anc_value_map={0: AncMode.OFF, 1: AncMode.TRANSPARENCY, 2: AncMode.ANC},
+        mic_event_command_id=0xBB,
+        mic_value_index=2,
+        mic_muted_values={1},
+        sidetone_event_command_id=0x39,
+        sidetone_value_index=2,
+        sidetone_label_map={"off": 0, "low": 1, "med": 2, "high": 3},
+    )
+
+
+def default_api_factory(endpoint_cache_path: Path | None = None) -> ArctisNovaProApi:
+    from .client import ArctisNovaProApi
+
+    return ArctisNovaProApi(
+        command_profile=default_command_profile(),
+        endpoint_cache_path=endpoint_cache_path,
+        background_hid_reader=True,
+    )
+
+
+def default_state(extra: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    """Fresh copy of `DEFAULT_STATE`, optionally with app-specific keys added."""
+    state: dict[str, Any] = {key: dict(value) if isinstance(value, dict) else value for key, value in DEFAULT_STATE.items()}
+    if extra:
+        state.update(extra)
+    return state
+
+
+def load_state_file(path: Path, defaults: Mapping[str, Any]) -> dict[str, Any]:
+    """Persisted state merged over `defaults`; unreadable files fall back to the defaults."""
+    merged = dict(defaults)
+    if not path.exists():
+        return merged
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return merged
+    if isinstance(loaded, dict):
+        merged.update(loaded)
+    return merged
+
+
+def extract_chat_mix_balance(payload: Any) -> float | None:
+    if isinstance(payload, (int, float)):
+        return float(payload)
+    if not isinstance(payload, dict):
+        return None
+    for key in ("balance", "chatMix", "value"):
+        value = payload.get(key)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return None
+
+
+class PollScheduler(Protocol):
+    """Decides when each poll source runs; the engine reports every poll back through `record`."""
+
+    def due(self, source: str, now: float) -> bool: ...
+
+    def record(self, source: str, now: float, changed: bool) -> None: ...
+
+    def next_due(self, now: float) -> float | None:
+        """Seconds until the next source is due; None when nothing is scheduled."""
+        ...
+
+    def notify_activity(self, now: float) -> None:
+        """A user command or HID event just happened."""
+        ...
+
+    def set_visible(self, visible: bool) -> None:
+        """The frontend showing this state was shown or hidden."""
+        ...
+
+
+class FixedIntervalScheduler:
+    """Poll each source every `intervals[source]` seconds; sources without an interval only run on demand."""
+
+    def __init__(self, intervals: Mapping[str, float] | None = None) -> None:
+        self.intervals = dict(DEFAULT_INTERVALS if intervals is None else intervals)
+        self._last: dict[str, float] = {}
+
+    def due(self, source: str, now: float) -> bool:
+        interval = self.intervals.get(source)
+        if interval is None:
+            return False
+        return now - self._last.get(source, -math.inf) >= interval
+
+    def record(self, source: str, now: float, changed: bool) -> None:
+        self._last[source] = now
+
+    def next_due(self, now: float) -> float | None:
+        waits = [
+            max(0.0, self._last.get(source, -math.inf) + interval - now) for source, interval in self.intervals.items()
+        ]
+        return min(waits) if waits else None
+
+    def notify_activity(self, now: float) -> None:
+        return None
+
+    def set_visible(self, visible: bool) -> None:
+        return None
+
+
+class AdaptiveScheduler:
+    """
+    Per-source intervals that follow the observed rate of change.
+
+    A poll that finds nothing new multiplies the source's interval by
+    `backoff` up to `max_intervals[source]`; a poll that finds a change
+    drops it back to `intervals[source]`. For `burst_seconds` after
+    `notify_activity` (a user command or HID event) sources with a
+    `burst_intervals` entry are polled at that tighter interval instead.
+    Sources in `pause_when_hidden` are not polled at all while the
+    frontend is hidden and are due immediately once it is shown again.
+    """
+
+    def __init__(
+        self,
+        intervals: Mapping[str, float] | None = None,
+        max_intervals: Mapping[str, float] | None = None,
+        burst_intervals: Mapping[str, float] | None = None,
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+        backoff: float = 2.0,
+        pause_when_hidden: Collection[str] = (),
+        visible: bool = True,
+    ) -> None:
+        self.intervals = dict(DEFAULT_INTERVALS if intervals is None else intervals)
+        self.max_intervals = dict(DEFAULT_MAX_INTERVALS if max_intervals is None else max_intervals)
+        self.burst_intervals = dict(DEFAULT_BURST_INTERVALS if burst_intervals is None else burst_intervals)
+        self.burst_seconds = burst_seconds
+        self.backoff = backoff
+        self.pause_when_hidden = frozenset(pause_when_hidden)
+        self._lock = threading.Lock()
+        self._current = dict(self.intervals)
+        self._last: dict[str, float] = {}
+        self._burst_until = -math.inf
+        self._visible = visible
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    def interval(self, source: str, now: float) -> float | None:
+        """Effective interval for `source` at `now`; None while it is not polled."""
+        with self._lock:
+            return self._interval_locked(source, now)
+
+    def due(self, source: str, now: float) -> bool:
+        with self._lock:
+            interval = self._interval_locked(source, now)
+            if interval is None:
+                return False
+            return now - self._last.get(source, -math.inf) >= interval
+
+    def record(self, source: str, now: float, changed: bool) -> None:
+        with self._lock:
+            self._last[source] = now
+            base = self.intervals.get(source)
+            if base is None:
+                return
+            if changed:
+                self._current[source] = base
+            else:
+                ceiling = self.max_intervals.get(source, base)
+                self._current[source] = min(max(base, ceiling), self._current.get(source, base) * self.backoff)
+
+    def next_due(self, now: float) -> float | None:
+        with self._lock:
+            waits = []
+            for source in self.intervals:
+                interval = self._interval_locked(source, now)
+                if interval is not None:
+                    waits.append(max(0.0, self._last.get(source, -math.inf) + interval - now))
+            if self._burst_until > now:
+                # Wake when the burst ends so the backed-off intervals take over again.
+                waits.append(self._burst_until - now)
+        return min(waits) if waits else None
+
+    def notify_activity(self, now: float) -> None:
+        with self._lock:
+            self._burst_until = now + self.burst_seconds
+            self._current = dict(self.intervals)
+
+    def set_visible(self, visible: bool) -> None:
+        with self._lock:
+            if visible and not self._visible:
+                for source in self.pause_when_hidden:
+                    self._last.pop(source, None)
+                self._current = dict(self.intervals)
+            self._visible = visible
+
+    def _interval_locked(self, source: str, now: float) -> float | None:
+        base = self.intervals.get(source)
+        if base is None:
+            return None
+        if not self._visible and source in self.pause_when_hidden:
+            return None
+        if now < self._burst_until and source in self.burst_intervals:
+            return min(self.burst_intervals[source], self._current.get(source, base))
+        return self._current.get(source, base)
+
+
+@dataclass(frozen=True)
+class _QueuedCommand:
+    key: Hashable | None
+    run: Command
+
+
+class HeadsetStateEngine:
+    """
+    Single owner of headset polling, caching and change detection.
+
+    The engine polls HID events, the Sonar mixer, base-station getters and
+    the preset catalog on the cadence chosen by its `PollScheduler`, stages
+    the results in a `VersionedStateStore` and publishes one `StateDelta`
+    per tick to every subscriber. Frontends queue work with `submit`; it
+    runs on the engine thread between polls, keyed writes coalesced and
+    rate-limited, so device and Sonar access is never concurrent with a poll.
+
+    Between ticks the thread sleeps until the scheduler's next due source
+    (at least `tick`, at most `MAX_IDLE_WAIT` seconds) and is woken early by
+    submitted commands, visibility changes and, in background HID reader
+    mode, incoming device events.
+    """
+
+    def __init__(
+        self,
+        api_factory: Callable[[], ArctisNovaProApi] = default_api_factory,
+        *,
+        initial_state: Mapping[str, Any] | None = None,
+        state_file: Path | None = None,
+        scheduler: PollScheduler | None = None,
+        hardware_queries: tuple[str, ...] = HARDWARE_QUERIES,
+        include_chat_mix: bool = True,
+        write_interval: float = DEFAULT_WRITE_INTERVAL,
+        tick: float = DEFAULT_TICK,
+        persist_delay: float = DEFAULT_PERSIST_DELAY,
+        on_error: Callable[[Exception], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        defaults = initial_state if initial_state is not None else default_state()
+        self._writer = StateFileWriter(state_file, delay=persist_delay) if state_file else None
+        self.store = VersionedStateStore(load_state_file(state_file, defaults) if state_file else defaults)
+        self.scheduler: PollScheduler = scheduler or FixedIntervalScheduler()
+        self.hardware_queries = hardware_queries
+        self.include_chat_mix = include_chat_mix
+        self.tick = tick
+        self._api_factory = api_factory
+        self._on_error = on_error
+        self._clock = clock
+        self._api: ArctisNovaProApi | None = None
+        self._opened_api: ArctisNovaProApi | None = None
+        self._async_sonar: AsyncSonarClient | None = None
+        self._commands: CommandCoalescer[_QueuedCommand] = CommandCoalescer(
+            lambda command: command.key, min_interval=write_interval, clock=clock
+        )
+        self._listeners: list[StateListener] = []
+        self._preset_listeners: list[PresetListener] = []
+        self._event_listeners: list[EventListener] = []
+        self._presets: dict[str, list[SonarPreset]] = {}
+        self._failing_sources: set[str] = set()
+        self._publish_lock = threading.Lock()
+        self._changed = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._device_activity = threading.Event()
+        self._unsubscribe_device: Callable[[], None] | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def api(self) -> ArctisNovaProApi:
+        if self._api is None:
+            raise RuntimeError("Headset state engine not opened yet.")
+        return self._api
+
+    @property
+    def presets(self) -> dict[str, list[SonarPreset]]:
+        return dict(self._presets)
+
+    def subscribe(self, listener: StateListener) -> Callable[[], None]:
+        """Call `listener` with each published delta; returns an unsubscribe function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def subscribe_presets(self, listener: PresetListener) -> Callable[[], None]:
+        self._preset_listeners.append(listener)
+        return lambda: self._preset_listeners.remove(listener)
+
+    def subscribe_events(self, listener: EventListener) -> Callable[[], None]:
+        """Call `listener` on the engine thread with every HID event drained from the base station."""
+        self._event_listeners.append(listener)
+        return lambda: self._event_listeners.remove(listener)
+
+    def submit(self, command: Command, key: Hashable | None = None) -> None:
+        """Queue `command(api)` for the engine thread; a newer command with the same key replaces a queued one."""
+        self._commands.put(_QueuedCommand(key, command))
+        self.notify_activity()
+
+    def notify_activity(self) -> None:
+        """Report user interaction that bypassed `submit`, so polling tightens for a while."""
+        self.scheduler.notify_activity(self._clock())
+        self._wake.set()
+
+    def set_visible(self, visible: bool) -> None:
+        """Tell the scheduler whether any UI is showing this state."""
+        self.scheduler.set_visible(visible)
+        if visible:
+            self.scheduler.notify_activity(self._clock())
+        self._wake.set()
+
+    def update(self, values: Mapping[str, Any]) -> bool:
+        changed = self.store.update(values)
+        self._changed |= changed
+        return changed
+
+    @property
+    def current(self) -> StateSnapshot:
+        """Last published state as an immutable snapshot; safe to read from any thread without locking."""
+        return self.store.current
+
+    def snapshot(self) -> dict[str, Any]:
+        """Last published state as a mutable copy."""
+        return self.store.current.to_dict()
+
+    def open(self) -> None:
+        from .async_sonar import AsyncSonarClient
+
+        api = self._api_factory()
+        # Kept even if discovery fails, so close() releases a base station that did connect.
+        self._opened_api = api
+        # Sonar discovery and the HID connect run in parallel; GameSense stays lazy (the engine never uses it).
+        errors = api.discover(gamesense=False)
+        if errors:
+            raise next(iter(errors.values()))
+        self._api = api
+        self._async_sonar = AsyncSonarClient(api.sonar)
+        # Only fires in background reader mode; otherwise events are polled on schedule.
+        self._unsubscribe_device = api.base_station.subscribe(self._on_device_event)
+        self.refresh("presets")
+
+    def close(self) -> None:
+        if self._unsubscribe_device is not None:
+            self._unsubscribe_device()
+            self._unsubscribe_device = None
+        if self._async_sonar is not None:
+            self._async_sonar.close()
+            self._async_sonar = None
+        if self._opened_api is not None:
+            try:
+                self._opened_api.close()
+            except Exception:
+                pass
+            self._api = self._opened_api = None
+        if self._writer is not None:
+            self._save()
+            self._writer.close()
+
+    def run(self) -> None:
+        """Open the API, poll until `stop()` and close again; blocks the calling thread."""
+        try:
+            # Inside the try: a failed open still closes whatever discovery connected.
+            self.open()
+            self.loop()
+        finally:
+            self.close()
+
+    def loop(self) -> None:
+        while not self._stop.is_set():
+            self.step()
+            self._wake.wait(self._next_wait())
+            self._wake.clear()
+
+    def step(self) -> StateDelta | None:
+        """One engine tick: queued commands, flagged device events, due polls, then publish."""
+        self.run_pending_commands()
+        if self._device_activity.is_set():
+            self._device_activity.clear()
+            self.refresh("events")
+        self.poll_due()
+        return self.publish()
+
+    def start(self, name: str = "headset-state-engine") -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def run_pending_commands(self) -> None:
+        for command in self._commands.drain():
+            try:
+                command.run(self.api)
+            except Exception as exc:
+                if self._on_error is not None:
+                    self._on_error(exc)
+            self.publish()
+
+    def poll_due(self) -> bool:
+        now = self._clock()
+        changed = False
+        for source in SOURCES:
+            if self.scheduler.due(source, now):
+                changed |= self._poll_and_record(source, now)
+        return changed
+
+    def refresh(self, *sources: str) -> bool:
+        """Poll `sources` (all of them when empty) right away, outside the schedule."""
+        changed = False
+        now = self._clock()
+        for source in sources or SOURCES:
+            changed |= self._poll_and_record(source, now)
+        return changed
+
+    def publish(self) -> StateDelta | None:
+        """Commit staged changes and hand the delta to subscribers; None when nothing changed."""
+        with self._publish_lock:
+            if not self._changed:
+                return None
+            self._changed = False
+            self.store.set("updated_at", time.strftime("%H:%M:%S"))
+            delta = self.store.commit()
+            if delta is None:
+                return None
+            self._save()
+        for listener in list(self._listeners):
+            listener(delta)
+        return delta
+
+    def resync(self) -> dict[str, Any]:
+        """Full published state as `{"seq", "state"}`, after publishing anything still staged."""
+        self.publish()
+        return self.store.resync()
+
+    def _next_wait(self) -> float:
+        now = self._clock()
+        waits = [MAX_IDLE_WAIT]
+        for wait in (self.scheduler.next_due(now), self._commands.next_due()):
+            if wait is not None:
+                waits.append(wait)
+        return max(self.tick, min(waits))
+
+    def _on_device_event(self, event: object) -> None:
+        # Reader thread: only flag the event; the engine thread drains and applies it.
+        self._device_activity.set()
+        self._wake.set()
+
+    def _poll_and_record(self, source: str, now: float) -> bool:
+        changed = self._poll(source)
+        self.scheduler.record(source, now, changed)
+        if source == "events" and changed:
+            self.scheduler.notify_activity(now)
+        return changed
+
+    def _poll(self, source: str) -> bool:
+        if self._api is None:
+            return False
+        try:
+            changed = getattr(self, f"_refresh_{source}")()
+        except Exception:
+            # A failing source keeps its last known values; the next poll retries.
+            # Logged once per failure streak so a stopped GG does not flood the log.
+            if source not in self._failing_sources:
+                self._failing_sources.add(source)
+                logger.warning("Polling %s failed; keeping last known values", source, exc_info=True)
+            return False
+        if source in self._failing_sources:
+            self._failing_sources.discard(source)
+            logger.info("Polling %s recovered", source)
+        self._changed |= changed
+        return changed
+
+    def _set(self, key: str, value: Any) -> bool:
+        return self.store.set(key, value)
+
+    def _refresh_events(self) -> bool:
+        changed = False
+        for event in self.api.base_station.get_pending_events():
+            for listener in list(self._event_listeners):
+                listener(event)
+            if isinstance(event, BatteryStatus):
+                changed |= self._set("headset_battery_percent", int(round(event.headset_percent)))
+                changed |= self._set("base_battery_percent", int(round(event.charging_percent)))
+            elif isinstance(event, VolumeKnobEvent):
+                changed |= self._set("headset_volume_percent", int(round(event.volume_percent)))
+            elif isinstance(event, AncStatus):
+                changed |= self._set("anc_mode", event.mode.value)
+            elif isinstance(event, MicStatus):
+                changed |= self._set("mic_mute", not event.enabled)
+            elif isinstance(event, SidetoneStatus):
+                changed |= self._set("sidetone_level", event.level)
+            elif isinstance(event, OledBrightnessStatus):
+                changed |= self._set("oled_brightness", event.level)
+            elif isinstance(event, HeadsetConnectionStatus):
+                changed |= self._set("connected", event.wireless)
+                changed |= self._set("wireless", event.wireless)
+                changed |= self._set("bluetooth", event.bluetooth)
+                if event.wireless:
+                    changed |= self._set("anc_mode", "off")
+        return changed
+
+    def _refresh_sonar(self) -> bool:
+        if self._async_sonar is None:
+            return False
+        channel_volume = dict(self.store.get("channel_volume") or {})
+        channel_mute = dict(self.store.get("channel_mute") or {})
+        channel_preset = dict(self.store.get("channel_preset") or {})
+        channel_preset_name = dict(self.store.get("channel_preset_name") or {})
+        mixer = asyncio.run(self._async_sonar.read_mixer_state(include_chat_mix=self.include_chat_mix))
+        snapshot = mixer.volumes
+        selected_presets = mixer.selected_presets
+        for channel in CHANNELS:
+            if snapshot is not None:
+                volume = snapshot.get_volume(CHANNEL_MAP[channel])
+                if volume is not None:
+                    channel_volume[channel] = int(round(volume * 100))
+                muted = snapshot.get_mute(CHANNEL_MAP[channel])
+                if muted is not None:
+                    channel_mute[channel] = bool(muted)
+            if selected_presets is not None:
+                selected = selected_presets.get(PRESET_CHANNEL_MAP[channel])
+                channel_preset[channel] = selected.preset_id if selected else None
+                channel_preset_name[channel] = selected.name if selected else None
+        changed = self._set("channel_volume", channel_volume)
+        changed |= self._set("channel_mute", channel_mute)
+        changed |= self._set("channel_preset", channel_preset)
+        changed |= self._set("channel_preset_name", channel_preset_name)
+        if mixer.routed_apps is not None:
+            changed |= self._set("channel_apps", mixer.routed_apps)
+        balance = extract_chat_mix_balance(mixer.chat_mix)
+        if balance is not None:
+            balance = max(-1.0, min(1.0, balance))
+            changed |= self._set("chat_mix_balance", int(round((balance + 1.0) * 50)))
+        return changed
+
+    def _refresh_hardware(self) -> bool:
+        base_station = self.api.base_station
+        changed = False
+        for query in self.hardware_queries:
+            try:
+                if query == "oled_brightness":
+                    brightness = base_station.get_oled_brightness()
+                    if brightness is not None:
+                        changed |= self._set("oled_brightness", int(brightness))
+                elif query == "headset_volume":
+                    volume_pct = base_station.get_headset_volume_percentage()
+                    if volume_pct is not None:
+                        changed |= self._set("headset_volume_percent", int(round(volume_pct)))
+                elif query == "anc":
+                    anc = base_station.get_anc_status()
+                    if anc is not None:
+                        changed |= self._set("anc_mode", anc.mode.value)
+                elif query == "mic":
+                    mic = base_station.get_mic_status()
+                    if mic is not None:
+                        changed |= self._set("mic_mute", not mic.enabled)
+                elif query == "sidetone":
+                    sidetone = base_station.get_sidetone_status()
+                    if sidetone is not None:
+                        changed |= self._set("sidetone_level", sidetone.level)
+                elif query == "battery":
+                    battery = base_station.get_battery_status()
+                    if battery is not None:
+                        changed |= self._set("headset_battery_percent", int(round(battery.headset_percent)))
+                        changed |= self._set("base_battery_percent", int(round(battery.charging_percent)))
+                elif query == "usb_input":
+                    usb = base_station.get_active_usb_input()
+                    if usb is not None:
+                        changed |= self._set("active_usb_input", usb.value)
+            except Exception:
+                continue
+        return changed
+
+    def _refresh_presets(self) -> bool:
+        catalog = self.api.sonar.preset_catalog
+        # Errors propagate to `_poll`, so a failed refresh keeps the last known presets.
+        if not catalog.refresh() and self._presets:
+            return False
+        presets = {
+            channel: catalog.favorites(preset_channel) or catalog.presets(preset_channel)
+            for channel, preset_channel in PRESET_CHANNEL_MAP.items()
+        }
+        if presets == self._presets:
+            return False
+        self._presets = presets
+        for listener in list(self._preset_listeners):
+            listener(dict(presets))
+        # The preset list is not part of the versioned state; subscribers are told directly.
+        return False
+
+    def _save(self) -> None:
+        # Serialisation and disk I/O happen on the writer thread, coalesced over `persist_delay`.
+        if self._writer is not None:
+            self._writer.schedule(self.store.snapshot())
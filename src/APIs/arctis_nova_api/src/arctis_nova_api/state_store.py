@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any
+
+# JSON-patch style operations, e.g. {"op": "replace", "path": "/channel_volume/game", "value": 40}.
+PatchOp = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class StateDelta:
+    """Changes between state versions `base` and `seq`, as JSON-patch style operations."""
+
+    seq: int
+    base: int
+    ops: tuple[PatchOp, ...]
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """Top-level state keys touched by this delta."""
+        return frozenset(_unescape(op["path"].split("/")[1]) for op in self.ops)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"seq": self.seq, "base": self.base, "ops": list(self.ops)}
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """
+    One committed state version, never mutated after creation.
+
+    Readers take `store.current` without locking; a new commit swaps in a
+    new snapshot. `etag` identifies the version across store instances and
+    `json` is the compact encoding, built once per version on first use.
+    """
+
+    seq: int
+    epoch: str
+    state: Mapping[str, Any]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.epoch}-{self.seq}"'
+
+    @cached_property
+    def json(self) -> bytes:
+        return json.dumps(self.state, separators=(",", ":"), default=dict).encode("utf-8")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Mutable copy of the state, one level deep."""
+        return {key: dict(value) if isinstance(value, Mapping) else value for key, value in self.state.items()}
+
+
+class VersionedStateStore:
+    """
+    Key/value state with a sequence number that advances on each committed change.
+
+    Writers stage values with `set`/`update` and call `commit()` once per
+    refresh cycle; it returns the delta since the previous commit (or None
+    when nothing changed) so frontends only receive and process changed
+    fields. Dict values are diffed one level deep, so a single channel
+    volume change is one small operation rather than the whole map.
+    `resync()` returns the full state with its sequence number for clients
+    that join late or detect a gap; `current` is the same version as an
+    immutable `StateSnapshot` that can be read without the lock.
+    """
+
+    def __init__(self, initial: Mapping[str, Any] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] = _copy_state(initial or {})
+        self._committed: dict[str, Any] = _copy_state(self._state)
+        self._seq = 0
+        # Distinguishes versions of different store instances (e.g. across backend restarts) in ETags.
+        self._epoch = os.urandom(4).hex()
+        self.current = _freeze(self._seq, self._epoch, self._committed)
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._state.get(key, default)
+
+    def set(self, key: str, value: Any) -> bool:
+        """Stage a value; returns True when it differs from the current one."""
+        with self._lock:
+            if key in self._state and self._state[key] == value:
+                return False
+            self._state[key] = _copy_value(value)
+            return True
+
+    def update(self, values: Mapping[str, Any]) -> bool:
+        changed = False
+        for key, value in values.items():
+            changed |= self.set(key, value)
+        return changed
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return _copy_state(self._state)
+
+    def commit(self) -> StateDelta | None:
+        """Publish staged changes as a new version; None when state is unchanged since the last commit."""
+        with self._lock:
+            ops = diff_state(self._committed, self._state)
+            if not ops:
+                return None
+            base = self._seq
+            self._seq += 1
+            self._committed = _copy_state(self._state)
+            self.current = _freeze(self._seq, self._epoch, self._committed)
+            return StateDelta(seq=self._seq, base=base, ops=tuple(ops))
+
+    def resync(self) -> dict[str, Any]:
+        """Full committed state with its sequence number: `{"seq": n, "state": {...}}`."""
+        with self._lock:
+            return {"seq": self._seq, "state": _copy_state(self._committed)}
+
+
+def diff_state(old: Mapping[str, Any], new: Mapping[str, Any]) -> list[PatchOp]:
+    """Operations that turn `old` into `new`, recursing one level into dict values."""
+    ops: list[PatchOp] = []
+    for key, value in new.items():
+        path = "/" + _escape(key)
+        if key not in old:
+            ops.append({"op": "add", "path": path, "value": value})
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                sub_path = f"{path}/{_escape(str(sub_key))}"
+                if sub_key not in previous:
+                    ops.append({"op": "add", "path": sub_path, "value": sub_value})
+                elif previous[sub_key] != sub_value:
+                    ops.append({"op": "replace", "path": sub_path, "value": sub_value})
+            for sub_key in previous:
+                if sub_key not in value:
+                    ops.append({"op": "remove", "path": f"{path}/{_escape(str(sub_key))}"})
+        else:
+            ops.append({"op": "replace", "path": path, "value": value})
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": "/" + _escape(key)})
+    return ops
+
+
+def apply_state_patch(state: Mapping[str, Any], ops: list[PatchOp] | tuple[PatchOp, ...]) -> dict[str, Any]:
+    """Return a copy of `state` with `ops` applied; untouched dict values are shared, not copied."""
+    result = dict(state)
+    copied: set[str] = set()
+    for op in ops:
+        parts = [_unescape(part) for part in op["path"].split("/")[1:]]
+        key = parts[0]
+        if len(parts) == 1:
+            if op["op"] == "remove":
+                result.pop(key, None)
+            else:
+                result[key] = op["value"]
+            copied.add(key)
+            continue
+        if key not in copied:
+            result[key] = dict(result.get(key) or {})
+            copied.add(key)
+        if op["op"] == "remove":
+            result[key].pop(parts[1], None)
+        else:
+            result[key][parts[1]] = op["value"]
+    return result
+
+
+def _freeze(seq: int, epoch: str, state: Mapping[str, Any]) -> StateSnapshot:
+    frozen = {key: MappingProxyType(dict(value)) if isinstance(value, dict) else value for key, value in state.items()}
+    return StateSnapshot(seq=seq, epoch=epoch, state=MappingProxyType(frozen))
+
+
+def _copy_state(state: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: _copy_value(value) for key, value in state.items()}
+
+
+def _copy_value(value: Any) -> Any:
+    # Staged dicts are copied one level deep so later caller mutations cannot leak into a committed version.
+    return dict(value) if isinstance(value, dict) else value
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
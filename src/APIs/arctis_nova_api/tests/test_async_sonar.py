@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+
+from arctis_nova_api.async_sonar import AsyncSonarClient
+from arctis_nova_api.core import AsyncHttpClient
+from arctis_nova_api.models import PresetChannel, SonarChannel
+from arctis_nova_api.sonar import SonarClient
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+
+class _ConcurrentHttp:
+    """Volume and chat mix reads only complete once both are in flight."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def request(self, method, url, **kwargs):
+        if url.endswith("/subApps"):
+            return _FakeResponse(
+                {
+                    "subApps": {
+                        "sonar": {
+                            "isEnabled": True,
+                            "isReady": True,
+                            "isRunning": True,
+                            "metadata": {"webServerAddress": "http://localhost:5566"},
+                        }
+                    }
+                }
+            )
+        if url.endswith("/mode/"):
+            return _FakeResponse("classic")
+        if url.endswith("/volumeSettings/classic"):
+            self.barrier.wait()
+            return _FakeResponse({"masters": {"classic": {"volume": 0.8, "muted": False}}, "devices": {}})
+        if url.endswith("/chatMix"):
+            self.barrier.wait()
+            return _FakeResponse({"balance": 0.25})
+        if "/AudioDeviceRouting" in url:
+            raise RuntimeError("routing unavailable")
+        return _FakeResponse({})
+
+
+def test_read_mixer_state_runs_reads_concurrently(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+    db = tmp_path / "database.db"
+    with sqlite3.connect(db) as conn:
+        conn.executescript(
+            """
+            create table configs (id text, name text, vad integer);
+            create table selected_config (config_id text, vad integer);
+            insert into configs values ('g1', 'Game Preset', 1);
+            insert into selected_config values ('g1', 1);
+            """
+        )
+
+    fake_http = _ConcurrentHttp()
+    client = AsyncSonarClient(SonarClient(sonar_db_path=db, http_client=fake_http), AsyncHttpClient(fake_http))
+    try:
+        state = asyncio.run(client.read_mixer_state())
+    finally:
+        client.close()
+
+    assert state.volumes is not None
+    assert state.volumes.get_volume(SonarChannel.MASTER) == 0.8
+    assert state.chat_mix == {"balance": 0.25}
+    assert state.routed_apps is None
+    assert state.selected_presets[PresetChannel.GAMING].preset_id == "g1"
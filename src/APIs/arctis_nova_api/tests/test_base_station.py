@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import queue
+import time
+
 import pytest
 
 from arctis_nova_api.base_station import BaseStationClient, ExperimentalCommandProfile
 from arctis_nova_api.errors import UnsupportedFeatureError
+from arctis_nova_api.hid_reader import HidReportReader
 from arctis_nova_api.models import AncMode
 
 
@@ -37,8 +41,9 @@ class _FakeDevice:
 class _FakeHidBackend:
     def __init__(self):
         self.devices = [
-            {"interface_number": 4, "path": b"dev-a"},
-            {"interface_number": 4, "path": b"dev-b"},
+            {"interface_number": 4, "path": b"dev-a", "product_id": 0x12E0},
+            {"interface_number": 4, "path": b"dev-b", "product_id": 0x12E0},
+            {"interface_number": 4, "path": b"mouse", "product_id": 0x1836},
         ]
         self._created = []
 
@@ -206,3 +211,117 @@ def test_decode_oled_brightness_event():
     events = client.get_pending_events()
     assert events
     assert client.get_oled_brightness() == 10
+
+
+class _BlockingDevice(_FakeDevice):
+    """Behaves like hidapi: `read` waits up to its timeout for a report."""
+
+    def __init__(self):
+        super().__init__()
+        self.reports = queue.Queue()
+
+    def read(self, length, timeout_ms=0):
+        try:
+            return self.reports.get(timeout=timeout_ms / 1000.0)
+        except queue.Empty:
+            return []
+
+
+class _BlockingHidBackend(_FakeHidBackend):
+    def device(self):
+        dev = _BlockingDevice()
+        self._created.append(dev)
+        return dev
+
+
+def test_background_reader_feeds_buffer_callbacks_and_queues():
+    hid = _BlockingHidBackend()
+    client = BaseStationClient(hid_backend=hid, background_reader=True, event_buffer_size=4)
+    client.connect()
+    try:
+        assert client.background_reader_running
+        received = []
+        unsubscribe = client.subscribe(received.append)
+        events = client.subscribe_queue()
+
+        info_device = hid._created[1]
+        info_device.reports.put([0x07, 0xB7, 70, 20, 0])
+        status = client.get_battery_status(refresh_timeout_seconds=1.0)
+        assert status is not None and status.headset == 70
+        assert events.get(timeout=1.0) == status
+        assert received == [status]
+        assert client.get_pending_events() == [status]
+
+        unsubscribe()
+        client.unsubscribe_queue(events)
+        for level in range(1, 7):
+            info_device.reports.put([0x07, 0x85, level, 0, 0])
+        deadline = time.monotonic() + 1.0
+        while client.get_oled_brightness() != 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.get_oled_brightness() == 6
+        assert [event.level for event in client.get_pending_events()] == [3, 4, 5, 6]
+        assert client.dropped_events == 2
+        assert received == [status]
+    finally:
+        client.close()
+    assert not client.background_reader_running
+
+
+class _EchoDevice(_BlockingDevice):
+    """Queues `reply` as soon as a command is written, before `write` returns."""
+
+    def __init__(self, reply):
+        super().__init__()
+        self.reply = reply
+
+    def write(self, data):
+        self.reports.put(list(self.reply))
+        # Give the reader thread time to consume the reply before the caller starts waiting.
+        time.sleep(0.1)
+        return super().write(data)
+
+
+class _EchoHidBackend(_FakeHidBackend):
+    def device(self):
+        dev = _EchoDevice([0x06, 0xB7, 3, 6, 0])
+        self._created.append(dev)
+        return dev
+
+
+def test_request_in_reader_mode_sees_reply_that_beats_the_wait():
+    hid = _EchoHidBackend()
+    profile = ExperimentalCommandProfile(battery_query_command=[0x06, 0xA1])
+    client = BaseStationClient(hid_backend=hid, command_profile=profile, background_reader=True)
+    client.connect()
+    try:
+        started = time.monotonic()
+        battery = client.request_battery_status(timeout_seconds=2.0)
+        assert battery is not None and battery.headset == 3
+        assert time.monotonic() - started < 1.0
+    finally:
+        client.close()
+
+
+def test_reader_survives_a_failing_report_handler(caplog):
+    device = _BlockingDevice()
+    handled = []
+
+    def on_report(data):
+        if data[0] == 0xFF:
+            raise RuntimeError("bad report")
+        handled.append(data)
+
+    reader = HidReportReader(device, on_report, read_timeout_ms=20)
+    reader.start()
+    try:
+        device.reports.put([0xFF])
+        device.reports.put([0x07, 0x85, 3])
+        deadline = time.monotonic() + 1.0
+        while not handled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert handled == [[0x07, 0x85, 3]]
+        assert reader.is_alive() and reader.error is None
+        assert "HID report handler failed" in caplog.text
+    finally:
+        reader.stop()
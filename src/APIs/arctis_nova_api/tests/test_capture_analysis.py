@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+from arctis_nova_api.base_station import ExperimentalCommandProfile
+from arctis_nova_api.capture_format import CaptureWriter
+from arctis_nova_api.capture_parser import load_capture
+from arctis_nova_api.models import AncMode
+
+np = pytest.importorskip("numpy")
+
+from arctis_nova_api.capture_analysis import (  # noqa: E402
+    change_points,
+    command_counts,
+    load_report_matrix,
+    position_entropy,
+    position_histograms,
+    value_index_candidates,
+    window_ids,
+)
+
+SECOND = 1_000_000_000
+
+
+def _anc_session(path):
+    # Toggle ANC transparency -> anc -> off with 5 s between actions; 0x25 volume noise in between.
+    with CaptureWriter(path, ["dev"], wall_anchor_ns=0, mono_anchor_ns=0) as writer:
+        for window, mode in enumerate([1, 2, 0]):
+            base = window * 5 * SECOND
+            writer.write(base, 0, bytes([0x07, 0xBD, mode, 0, window]))
+            writer.write(base + SECOND // 10, 0, bytes([0x07, 0xBD, mode, 0, window + 7]))
+            writer.write(base + SECOND // 5, 0, bytes([0x07, 0x25, 0x10 + window]))
+
+
+def test_report_matrix_histograms_and_windows(tmp_path):
+    path = tmp_path / "anc.bin"
+    _anc_session(path)
+    matrix = load_report_matrix(path)
+    assert matrix.reports.shape == (9, 64)
+    assert matrix.reports.dtype == np.uint8
+    assert command_counts(matrix) == {0xBD: 6, 0x25: 3}
+    assert window_ids(matrix, gap_seconds=1.0).tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+
+    histograms = position_histograms(matrix, 0xBD)
+    assert histograms.shape == (64, 256)
+    assert histograms[2, [0, 1, 2]].tolist() == [2, 2, 2]
+    entropy = position_entropy(histograms)
+    assert entropy[1] == 0.0
+    assert entropy[2] == pytest.approx(np.log2(3))
+
+    jsonl_matrix = load_report_matrix(load_capture(path))
+    assert np.array_equal(jsonl_matrix.reports, matrix.reports)
+    assert np.array_equal(jsonl_matrix.ts_ns, matrix.ts_ns)
+
+
+def test_change_points_and_profile_candidates(tmp_path):
+    path = tmp_path / "anc.bin"
+    _anc_session(path)
+    matrix = load_report_matrix(path)
+
+    points = change_points(matrix, 0xBD, gap_seconds=1.0)
+    assert [(p.window_before, p.window_after) for p in points] == [(0, 1), (1, 2)]
+    assert points[0].positions == (2, 4)
+    assert points[0].before == (1, 7)
+    assert points[0].after == (2, 8)
+
+    best = value_index_candidates(matrix, 0xBD, gap_seconds=1.0)[0]
+    assert best.value_index == 2
+    assert best.values == (1, 2, 0)
+    assert best.stability == 1.0
+
+    fields = best.profile_fields("anc", [AncMode.TRANSPARENCY, AncMode.ANC, AncMode.OFF])
+    profile = ExperimentalCommandProfile(**fields)
+    assert profile.anc_event_command_id == 0xBD
+    assert profile.anc_value_map == {0: AncMode.OFF, 1: AncMode.TRANSPARENCY, 2: AncMode.ANC}
@@ -1,8 +1,26 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime, timedelta, timezone
 
-from arctis_nova_api.capture_parser import CaptureRecord, split_time_windows, summarize_windows, top_unknown_types
+import pytest
+
+from arctis_nova_api.capture_format import CaptureWriter
+from arctis_nova_api.errors import InvalidArgumentError
+from arctis_nova_api.capture_parser import (
+    CaptureRecord,
+    UnknownTypeCounter,
+    export_capture_jsonl,
+    import_jsonl_capture,
+    iter_captures,
+    iter_window_summaries,
+    load_capture,
+    merge_capture_streams,
+    open_capture,
+    split_time_windows,
+    summarize_windows,
+    top_unknown_types,
+)
 
 
 def _rec(base: datetime, offset: float, raw_hex: str, decoded_type: str | None) -> CaptureRecord:
@@ -31,3 +49,126 @@ def test_split_and_summarize_unknown_windows():
     assert top[0][0] == "unknown_0xb1"
     assert top[0][1] == 2
 
+
+def test_streaming_windows_match_list_based_summaries_across_merged_captures(tmp_path):
+    base_ns = 1_771_761_600_000_000_000
+    first, second = tmp_path / "a.bin", tmp_path / "b.bin"
+    # Two devices interleaved in one file, a third in a separate capture.
+    with CaptureWriter(first, ["dev-a", "dev-b"], wall_anchor_ns=base_ns, mono_anchor_ns=0) as writer:
+        writer.write(0, 0, bytes([0x07, 0xB1, 0]))
+        writer.write(100_000_000, 1, bytes([0x07, 0xB1, 1]))
+        writer.write(200_000_000, 0, bytes([0x07, 0x25, 0x10]))
+        writer.write(5_000_000_000, 1, bytes([0x07, 0xB2, 0]))
+    with CaptureWriter(second, ["dev-c"], wall_anchor_ns=base_ns, mono_anchor_ns=0) as writer:
+        writer.write(150_000_000, 0, bytes([0x07, 0xB1, 2]))
+        writer.write(5_100_000_000, 0, bytes([0x07, 0xB2, 1]))
+
+    merged = list(iter_captures([first, second]))
+    assert [r.path for r in merged] == ["dev-a", "dev-b", "dev-c", "dev-a", "dev-b", "dev-c"]
+    assert merged == sorted(load_capture(first) + load_capture(second), key=lambda r: r.ts)
+
+    totals = UnknownTypeCounter()
+    streamed = list(iter_window_summaries(iter_captures([first, second]), gap_seconds=1.0, totals=totals))
+    assert streamed == summarize_windows(split_time_windows(merged, gap_seconds=1.0))
+    assert [s.unknown_by_type for s in streamed] == [{"unknown_0xb1": 3}, {"unknown_0xb2": 2}]
+    assert totals.total_records == 6
+    assert totals.top() == top_unknown_types(merged)
+
+
+def test_binary_capture_roundtrip_through_jsonl(tmp_path):
+    base = datetime(2026, 2, 22, 12, 0, 0, tzinfo=timezone.utc)
+    jsonl = tmp_path / "capture.jsonl"
+    lines = [
+        {"ts": (base + timedelta(seconds=1.5)).isoformat(), "path": "dev-b", "raw_hex": "07b7502000"},
+        {"ts": base.isoformat(), "path": "dev-a", "raw_hex": "07b1000000"},
+        {"ts": (base + timedelta(seconds=0.25)).isoformat(), "path": "dev-a", "raw_hex": "0725100000"},
+    ]
+    jsonl.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+
+    binary = tmp_path / "capture.bin"
+    assert import_jsonl_capture(jsonl, binary) == 3
+    with open_capture(binary) as capture:
+        assert len(capture) == 3
+        assert capture.paths == ("dev-a", "dev-b")
+        assert capture.path_id(2) == 1
+        assert bytes(capture.raw(1)[:3]) == bytes([0x07, 0x25, 0x10])
+        assert len(capture.raw(1)) == 64
+
+    from_jsonl = load_capture(jsonl)
+    from_binary = load_capture(binary)
+    assert [r.ts for r in from_binary] == [r.ts for r in from_jsonl]
+    assert [r.path for r in from_binary] == [r.path for r in from_jsonl]
+    assert [r.decoded_type for r in from_binary] == ["unknown_0xb1", "volume", "battery"]
+
+    exported = tmp_path / "exported.jsonl"
+    assert export_capture_jsonl(binary, exported) == 3
+    assert [r.raw_hex[:10] for r in load_capture(exported)] == ["07b1000000", "0725100000", "07b7502000"]
+
+
+def test_out_of_order_captures_are_sorted_and_unordered_streams_rejected(tmp_path):
+    base = datetime(2026, 2, 22, 12, 0, 0, tzinfo=timezone.utc)
+    jsonl = tmp_path / "concatenated.jsonl"
+    # Two sessions appended in the wrong order, e.g. `cat later.jsonl earlier.jsonl`.
+    offsets = [60.0, 60.5, 0.0, 0.5, 10.0]
+    jsonl.write_text(
+        "".join(
+            json.dumps({"ts": (base + timedelta(seconds=offset)).isoformat(), "path": "dev", "raw_hex": "07b1%02x" % i})
+            + "\n"
+            for i, offset in enumerate(offsets)
+        ),
+        encoding="utf-8",
+    )
+    expected = [base + timedelta(seconds=offset) for offset in sorted(offsets)]
+    assert [r.ts for r in load_capture(jsonl)] == expected
+    assert [r.ts for r in iter_captures([jsonl])] == expected
+
+    binary = tmp_path / "unordered.bin"
+    with CaptureWriter(binary, ["dev-a", "dev-b"], wall_anchor_ns=0, mono_anchor_ns=0) as writer:
+        writer.write(2_000_000_000, 0, bytes([0x07, 0xB1, 0]))
+        writer.write(1_000_000_000, 1, bytes([0x07, 0xB1, 1]))
+        writer.write(3_000_000_000, 0, bytes([0x07, 0xB1, 2]))
+    assert [r.path for r in load_capture(binary)] == ["dev-b", "dev-a", "dev-a"]
+
+    unordered = list(reversed(load_capture(jsonl)))
+    with pytest.raises(InvalidArgumentError, match="not in time order"):
+        list(merge_capture_streams(load_capture(binary), unordered))
+
+
+def test_binary_capture_ignores_truncated_record_and_maps_to_numpy(tmp_path):
+    path = tmp_path / "live.bin"
+    with CaptureWriter(path, ["dev"], wall_anchor_ns=10_000, mono_anchor_ns=500) as writer:
+        writer.write(600, 0, bytes([0x07, 0x25, 0x10]))
+        writer.write(700, 0, bytes([0x07, 0xB7, 80, 25]))
+    with path.open("ab") as fp:
+        fp.write(b"\x01\x02\x03")
+
+    with open_capture(path) as capture:
+        assert len(capture) == 2
+        assert capture.wall_ns(1) == 10_200
+        pytest.importorskip("numpy")
+        array = capture.to_numpy()
+        assert array["ts_ns"].tolist() == [600, 700]
+        assert array["raw"][1][2] == 80
+        del array
+
+
+def test_capture_writer_appends_record_blocks_from_another_capture(tmp_path):
+    part, joined = tmp_path / "part.bin", tmp_path / "joined.bin"
+    with CaptureWriter(part, ["usb:out", "usb:in"], wall_anchor_ns=0, mono_anchor_ns=0) as writer:
+        writer.write(1_000, 1, bytes([0x07, 0xB7, 80]))
+        writer.write(2_000, 0, bytes([0x06, 0xB1]))
+
+    with CaptureWriter(joined, ["usb:out", "usb:in"], wall_anchor_ns=0, mono_anchor_ns=0) as writer:
+        writer.write(500, 0, bytes([0x06, 0xB0]))
+        with open_capture(part) as capture:
+            records = capture.records
+            writer.write_records(records)
+            records.release()
+        with pytest.raises(InvalidArgumentError):
+            writer.write_records(b"\x00" * 10)
+        assert writer.count == 3
+
+    with open_capture(joined) as capture:
+        assert [capture.path_id(i) for i in range(len(capture))] == [0, 1, 0]
+        assert capture.monotonic_ns(1) == 1_000
+        assert bytes(capture.raw(1)[:3]) == bytes([0x07, 0xB7, 80])
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from arctis_nova_api.capture_format import CaptureWriter
+from arctis_nova_api.capture_parser import open_capture
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import capture_usb_commands as tool  # noqa: E402
+
+needs_posix = pytest.mark.skipif(os.name == "nt", reason="fake tools are shell scripts")
+
+
+def _script(path: Path, body: str) -> str:
+    path.write_text("#!/bin/sh\n" + body, encoding="utf-8")
+    path.chmod(0o755)
+    return str(path)
+
+
+def _args(tmp_path: Path, **overrides) -> argparse.Namespace:
+    values = {
+        "output": tmp_path / "usb_capture.pcapng",
+        "capinfos": str(tmp_path / "missing-capinfos"),
+        "editcap": str(tmp_path / "missing-editcap"),
+        "chunk_frames": 100,
+    }
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+@needs_posix
+def test_count_frames_reads_capinfos_table(tmp_path):
+    capinfos = _script(tmp_path / "capinfos", 'printf "File name\\tNumber of packets\\n%s\\t1234\\n" "$6"\n')
+    assert tool.count_frames(_args(tmp_path, capinfos=capinfos)) == 1234
+
+
+def test_count_frames_without_capinfos_is_none(tmp_path):
+    assert tool.count_frames(_args(tmp_path)) is None
+
+
+@needs_posix
+def test_split_capture_returns_chunks_in_frame_order(tmp_path):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    # Like editcap: <output stem>_<5-digit index>_<timestamp><suffix>; written out of order on purpose.
+    editcap = _script(
+        tmp_path / "editcap",
+        'stem="${4%.pcapng}"\n'
+        'for i in 00002 00000 00001; do echo "$i" > "${stem}_${i}_20260101120000.pcapng"; done\n',
+    )
+    args = _args(tmp_path, editcap=editcap)
+    chunks = tool.split_capture(args, 250, scratch)
+    assert [chunk.read_text().strip() for chunk in chunks] == ["00000", "00001", "00002"]
+
+
+def test_split_capture_keeps_small_or_unsplittable_captures_whole(tmp_path):
+    args = _args(tmp_path)
+    assert tool.split_capture(args, None, tmp_path) == [args.output]
+    assert tool.split_capture(args, 100, tmp_path) == [args.output]
+    # editcap is missing: falls back to one pass instead of failing.
+    assert tool.split_capture(args, 1000, tmp_path) == [args.output]
+
+
+def test_join_capture_parts_concatenates_in_part_order(tmp_path):
+    parts = []
+    for index, stamps in enumerate(([10, 20], [30])):
+        part = tmp_path / f"capture.hidcap.part{index}"
+        with CaptureWriter(part, tool.CAPTURE_PATHS, wall_anchor_ns=0, mono_anchor_ns=0) as writer:
+            for ts in stamps:
+                writer.write(ts, index, bytes([ts]))
+        parts.append(part)
+    destination = tmp_path / "capture.hidcap"
+    tool._join_capture_parts(destination, parts)
+    with open_capture(destination) as capture:
+        rows = [(ts, path_id, raw[0]) for ts, path_id, raw in capture.iter_records()]
+    assert rows == [(10, 0, 10), (20, 0, 20), (30, 1, 30)]
+
+
+def test_join_csv_parts_writes_one_header(tmp_path):
+    parts = []
+    for index, line in enumerate(("1.0,0x02,06a0\r\n", "2.0,0x83,07b1\r\n")):
+        part = tmp_path / f"packets.csv.part{index}"
+        part.write_text(line, encoding="utf-8", newline="")
+        parts.append(part)
+    destination = tmp_path / "packets.csv"
+    tool._join_csv_parts(destination, parts)
+    assert destination.read_text(encoding="utf-8").splitlines() == [
+        "ts,endpoint,payload",
+        "1.0,0x02,06a0",
+        "2.0,0x83,07b1",
+    ]
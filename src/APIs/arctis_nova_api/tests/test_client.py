@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import arctis_nova_api.client as client_module
+from arctis_nova_api import ArctisNovaProApi
+from arctis_nova_api.errors import DiscoveryError
+
+
+class _FakeSonar:
+    def __init__(self, barrier, **kwargs):
+        # Only passes when the base station connects at the same time.
+        barrier.wait(timeout=2.0)
+
+
+class _FakeBaseStation:
+    def __init__(self, barrier, **kwargs):
+        self.barrier = barrier
+        self.connected = False
+
+    def connect(self):
+        self.barrier.wait(timeout=2.0)
+        self.connected = True
+
+
+class _BrokenGameSense:
+    def __init__(self, **kwargs):
+        raise DiscoveryError("coreProps.json not found")
+
+
+def test_sub_clients_are_lazy_and_discovered_in_parallel(monkeypatch):
+    barrier = threading.Barrier(2)
+    built = []
+    monkeypatch.setattr(client_module, "SonarClient", lambda **kw: built.append("sonar") or _FakeSonar(barrier))
+    monkeypatch.setattr(
+        client_module, "BaseStationClient", lambda **kw: built.append("base_station") or _FakeBaseStation(barrier)
+    )
+    monkeypatch.setattr(client_module, "GameSenseClient", _BrokenGameSense)
+
+    api = ArctisNovaProApi()
+    assert built == []
+
+    errors = api.discover()
+    assert sorted(built) == ["base_station", "sonar"]
+    assert api.base_station.connected
+    assert set(errors) == {"gamesense"} and isinstance(errors["gamesense"], DiscoveryError)
+    # Built clients are reused; the failed one is retried on access.
+    assert api.sonar is api.sonar and len(built) == 2
+    with pytest.raises(DiscoveryError):
+        api.gamesense
+
+
+def test_endpoint_cache_is_opt_in(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(client_module, "SonarClient", lambda **kw: calls.append(kw["endpoint_cache_path"]))
+    ArctisNovaProApi().sonar
+    ArctisNovaProApi(endpoint_cache_path=tmp_path / "endpoints.json").sonar
+    assert calls == [None, tmp_path / "endpoints.json"]
+
+
+def test_close_releases_only_built_clients(monkeypatch):
+    class _ClosingSonar:
+        closed = False
+
+        def __init__(self, **kwargs):
+            pass
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(client_module, "SonarClient", _ClosingSonar)
+    monkeypatch.setattr(client_module, "BaseStationClient", lambda **kw: pytest.fail("base station built on close"))
+    api = ArctisNovaProApi()
+    sonar = api.sonar
+    api.close()
+    assert sonar.closed
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from arctis_nova_api.commands import CommandCoalescer
+
+
+def _key(cmd):
+    name, channel, _value = cmd
+    return (name, channel) if name == "volume" else None
+
+
+def test_coalescer_keeps_latest_value_and_rate_limits():
+    now = [0.0]
+    queue = CommandCoalescer(_key, min_interval=0.1, clock=lambda: now[0])
+
+    for value in range(10):
+        queue.put(("volume", "game", value))
+    queue.put(("preset", "game", "p1"))
+    queue.put(("preset", "game", "p2"))
+    queue.put(("volume", "chat", 5))
+
+    assert queue.drain() == [("volume", "game", 9), ("preset", "game", "p1"), ("preset", "game", "p2"), ("volume", "chat", 5)]
+    assert queue.coalesced == 9
+
+    # Within the interval the write is held, and newer values replace it.
+    queue.put(("volume", "game", 20))
+    queue.put(("volume", "game", 30))
+    assert queue.drain() == []
+    assert queue.next_due() == 0.1
+
+    now[0] = 0.25
+    assert queue.drain() == [("volume", "game", 30)]
+    assert len(queue) == 0
+    assert queue.next_due() is None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+from arctis_nova_api.errors import ApiRequestError, DiscoveryError
+from arctis_nova_api.gamesense import GameSenseClient
+from arctis_nova_api.mock_server import MockSonarServer, write_sonar_database
+from arctis_nova_api.models import PresetChannel, SonarChannel, StreamerSlider
+from arctis_nova_api.sonar import SonarClient
+
+
+def _client(server, tmp_path):
+    core_props = server.write_core_props(tmp_path / "coreProps.json")
+    return SonarClient(core_props_path=core_props, sonar_db_path=server.sonar_db_path, timeout=2.0)
+
+
+@pytest.mark.parametrize("profile", ["legacy", "capitalized", "modern"])
+def test_sonar_client_round_trip_per_profile(tmp_path, profile):
+    db_path = write_sonar_database(tmp_path / "database.db")
+    with MockSonarServer(profile=profile, sonar_db_path=db_path) as server:
+        client = _client(server, tmp_path)
+        try:
+            assert client.sonar_server_version == server.profile.gg_version
+            client.set_channel_volume(SonarChannel.GAME, 0.25)
+            client.set_channel_mute(SonarChannel.MASTER, True)
+            snapshot = client.get_volume_snapshot()
+            assert snapshot.streamer_mode is False
+            assert snapshot.classic[SonarChannel.GAME].volume == 0.25
+            assert snapshot.classic[SonarChannel.MASTER].muted is True
+
+            assert client.set_streamer_mode(True) is True
+            client.set_channel_volume(SonarChannel.MEDIA, 0.75, streamer_slider=StreamerSlider.STREAMING)
+            assert client.get_channel_volume(SonarChannel.MEDIA) == 0.75
+
+            client.set_chat_mix(-0.5)
+            assert client.get_chat_mix()["balance"] == -0.5
+            assert client.get_routed_apps_by_channel()["chatRender"] == ["Discord.exe"]
+
+            client.select_preset_for_channel(PresetChannel.CHAT, "Flat")
+            assert client.get_selected_preset(PresetChannel.CHAT).preset_id == "chat-1"
+        finally:
+            client.close()
+
+
+def test_learned_endpoints_cut_probe_requests(tmp_path):
+    with MockSonarServer(profile="capitalized") as server:
+        client = _client(server, tmp_path)
+        server.reset_counts()
+        client.set_channel_volume(SonarChannel.GAME, 0.3, streamer=False)
+        probing = sum(server.request_counts().values())
+        server.reset_counts()
+        client.set_channel_volume(SonarChannel.CHAT_RENDER, 0.4, streamer=False)
+        # Candidates for other GG generations 404 until the working template is learned.
+        assert probing > 1
+        assert server.request_counts() == {"volume_set": 1}
+        client.close()
+
+
+def test_error_injection_and_latency(tmp_path):
+    with MockSonarServer(route_latency={"chatMix": 0.05}) as server:
+        client = _client(server, tmp_path)
+        server.inject_error("chatMix", status=503)
+        with pytest.raises(ApiRequestError) as excinfo:
+            client.get_chat_mix()
+        assert excinfo.value.status_code == 503
+
+        started = time.perf_counter()
+        assert client.get_chat_mix()["balance"] == 0.0
+        assert time.perf_counter() - started >= 0.05
+        assert server.request_counts()["chatMix"] == 2
+        client.close()
+
+
+def test_discovery_reports_stopped_sonar(tmp_path):
+    with MockSonarServer() as server:
+        server.state.sonar_running = False
+        with pytest.raises(DiscoveryError, match="not running"):
+            _client(server, tmp_path)
+
+
+def test_gamesense_requests_are_accepted(tmp_path):
+    with MockSonarServer() as server:
+        client = GameSenseClient(core_props_path=server.write_core_props(tmp_path / "coreProps.json"))
+        client.heartbeat("arctis")
+        assert server.request_counts() == {"gamesense": 1}
+
+
+def test_existing_files_are_not_overwritten_without_opt_in(tmp_path):
+    db_path = write_sonar_database(tmp_path / "database.db", {PresetChannel.GAMING: ("Mine",)})
+    with pytest.raises(FileExistsError):
+        write_sonar_database(db_path)
+    with MockSonarServer(sonar_db_path=db_path) as server:
+        core_props = tmp_path / "coreProps.json"
+        core_props.write_text('{"address": "127.0.0.1:1"}', encoding="utf-8")
+        with pytest.raises(FileExistsError):
+            server.write_core_props(core_props)
+        assert core_props.read_text(encoding="utf-8") == '{"address": "127.0.0.1:1"}'
+        assert server.address in server.write_core_props(core_props, overwrite=True).read_text(encoding="utf-8")
+    write_sonar_database(db_path, overwrite=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        names = [row[0] for row in conn.execute("select name from configs where vad = ?", (PresetChannel.GAMING.value,))]
+    finally:
+        conn.close()
+    assert names == ["Default", "Flat"]
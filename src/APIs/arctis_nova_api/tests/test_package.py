@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import arctis_nova_api
+
+API_SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_every_export_resolves():
+    assert set(arctis_nova_api.__all__) == set(arctis_nova_api._EXPORTS)
+    for name in arctis_nova_api.__all__:
+        assert getattr(arctis_nova_api, name).__module__.startswith("arctis_nova_api.")
+    assert "HeadsetStateEngine" in dir(arctis_nova_api)
+
+
+def test_decoder_imports_skip_http_stack():
+    code = (
+        "import sys, arctis_nova_api, arctis_nova_api.sniffer, arctis_nova_api.base_station;"
+        "print(sorted(m for m in ('requests', 'sqlite3', 'asyncio') if m in sys.modules));"
+        "from arctis_nova_api import HeadsetStateEngine;"
+        "print(sorted(m for m in ('requests', 'sqlite3') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(API_SRC)}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    # The engine loads the HTTP stack only when it opens the API.
+    assert result.stdout.split() == ["[]", "[]"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from arctis_nova_api.persistence import StateFileWriter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_writer_coalesces_changes_and_skips_identical_bytes(tmp_path):
+    path = tmp_path / "state.json"
+    clock = _Clock()
+    writer = StateFileWriter(path, delay=10.0, clock=clock)
+    for battery in (10, 20, 30):
+        writer.schedule({"battery": battery})
+    assert not path.exists()  # still inside the coalescing window
+
+    writer.flush()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"battery": 30}
+    assert path.read_bytes() == b'{"battery":30}'
+    assert writer.writes == 1
+
+    writer.schedule({"battery": 30})
+    writer.flush()
+    assert (writer.writes, writer.skipped) == (1, 1)
+    writer.close()
+
+
+def test_writer_thread_writes_after_delay_and_close_flushes(tmp_path):
+    path = tmp_path / "nested" / "state.json"
+    writer = StateFileWriter(path, delay=0.01)
+    written = threading.Event()
+    original = writer._write
+
+    def write(state):
+        original(state)
+        written.set()
+
+    writer._write = write
+    writer.schedule({"knob": 1})
+    assert written.wait(2.0)
+    assert json.loads(path.read_text(encoding="utf-8")) == {"knob": 1}
+
+    writer.delay = 60.0
+    writer.schedule({"knob": 2})
+    writer.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"knob": 2}
+    writer.schedule({"knob": 3})
+    writer.flush()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"knob": 2}
+
+
+def test_writer_skips_write_when_file_already_matches(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_bytes(b'{"a":1}')
+    writer = StateFileWriter(path)
+    writer.schedule({"a": 1})
+    writer.close()
+    assert (writer.writes, writer.skipped) == (0, 1)
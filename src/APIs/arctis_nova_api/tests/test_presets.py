@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sqlite3
+
+from arctis_nova_api.models import PresetChannel
+from arctis_nova_api.presets import PresetCatalog
+
+
+def _make_db(path):
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            create table configs (id text, name text, vad integer, is_favorite integer);
+            create table selected_config (config_id text, vad integer);
+            insert into configs values ('g1', 'Flat', 1, 0);
+            insert into configs values ('g2', 'Footsteps', 1, 1);
+            insert into configs values ('c1', 'Voice', 2, 0);
+            insert into selected_config values ('g1', 1);
+            """
+        )
+
+
+def test_catalog_lookups_and_change_detection(tmp_path):
+    db = tmp_path / "database.db"
+    _make_db(db)
+    reader = sqlite3.connect(f"{db.as_uri()}?mode=ro", uri=True)
+    queries = []
+
+    def query(sql, params):
+        queries.append(sql)
+        return reader.execute(sql, params).fetchall()
+
+    catalog = PresetCatalog(db, query)
+    assert catalog.find(PresetChannel.GAMING, "  footSTEPS ").preset_id == "g2"
+    assert catalog.get("c1").channel is PresetChannel.CHAT
+    assert [p.preset_id for p in catalog.presets(PresetChannel.GAMING)] == ["g1", "g2"]
+    assert [p.preset_id for p in catalog.favorites(PresetChannel.GAMING)] == ["g2"]
+    assert catalog.selected(PresetChannel.GAMING).name == "Flat"
+    assert catalog.selected(PresetChannel.MEDIA) is None
+    assert catalog.generation == 1
+
+    # Unchanged database: only the data_version probe runs, no table reads.
+    queries.clear()
+    assert catalog.refresh() is False
+    assert queries == ["pragma data_version"]
+
+    with sqlite3.connect(db) as conn:
+        conn.execute("update selected_config set config_id = 'g2' where vad = 1")
+        conn.execute("insert into configs values ('m1', 'Podcast', 4, 1)")
+    assert catalog.selected(PresetChannel.GAMING).preset_id == "g2"
+    assert catalog.find(PresetChannel.MEDIA, "podcast").preset_id == "m1"
+    assert catalog.generation == 2
+    reader.close()
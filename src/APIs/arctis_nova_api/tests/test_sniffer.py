@@ -1,26 +1,63 @@
 from __future__ import annotations
 
-from arctis_nova_api.sniffer import decode_input_report
+from arctis_nova_api.base_station import ExperimentalCommandProfile
+from arctis_nova_api.decoder import CompiledDecoder
+from arctis_nova_api.models import AncMode, AncStatus, MicStatus, SidetoneStatus, VolumeKnobEvent
+from arctis_nova_api.sniffer import decode_input_report, decode_input_reports
 
 
 def test_decode_volume_report():
     parsed = decode_input_report(bytes([0x07, 0x25, 0x10, 0x00, 0x00]))
     assert parsed is not None
     assert parsed.report_type == "volume"
-    assert parsed.details["volume"] == 40
+    assert parsed.details == {"volume": 40}
 
 
 def test_decode_battery_report():
     parsed = decode_input_report(bytes([0x07, 0xB7, 80, 25, 0x00]))
     assert parsed is not None
     assert parsed.report_type == "battery"
-    assert parsed.details["headset"] == 80
-    assert parsed.details["charging"] == 25
+    assert parsed.details == {"headset": 80, "charging": 25}
 
 
 def test_decode_battery_report_from_06_header():
     parsed = decode_input_report(bytes([0x06, 0xB7, 2, 8, 0x00]))
     assert parsed is not None
     assert parsed.report_type == "battery"
-    assert parsed.details["headset"] == 2
-    assert parsed.details["charging"] == 8
+    assert parsed.details == {"headset": 2, "charging": 8}
+
+
+def test_decode_headset_connection_report_matches_baseline_details():
+    parsed = decode_input_report(bytes([0x07, 0xB5, 0x04, 0x01, 0x08]))
+    assert parsed is not None
+    assert parsed.report_type == "headset_connection"
+    assert parsed.details == {"wireless": True, "bluetooth": True, "bluetooth_on": True}
+
+
+def test_decode_many_matches_single_report_decoding():
+    profile = ExperimentalCommandProfile()
+    decoder = CompiledDecoder(profile)
+    reports = [
+        [0x07, 0x25, 0x10],
+        [0x07, 0xBD, 2],
+        [0x07, 0xBB, 1],
+        [0x05, 0xB7, 80, 25],
+        [0x07, 0x85, 42],
+        [0x07, 0x39, 3],
+    ]
+    buffer = b"".join(bytes(report + [0] * (64 - len(report))) for report in reports)
+
+    events = decoder.decode_many(buffer)
+    assert events == [decoder.decode(buffer[i * 64 : (i + 1) * 64]) for i in range(len(reports))]
+    assert events[0] == VolumeKnobEvent(volume=40)
+    assert events[1] == AncStatus(mode=AncMode.ANC)
+    assert events[2] == MicStatus(enabled=False)
+    assert events[3] is None
+    assert events[4] is None
+    assert events[5] == SidetoneStatus(level=3)
+
+    parsed = decode_input_reports(buffer, decoder)
+    assert parsed[1].report_type == "anc"
+    assert parsed[1].details == {"mode": "anc"}
+    assert parsed[3] is None
+    assert parsed[4].report_type == "unknown_0x85"
@@ -462,3 +462,280 @@ def test_get_routed_apps_from_audio_device_routing_prefers_active_sessions(monke
     client = SonarClient(sonar_db_path=db)
     routed = client.get_routed_apps_by_channel()
     assert routed["game"] == ["cs2"]
+
+
+def test_get_volume_snapshot_single_fetch(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+
+    class _SnapshotHttp(_FakeHttpClient):
+        def request(self, method, url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            if url.endswith("/subApps"):
+                return _FakeResponse(self.subapps_payload)
+            if url.endswith("/mode/"):
+                return _FakeResponse("classic")
+            if url.endswith("/volumeSettings/classic"):
+                return _FakeResponse(
+                    {
+                        "masters": {"stream": {"volume": 0.3, "muted": True}, "classic": {"volume": 1.0, "muted": False}},
+                        "devices": {
+                            "game": {"stream": {"volume": 0.4}, "classic": {"volume": 0.72, "muted": True}},
+                            "chatRender": {"stream": {}, "classic": {"volume": 0.5, "muted": False}},
+                        },
+                    }
+                )
+            return _FakeResponse({})
+
+    fake_http = _SnapshotHttp()
+    monkeypatch.setattr(sonar_module, "HttpClient", lambda *args, **kwargs: fake_http)
+
+    db = tmp_path / "database.db"
+    with sqlite3.connect(db) as conn:
+        conn.executescript(
+            """
+            create table configs (id text, name text, vad integer);
+            create table selected_config (config_id text, vad integer);
+            """
+        )
+
+    client = SonarClient(sonar_db_path=db)
+    fake_http.calls.clear()
+    snapshot = client.get_volume_snapshot()
+
+    assert len(fake_http.calls) == 2
+    assert snapshot.streamer_mode is False
+    assert snapshot.get_volume(SonarChannel.MASTER) == 1.0
+    assert snapshot.get_volume(SonarChannel.GAME) == 0.72
+    assert snapshot.get_mute(SonarChannel.GAME) is True
+    assert snapshot.get_mute(SonarChannel.CHAT_RENDER) is False
+    assert snapshot.get_volume(SonarChannel.MEDIA) is None
+    assert snapshot.get_volume(SonarChannel.MASTER, streamer=True) == 0.3
+    assert snapshot.get_mute(SonarChannel.MASTER, streamer=True) is True
+    assert snapshot.get_volume(SonarChannel.GAME, streamer=True) == 0.4
+    assert snapshot.get_volume(SonarChannel.CHAT_RENDER, streamer=True) is None
+
+
+def test_routing_probe_reuses_learned_endpoint(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+
+    class _LateRoutingHttp(_FakeHttpClient):
+        def __init__(self):
+            super().__init__()
+            self.serving = "/audioSessions"
+
+        def request(self, method, url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            if url.endswith("/subApps"):
+                return _FakeResponse(self.subapps_payload)
+            if url.endswith(self.serving):
+                return _FakeResponse({"applications": [{"appName": "Discord.exe", "role": "chatRender"}]})
+            raise sonar_module.ApiRequestError("not found", status_code=404)
+
+    fake_http = _LateRoutingHttp()
+    monkeypatch.setattr(sonar_module, "HttpClient", lambda *args, **kwargs: fake_http)
+    cache_path = tmp_path / "endpoints.json"
+
+    client = SonarClient(sonar_db_path=tmp_path / "database.db", endpoint_cache_path=cache_path)
+    fake_http.calls.clear()
+    assert client.get_routed_apps_by_channel()["chatRender"] == ["Discord.exe"]
+    assert len(fake_http.calls) == 19
+
+    fake_http.calls.clear()
+    assert client.get_routed_apps_by_channel()["chatRender"] == ["Discord.exe"]
+    assert len(fake_http.calls) == 1
+
+    # A fresh client against the same server version starts from the persisted map.
+    restarted = SonarClient(sonar_db_path=tmp_path / "database.db", endpoint_cache_path=cache_path)
+    fake_http.calls.clear()
+    assert restarted.get_routed_apps_by_channel()["chatRender"] == ["Discord.exe"]
+    assert len(fake_http.calls) == 1
+
+    # The learned route disappearing triggers a full re-probe.
+    fake_http.serving = "/routingSettings"
+    fake_http.calls.clear()
+    assert restarted.get_routed_apps_by_channel()["chatRender"] == ["Discord.exe"]
+    assert len(fake_http.calls) == 10
+    assert restarted.endpoints.get("routing_get") == "/routingSettings"
+
+
+def test_set_volume_reuses_learned_template_across_channels(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+
+    class _LegacyPutHttp(_FakeHttpClient):
+        def request(self, method, url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            if url.endswith("/subApps"):
+                return _FakeResponse(self.subapps_payload)
+            if method == "PUT" and "/volumeSettings/classic/" in url and "/Volume/" in url:
+                return _FakeResponse({"ok": True})
+            raise sonar_module.ApiRequestError("not found", status_code=404)
+
+    fake_http = _LegacyPutHttp()
+    monkeypatch.setattr(sonar_module, "HttpClient", lambda *args, **kwargs: fake_http)
+
+    client = SonarClient(sonar_db_path=tmp_path / "database.db")
+    fake_http.calls.clear()
+    client.set_channel_volume(SonarChannel.GAME, 0.5, streamer=False)
+    assert len(fake_http.calls) == 5
+
+    fake_http.calls.clear()
+    client.set_channel_volume(SonarChannel.MEDIA, 0.25, streamer=False)
+    assert [call[1] for call in fake_http.calls] == ["http://localhost:5566/volumeSettings/classic/media/Volume/0.25"]
+
+
+def test_streamer_mode_cache_hits_and_invalidation(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+
+    class _ModeHttp(_FakeHttpClient):
+        def __init__(self):
+            super().__init__()
+            self.mode = "classic"
+
+        def request(self, method, url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            if url.endswith("/subApps"):
+                return _FakeResponse(self.subapps_payload)
+            if method == "GET" and url.endswith("/mode/"):
+                return _FakeResponse(self.mode)
+            if method == "PUT" and "/mode/" in url:
+                self.mode = url.rsplit("/", 1)[-1]
+                return _FakeResponse(self.mode)
+            if url.endswith("/volumeSettings"):
+                if self.mode == "stream":
+                    return _FakeResponse({"streaming": {"game": {"Volume": 0.4}}, "monitoring": {"game": {"Volume": 0.6}}})
+                return _FakeResponse({"game": {"Volume": 0.8}})
+            return _FakeResponse({"ok": True})
+
+    fake_http = _ModeHttp()
+    monkeypatch.setattr(sonar_module, "HttpClient", lambda *args, **kwargs: fake_http)
+
+    client = SonarClient(sonar_db_path=tmp_path / "database.db", mode_cache_ttl=60.0)
+
+    def mode_reads():
+        return sum(1 for method, url, _ in fake_http.calls if method == "GET" and url.endswith("/mode/"))
+
+    for _ in range(5):
+        client.set_channel_volume(SonarChannel.GAME, 0.5)
+    assert mode_reads() == 1
+    assert client.mode_cache_misses == 1
+    assert client.mode_cache_hits == 4
+
+    # Writes through set_streamer_mode update the cache without a re-read.
+    client.set_streamer_mode(True)
+    assert client.is_streamer_mode(use_cache=True) is True
+    assert mode_reads() == 1
+
+    # A volume payload in the other mode's shape drops the cached mode.
+    fake_http.mode = "classic"
+    assert client.get_channel_volume(SonarChannel.GAME) == 0.8
+    assert mode_reads() == 2
+
+
+def test_selected_presets_bulk_query_sees_later_writes(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+    monkeypatch.setattr(sonar_module, "HttpClient", lambda *args, **kwargs: _FakeHttpClient())
+
+    db = tmp_path / "database.db"
+    with sqlite3.connect(db) as conn:
+        conn.executescript(
+            """
+            create table configs (id text, name text, vad integer, is_favorite integer);
+            create table selected_config (config_id text, vad integer);
+            insert into configs values ('g1', 'Flat', 1, 1);
+            insert into configs values ('g2', 'Footsteps', 1, 0);
+            insert into configs values ('c1', 'Voice', 2, 1);
+            insert into selected_config values ('g1', 1);
+            insert into selected_config values ('c1', 2);
+            insert into selected_config values ('missing', 4);
+            """
+        )
+
+    client = SonarClient(sonar_db_path=db)
+    selected = client.get_selected_presets_all()
+    assert selected[PresetChannel.GAMING].preset_id == "g1"
+    assert selected[PresetChannel.CHAT].name == "Voice"
+    assert selected[PresetChannel.MEDIA] is None
+    assert selected[PresetChannel.MASTER] is None
+
+    favorites = client.list_favorite_presets_by_channel()
+    assert [preset.preset_id for preset in favorites[PresetChannel.GAMING]] == ["g1"]
+    assert [preset.preset_id for preset in favorites[PresetChannel.CHAT]] == ["c1"]
+
+    with sqlite3.connect(db) as conn:
+        conn.execute("update selected_config set config_id = 'g2' where vad = 1")
+    assert client.get_selected_preset(PresetChannel.GAMING).preset_id == "g2"
+    assert client.get_selected_presets_all()[PresetChannel.GAMING].name == "Footsteps"
+    client.close()
+
+
+def test_set_channel_volume_all_modes_writes_every_target(monkeypatch, tmp_path):
+    import arctis_nova_api.sonar as sonar_module
+
+    monkeypatch.setattr(
+        sonar_module,
+        "read_core_props",
+        lambda *args, **kwargs: {"ggEncryptedAddress": "127.0.0.1:9999"},
+    )
+
+    class _AllModesHttp(_FakeHttpClient):
+        def request(self, method, url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            if url.endswith("/subApps"):
+                return _FakeResponse(self.subapps_payload)
+            if method == "PUT" and "/streamer/monitoring/" in url:
+                raise sonar_module.ApiRequestError("monitoring unavailable", status_code=500)
+            if method == "PUT" and "/devices/" in url:
+                raise sonar_module.ApiRequestError("not found", status_code=404)
+            if method == "PUT":
+                return _FakeResponse({"ok": True})
+            return _FakeResponse({})
+
+    fake_http = _AllModesHttp()
+    monkeypatch.setattr(sonar_module, "HttpClient", lambda *args, **kwargs: fake_http)
+
+    client = SonarClient(sonar_db_path=tmp_path / "database.db")
+    fake_http.calls.clear()
+    result = client.set_channel_volume_all_modes(SonarChannel.GAME, 0.5)
+
+    assert not any(method == "GET" for method, _, _ in fake_http.calls)
+    assert dict(result.applied) == {"classic": 0.5, "streaming": 0.5}
+    assert set(result.errors) == {"monitoring"}
+    assert result.partial and not result.ok
+
+    fake_http.calls.clear()
+    muted = client.set_channel_mute_all_modes(SonarChannel.GAME, True)
+    urls = sorted(url for _, url, _ in fake_http.calls)
+    assert "http://localhost:5566/volumeSettings/classic/game/Mute/true" in urls
+    assert "http://localhost:5566/volumeSettings/streamer/streaming/game/isMuted/true" in urls
+    assert dict(muted.applied) == {"classic": True, "streaming": True}
+    client.close()
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from arctis_nova_api.errors import DiscoveryError
+from arctis_nova_api.models import (
+    BatteryStatus,
+    PresetChannel,
+    SonarChannel,
+    SonarChannelLevel,
+    SonarPreset,
+    SonarVolumeSnapshot,
+    VolumeKnobEvent,
+)
+from arctis_nova_api.state import (
+    AdaptiveScheduler,
+    FixedIntervalScheduler,
+    HeadsetStateEngine,
+    coalesce_key,
+    default_state,
+)
+
+
+class _FakeCatalog:
+    def __init__(self):
+        self.changed = True
+        self.game = [SonarPreset(preset_id="p1", name="Flat", channel=PresetChannel.GAMING)]
+
+    def refresh(self):
+        changed, self.changed = self.changed, False
+        return changed
+
+    def favorites(self, channel):
+        return list(self.game) if channel is PresetChannel.GAMING else []
+
+    def presets(self, channel):
+        return self.favorites(channel)
+
+
+class _FakeSonar:
+    http_client = None
+
+    def __init__(self):
+        self.preset_catalog = _FakeCatalog()
+        self.game_volume = 0.4
+        self.writes = []
+
+    def get_volume_snapshot(self):
+        levels = {SonarChannel.GAME: SonarChannelLevel(volume=self.game_volume, muted=False)}
+        return SonarVolumeSnapshot(streamer_mode=False, classic=levels, streaming={}, monitoring={})
+
+    def get_chat_mix(self):
+        return {"balance": 0.5}
+
+    def get_routed_apps_by_channel(self):
+        return {"game": ["game.exe"]}
+
+    def get_selected_presets_all(self):
+        return {channel: None for channel in PresetChannel}
+
+    def set_channel_volume_all_modes(self, channel, volume):
+        self.writes.append((channel, volume))
+        self.game_volume = volume
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeBaseStation:
+    def __init__(self):
+        self.events = []
+
+    def connect(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def subscribe(self, callback):
+        self.callback = callback
+        return lambda: None
+
+    def get_pending_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def get_oled_brightness(self):
+        return 5
+
+
+class _FakeApi:
+    def __init__(self):
+        self.sonar = _FakeSonar()
+        self.base_station = _FakeBaseStation()
+
+    def discover(self, sonar=True, gamesense=True, base_station=True):
+        if base_station:
+            self.base_station.connect()
+        return {}
+
+    def close(self):
+        self.sonar.close()
+        self.base_station.close()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_engine_publishes_one_delta_per_tick_and_only_due_sources():
+    api = _FakeApi()
+    clock = _Clock()
+    scheduler = FixedIntervalScheduler({"events": 0.1, "sonar": 1.0, "hardware": 1.0})
+    engine = HeadsetStateEngine(
+        lambda: api, scheduler=scheduler, hardware_queries=("oled_brightness",), write_interval=0.0, clock=clock
+    )
+    deltas = []
+    presets = []
+    engine.subscribe(deltas.append)
+    engine.subscribe_presets(presets.append)
+
+    engine.open()
+    assert [preset.preset_id for preset in presets[0]["game"]] == ["p1"]
+
+    engine.poll_due()
+    delta = engine.publish()
+    assert delta is not None and deltas == [delta]
+    state = engine.snapshot()
+    assert state["channel_volume"]["game"] == 40
+    assert state["chat_mix_balance"] == 75
+    assert state["channel_apps"] == {"game": ["game.exe"]}
+    assert state["oled_brightness"] == 5
+
+    # Only the events source is due after 0.2 s, so the new Sonar volume is not read yet.
+    clock.now += 0.2
+    api.base_station.events = [VolumeKnobEvent(volume=28)]
+    api.sonar.game_volume = 0.9
+    engine.poll_due()
+    delta = engine.publish()
+    assert delta is not None
+    assert delta.keys - {"updated_at"} == {"headset_volume_percent"}
+    assert engine.publish() is None
+
+    engine.submit(lambda a: (a.sonar.set_channel_volume_all_modes(SonarChannel.GAME, 0.3), engine.refresh("sonar")))
+    engine.run_pending_commands()
+    assert api.sonar.writes == [(SonarChannel.GAME, 0.3)]
+    assert engine.snapshot()["channel_volume"]["game"] == 30
+    assert len(deltas) == 3
+
+
+def test_engine_coalesces_keyed_commands_and_reports_errors():
+    api = _FakeApi()
+    errors = []
+    engine = HeadsetStateEngine(lambda: api, write_interval=0.0, on_error=errors.append)
+    engine.open()
+    ran = []
+    engine.submit(lambda a: ran.append(1), key=("volume", "game"))
+    engine.submit(lambda a: ran.append(2), key=("volume", "game"))
+    engine.submit(lambda a: 1 / 0)
+    engine.run_pending_commands()
+    assert ran == [2]
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
+
+
+def test_engine_keeps_last_known_presets_when_a_refresh_fails(caplog):
+    api = _FakeApi()
+    engine = HeadsetStateEngine(lambda: api, write_interval=0.0)
+    presets = []
+    engine.subscribe_presets(presets.append)
+    engine.open()
+
+    def broken_refresh():
+        raise ConnectionError("GG restarting")
+
+    api.sonar.preset_catalog.refresh = broken_refresh
+    with caplog.at_level("WARNING", logger="arctis_nova_api.state"):
+        engine.refresh("presets")
+        engine.refresh("presets")
+    assert len(presets) == 1
+    assert [preset.preset_id for preset in engine.presets["game"]] == ["p1"]
+    # One warning per failure streak, not one per poll.
+    assert [record.message for record in caplog.records] == ["Polling presets failed; keeping last known values"]
+
+
+def test_coalesce_key_collapses_volume_and_mute_writes_per_channel():
+    assert coalesce_key("set_channel_volume", {"channel": "game", "value": 40}) == ("set_channel_volume", "game")
+    assert coalesce_key("set_channel_mute", {"channel": "game"}) != coalesce_key("set_channel_mute", {"channel": "media"})
+    assert coalesce_key("select_preset", {"channel": "game"}) is None
+
+
+def test_engine_failed_discovery_leaves_api_unset_but_closes_base_station():
+    api = _FakeApi()
+    api.discover = lambda **kwargs: {"sonar": DiscoveryError("Sonar is not running")}
+    engine = HeadsetStateEngine(lambda: api)
+    with pytest.raises(DiscoveryError):
+        engine.open()
+    with pytest.raises(RuntimeError):
+        engine.api
+    engine.close()
+    assert api.base_station.closed
+
+
+def test_engine_run_closes_after_failed_open():
+    api = _FakeApi()
+    api.discover = lambda **kwargs: {"sonar": DiscoveryError("Sonar is not running")}
+    engine = HeadsetStateEngine(lambda: api)
+    with pytest.raises(DiscoveryError):
+        engine.run()
+    assert api.base_station.closed
+
+
+def test_engine_close_releases_sonar_clients(monkeypatch):
+    import arctis_nova_api.async_sonar as async_sonar
+
+    closed = []
+
+    class _FakeAsyncSonar:
+        def __init__(self, sonar):
+            self.sync = sonar
+
+        def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(async_sonar, "AsyncSonarClient", _FakeAsyncSonar)
+    api = _FakeApi()
+    engine = HeadsetStateEngine(lambda: api)
+    engine.open()
+    engine.close()
+    assert len(closed) == 1 and closed[0].sync is api.sonar
+    assert api.sonar.closed and api.base_station.closed
+    with pytest.raises(RuntimeError):
+        engine.api
+    # A second close (e.g. from run's finally after stop) has nothing left to release.
+    engine.close()
+    assert len(closed) == 1
+
+
+def test_engine_persists_state_file_and_merges_app_keys(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"headset_battery_percent": 55}), encoding="utf-8")
+    api = _FakeApi()
+    engine = HeadsetStateEngine(lambda: api, initial_state=default_state({"status": "initializing"}), state_file=path)
+    assert engine.store.get("headset_battery_percent") == 55
+    assert engine.store.get("status") == "initializing"
+
+    engine.open()
+    engine.update({"status": "running"})
+    api.base_station.events = [BatteryStatus(headset=4, charging=8)]
+    engine.refresh("events")
+    engine.publish()
+    engine.close()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["status"] == "running"
+    assert saved["headset_battery_percent"] == 50
+    assert saved["base_battery_percent"] == 100
+
+
+def test_adaptive_scheduler_backs_off_bursts_and_pauses_when_hidden():
+    scheduler = AdaptiveScheduler(
+        intervals={"events": 0.1, "sonar": 0.5},
+        max_intervals={"events": 0.4, "sonar": 2.0},
+        burst_intervals={"sonar": 0.1},
+        burst_seconds=1.0,
+        pause_when_hidden=("sonar",),
+    )
+    now = 0.0
+    assert scheduler.due("sonar", now)
+    for expected in (1.0, 2.0, 2.0):
+        scheduler.record("sonar", now, changed=False)
+        assert scheduler.interval("sonar", now) == expected
+    scheduler.record("sonar", now, changed=True)
+    assert scheduler.interval("sonar", now) == 0.5
+    assert scheduler.interval("presets", now) is None
+
+    scheduler.record("sonar", now, changed=False)
+    scheduler.notify_activity(now)
+    assert scheduler.interval("sonar", now + 0.5) == 0.1
+    assert scheduler.interval("events", now + 0.5) == 0.1
+    assert scheduler.interval("sonar", now + 1.5) == 0.5
+
+    scheduler.set_visible(False)
+    assert scheduler.interval("sonar", now) is None
+    assert not scheduler.due("sonar", 100.0)
+    assert scheduler.next_due(100.0) == 0.0  # events are still polled
+    scheduler.set_visible(True)
+    assert scheduler.due("sonar", 100.0)
+
+
+def test_engine_sleeps_until_next_due_source_and_polls_device_events():
+    api = _FakeApi()
+    clock = _Clock()
+    scheduler = AdaptiveScheduler(
+        intervals={"events": 1.0, "sonar": 4.0}, max_intervals={"events": 1.0, "sonar": 4.0}, burst_intervals={}
+    )
+    engine = HeadsetStateEngine(lambda: api, scheduler=scheduler, tick=0.02, clock=clock)
+    events = []
+    engine.subscribe_events(events.append)
+    engine.open()
+    engine.refresh("events", "sonar")
+    assert engine._next_wait() == 1.0
+
+    api.base_station.events = [VolumeKnobEvent(volume=56)]
+    api.base_station.callback(api.base_station.events[0])
+    assert engine._device_activity.is_set()
+    engine.step()
+    assert engine.snapshot()["headset_volume_percent"] == 100
+    assert events == [VolumeKnobEvent(volume=56)]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+from arctis_nova_api.state_store import VersionedStateStore, apply_state_patch
+
+
+def test_commit_emits_nested_deltas_with_sequence_numbers():
+    store = VersionedStateStore({"battery": None, "channel_volume": {}, "channel_apps": {"game": ["a.exe"]}})
+    assert store.commit() is None
+    assert store.seq == 0
+
+    store.set("battery", 80)
+    volumes = {"game": 40, "media": 60}
+    store.set("channel_volume", volumes)
+    volumes["game"] = 99  # caller mutation after staging must not leak
+    delta = store.commit()
+    assert delta is not None
+    assert (delta.base, delta.seq) == (0, 1)
+    assert list(delta.ops) == [
+        {"op": "replace", "path": "/battery", "value": 80},
+        {"op": "add", "path": "/channel_volume/game", "value": 40},
+        {"op": "add", "path": "/channel_volume/media", "value": 60},
+    ]
+    assert delta.keys == {"battery", "channel_volume"}
+
+    assert not store.set("battery", 80)
+    store.set("channel_volume", {"game": 45, "media": 60})
+    store.set("channel_apps", {})
+    delta = store.commit()
+    assert delta is not None
+    assert delta.to_dict() == {
+        "seq": 2,
+        "base": 1,
+        "ops": [
+            {"op": "replace", "path": "/channel_volume/game", "value": 45},
+            {"op": "remove", "path": "/channel_apps/game"},
+        ],
+    }
+    assert store.commit() is None
+
+
+def test_applying_deltas_reproduces_resync_state():
+    store = VersionedStateStore({"anc_mode": None, "channel_mute": {"game": False}})
+    client = store.resync()
+    assert client["seq"] == 0
+
+    updates = [
+        {"anc_mode": "anc"},
+        {"channel_mute": {"game": True, "a/b~c": False}},
+        {"anc_mode": "off", "channel_mute": {"a/b~c": True}},
+    ]
+    state = client["state"]
+    seq = client["seq"]
+    for values in updates:
+        store.update(values)
+        delta = store.commit()
+        assert delta is not None and delta.base == seq
+        previous = state
+        state = apply_state_patch(state, delta.ops)
+        seq = delta.seq
+        if "channel_mute" not in delta.keys:
+            assert state["channel_mute"] is previous["channel_mute"]
+
+    assert store.resync() == {"seq": seq, "state": state}
+
+
+def test_current_snapshot_is_immutable_and_versioned():
+    store = VersionedStateStore({"battery": None, "channel_volume": {}})
+    first = store.current
+    assert first.seq == 0 and first.json == b'{"battery":null,"channel_volume":{}}'
+
+    store.set("channel_volume", {"game": 40})
+    store.commit()
+    second = store.current
+    assert second is not first
+    assert second.etag != first.etag and second.etag.startswith('"')
+    assert first.state["channel_volume"] == {}
+    assert second.json == b'{"battery":null,"channel_volume":{"game":40}}'
+    with pytest.raises(TypeError):
+        second.state["battery"] = 1  # type: ignore[index]
+    with pytest.raises(TypeError):
+        second.state["channel_volume"]["game"] = 1  # type: ignore[index]
+
+    copy = second.to_dict()
+    copy["channel_volume"]["game"] = 99
+    assert second.state["channel_volume"]["game"] == 40
+    assert VersionedStateStore({}).current.etag != VersionedStateStore({}).current.etag
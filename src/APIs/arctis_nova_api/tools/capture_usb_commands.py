@@ -3,14 +3,24 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from arctis_nova_api.capture_format import CaptureWriter
+from arctis_nova_api.capture_parser import open_capture
+
 
 HEX_RE = re.compile(r"^[0-9a-fA-F]+$")
+# Capture "paths" are transfer directions; the path id is 1 for IN endpoint packets.
+CAPTURE_PATHS = ("usb:out", "usb:in")
 
 
 def parse_args() -> argparse.Namespace:
@@ -27,6 +37,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--include-in", action="store_true", help="Include IN endpoint packets (default OUT only)")
     parser.add_argument("--top", type=int, default=20, help="Top N payloads to print")
     parser.add_argument("--csv", type=Path, help="Optional CSV output for extracted packets")
+    parser.add_argument(
+        "--capture-file",
+        type=Path,
+        help="Extracted packets in the compact capture format (default: --output with a .hidcap suffix)",
+    )
+    parser.add_argument("--capinfos", default="capinfos", help="Path to capinfos, used to count frames for splitting")
+    parser.add_argument("--editcap", default="editcap", help="Path to editcap, used to split large captures into chunks")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel tshark processes")
+    parser.add_argument(
+        "--chunk-frames", type=int, default=250_000, help="Frames per chunk file when splitting large captures"
+    )
     return parser.parse_args()
 
 
@@ -46,16 +67,127 @@ def run_capture(args: argparse.Namespace) -> None:
     _run(cmd)
 
 
-def extract_packets(args: argparse.Namespace) -> list[dict[str, str]]:
+@dataclass(frozen=True)
+class ExtractJob:
+    tshark: str
+    pcap: Path
+    display_filter: str
+    include_in: bool
+    capture_part: Path
+    csv_part: Path | None
+
+
+@dataclass
+class ExtractSummary:
+    packets: int = 0
+    payload_counts: Counter[str] = field(default_factory=Counter)
+
+    def merge(self, other: ExtractSummary) -> None:
+        self.packets += other.packets
+        self.payload_counts.update(other.payload_counts)
+
+
+def extract_packets(args: argparse.Namespace) -> ExtractSummary:
+    """
+    Extract HID payloads into `--capture-file`, returning merged payload counts.
+
+    Large captures are first split into chunk files with editcap, and one
+    tshark process dissects each chunk, so every frame is dissected once.
+    (A display filter on frame numbers would not help: tshark applies `-Y`
+    only after dissecting every frame.) Each worker streams tshark's output
+    straight into a part file in the compact capture format, so no packet
+    list is held in memory; parts are then concatenated in frame order.
+    """
     vendor_filter = f'usb.idVendor == 0x{args.vendor_id.lower()}'
     product_filter = f'usb.idProduct == 0x{args.product_id.lower()}'
     display_filter = f"({vendor_filter} and {product_filter}) and (usbhid.data or usb.capdata)"
+
+    with tempfile.TemporaryDirectory(prefix="usb-capture-chunks-", dir=args.capture_file.parent) as scratch:
+        chunks = [args.output]
+        if args.workers > 1:
+            chunks = split_capture(args, count_frames(args), Path(scratch))
+        jobs = [
+            ExtractJob(
+                tshark=args.tshark,
+                pcap=chunk,
+                display_filter=display_filter,
+                include_in=args.include_in,
+                capture_part=args.capture_file.with_name(f"{args.capture_file.name}.part{index}"),
+                csv_part=args.csv.with_name(f"{args.csv.name}.part{index}") if args.csv else None,
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+        return _run_jobs(args, jobs)
+
+
+def _run_jobs(args: argparse.Namespace, jobs: list[ExtractJob]) -> ExtractSummary:
+    summary = ExtractSummary()
+    workers = min(args.workers, len(jobs))
+    try:
+        if workers <= 1:
+            for job in jobs:
+                summary.merge(extract_range(job))
+        else:
+            print(f"Extracting {len(jobs)} capture chunks with {workers} workers")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for partial in pool.map(extract_range, jobs):
+                    summary.merge(partial)
+        _join_capture_parts(args.capture_file, [job.capture_part for job in jobs])
+        if args.csv:
+            _join_csv_parts(args.csv, [job.csv_part for job in jobs if job.csv_part])
+    finally:
+        for job in jobs:
+            job.capture_part.unlink(missing_ok=True)
+            if job.csv_part:
+                job.csv_part.unlink(missing_ok=True)
+    return summary
+
+
+def count_frames(args: argparse.Namespace) -> int | None:
+    """Frame count from capinfos, or None when it is unavailable (extraction then runs as one pass)."""
+    try:
+        result = subprocess.run(
+            [args.capinfos, "-T", "-r", "-M", "-c", str(args.output)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return int(result.stdout.strip().splitlines()[-1].split("\t")[-1])
+    except (OSError, subprocess.CalledProcessError, IndexError, ValueError):
+        return None
+
+
+def split_capture(args: argparse.Namespace, frame_count: int | None, scratch: Path) -> list[Path]:
+    """
+    Chunk files of `--chunk-frames` frames each, in frame order, written into `scratch`.
+
+    Returns just `--output` when the capture is small enough for one pass
+    or editcap is unavailable.
+    """
+    if not frame_count or args.chunk_frames <= 0 or frame_count <= args.chunk_frames:
+        return [args.output]
+    try:
+        subprocess.run(
+            [args.editcap, "-c", str(args.chunk_frames), str(args.output), str(scratch / f"chunk{args.output.suffix}")],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        print(f"Could not split capture with editcap ({exc}); extracting in one pass", file=sys.stderr)
+        return [args.output]
+    # editcap names chunks chunk_<zero-padded index>_<timestamp><suffix>, so name order is frame order.
+    chunks = sorted(scratch.glob("chunk_*"))
+    return chunks or [args.output]
+
+
+def extract_range(job: ExtractJob) -> ExtractSummary:
     cmd = [
-        args.tshark,
+        job.tshark,
         "-r",
-        str(args.output),
+        str(job.pcap),
         "-Y",
-        display_filter,
+        job.display_filter,
         "-T",
         "fields",
         "-E",
@@ -69,21 +201,34 @@ def extract_packets(args: argparse.Namespace) -> list[dict[str, str]]:
         "-e",
         "usb.capdata",
     ]
-    result = _run(cmd, capture_output=True)
-    rows: list[dict[str, str]] = []
-    reader = csv.reader(result.stdout.splitlines())
-    for row in reader:
-        if len(row) < 4:
-            continue
-        ts, endpoint, hid_data, cap_data = row[0], row[1], row[2], row[3]
-        payload = normalize_hex(hid_data) or normalize_hex(cap_data)
-        if not payload:
-            continue
-        if not args.include_in and endpoint:
-            if is_in_endpoint(endpoint):
-                continue
-        rows.append({"ts": ts, "endpoint": endpoint, "payload": payload})
-    return rows
+    summary = ExtractSummary()
+    csv_fp = job.csv_part.open("w", newline="", encoding="utf-8") if job.csv_part else None
+    try:
+        csv_writer = csv.writer(csv_fp) if csv_fp else None
+        with CaptureWriter(job.capture_part, CAPTURE_PATHS, wall_anchor_ns=0, mono_anchor_ns=0) as capture:
+            with _popen(cmd) as proc:
+                assert proc.stdout is not None
+                for row in csv.reader(proc.stdout):
+                    if len(row) < 4:
+                        continue
+                    ts, endpoint, hid_data, cap_data = row[0], row[1], row[2], row[3]
+                    payload = normalize_hex(hid_data) or normalize_hex(cap_data)
+                    if not payload:
+                        continue
+                    inbound = is_in_endpoint(endpoint) if endpoint else False
+                    if inbound and not job.include_in:
+                        continue
+                    summary.packets += 1
+                    summary.payload_counts[payload] += 1
+                    capture.write(_epoch_to_ns(ts), int(inbound), bytes.fromhex(payload))
+                    if csv_writer:
+                        csv_writer.writerow([ts, endpoint, payload])
+            if proc.returncode:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
+    finally:
+        if csv_fp:
+            csv_fp.close()
+    return summary
 
 
 def is_in_endpoint(endpoint: str) -> bool:
@@ -110,13 +255,13 @@ def normalize_hex(value: str) -> str | None:
     return raw.lower()
 
 
-def summarize(rows: list[dict[str, str]], top: int) -> None:
-    if not rows:
+def summarize(summary: ExtractSummary, top: int) -> None:
+    if not summary.packets:
         print("No HID payload rows extracted.")
         return
-    payload_counts = Counter(r["payload"] for r in rows)
+    payload_counts = summary.payload_counts
     prefix2_counts = Counter(p[:4] for p in payload_counts.keys() if len(p) >= 4)
-    print(f"Extracted {len(rows)} packets, {len(payload_counts)} unique payloads.")
+    print(f"Extracted {summary.packets} packets, {len(payload_counts)} unique payloads.")
     print("\nTop payloads:")
     for payload, count in payload_counts.most_common(top):
         print(f"  count={count:3d} payload={payload}")
@@ -125,12 +270,42 @@ def summarize(rows: list[dict[str, str]], top: int) -> None:
         print(f"  count={count:3d} prefix={prefix}")
 
 
-def write_csv(path: Path, rows: list[dict[str, str]]) -> None:
-    with path.open("w", newline="", encoding="utf-8") as fp:
-        writer = csv.DictWriter(fp, fieldnames=["ts", "endpoint", "payload"])
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"Wrote CSV: {path}")
+def _join_capture_parts(destination: Path, parts: list[Path]) -> None:
+    with CaptureWriter(destination, CAPTURE_PATHS, wall_anchor_ns=0, mono_anchor_ns=0) as writer:
+        for part in parts:
+            with open_capture(part) as capture:
+                records = capture.records
+                writer.write_records(records)
+                records.release()
+    print(f"Wrote capture: {destination} ({writer.count} records)")
+
+
+def _join_csv_parts(destination: Path, parts: list[Path]) -> None:
+    with destination.open("w", newline="", encoding="utf-8") as out:
+        csv.writer(out).writerow(["ts", "endpoint", "payload"])
+        for part in parts:
+            with part.open(newline="", encoding="utf-8") as fp:
+                shutil.copyfileobj(fp, out)
+    print(f"Wrote CSV: {destination}")
+
+
+def _epoch_to_ns(value: str) -> int:
+    # Parsed as text: a float epoch loses sub-microsecond precision.
+    seconds, _, fraction = value.strip().partition(".")
+    try:
+        return int(seconds) * 1_000_000_000 + int((fraction + "000000000")[:9])
+    except ValueError:
+        return 0
+
+
+def _popen(cmd: list[str]) -> subprocess.Popen[str]:
+    try:
+        # stderr is left on the console so tshark warnings surface without a second pipe to drain.
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        print(f"Command not found: {cmd[0]}", file=sys.stderr)
+        print("Install Wireshark/tshark and ensure tshark is on PATH.", file=sys.stderr)
+        raise
 
 
 def _run(cmd: list[str], capture_output: bool = False) -> subprocess.CompletedProcess[str]:
@@ -157,13 +332,12 @@ def main() -> int:
     args = parse_args()
     if not args.analyze_only:
         run_capture(args)
-    rows = extract_packets(args)
-    summarize(rows, top=args.top)
-    if args.csv:
-        write_csv(args.csv, rows)
+    if args.capture_file is None:
+        args.capture_file = args.output.with_suffix(".hidcap")
+    summary = extract_packets(args)
+    summarize(summary, top=args.top)
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
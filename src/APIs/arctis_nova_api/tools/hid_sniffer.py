@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Any
 
 from arctis_nova_api.base_station import INTERFACE_NUMBER, STEELSERIES_VENDOR_ID, SUPPORTED_PRODUCT_IDS
+from arctis_nova_api.capture_format import CaptureWriter
 from arctis_nova_api.sniffer import decode_input_report
 
 
@@ -22,6 +23,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--duration", type=float, default=0.0, help="Stop after N seconds (0 = run until Ctrl+C)")
     parser.add_argument("--timeout-ms", type=int, default=25, help="Per-read timeout in milliseconds")
     parser.add_argument("--jsonl", type=Path, help="Optional output file for JSONL report logs")
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        help="Optional output file in the compact binary capture format (see capture_parser.open_capture)",
+    )
+    parser.add_argument("--flush-seconds", type=float, default=1.0, help="How often output files are flushed to disk")
     parser.add_argument("--raw-only", action="store_true", help="Disable decoded summaries")
     return parser.parse_args()
 
@@ -74,21 +81,33 @@ def main() -> int:
 
     start = time.time()
     out_fp = args.jsonl.open("a", encoding="utf-8") if args.jsonl else None
+    capture = (
+        CaptureWriter(args.capture, [_path_to_str(dev_info["path"]) for dev_info, _ in opened]) if args.capture else None
+    )
+    last_flush = time.monotonic()
     seen = 0
     try:
         while True:
             if args.duration > 0 and (time.time() - start) >= args.duration:
                 break
-            for dev_info, dev in opened:
+            for path_id, (dev_info, dev) in enumerate(opened):
                 raw = bytes(dev.read(64, timeout_ms=args.timeout_ms))
                 if not raw:
                     continue
+                ts_ns = time.monotonic_ns()
                 record = make_record(dev_info["path"], raw, raw_only=args.raw_only)
                 seen += 1
                 print(format_console(record))
                 if out_fp:
                     out_fp.write(json.dumps(record) + "\n")
+                if capture:
+                    capture.write(ts_ns, path_id, raw)
+            if time.monotonic() - last_flush >= args.flush_seconds:
+                if out_fp:
                     out_fp.flush()
+                if capture:
+                    capture.flush()
+                last_flush = time.monotonic()
     except KeyboardInterrupt:
         pass
     finally:
@@ -96,6 +115,8 @@ def main() -> int:
             dev.close()
         if out_fp:
             out_fp.close()
+        if capture:
+            capture.close()
 
     print(f"Stopped. Captured {seen} report(s).")
     return 0
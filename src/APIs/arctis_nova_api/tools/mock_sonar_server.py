@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from arctis_nova_api.errors import ArctisNovaError
+from arctis_nova_api.mock_server import PROFILES, ROUTE_KINDS, MockSonarServer, write_sonar_database
+from arctis_nova_api.models import PresetChannel, SonarChannel
+from arctis_nova_api.sonar import SonarClient
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run an offline SteelSeries GG/Sonar stand-in server, or benchmark SonarClient against one."
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="modern", help="GG endpoint profile to imitate")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=0, help="Port to listen on (default: any free port)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency per request, up to this many ms")
+    parser.add_argument(
+        "--route-latency",
+        action="append",
+        default=[],
+        metavar="KIND=MS",
+        help=f"Latency override for one request kind ({', '.join(ROUTE_KINDS)}); repeatable",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with --error-status")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status for injected failures")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and injected failures")
+    parser.add_argument("--core-props", type=Path, help="Write a coreProps.json pointing at the server here")
+    parser.add_argument("--sonar-db", type=Path, help="Create a preset database here; preset select updates it")
+    parser.add_argument(
+        "--programdata",
+        type=Path,
+        help="Write coreProps.json and the preset database in the GG layout under this directory; "
+        "start an app with PROGRAMDATA set to it to use the server",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite an existing coreProps.json or preset database (never point this at a real GG install)",
+    )
+    parser.add_argument("--bench", type=int, metavar="N", help="Time N rounds of each SonarClient operation, then exit")
+    parser.add_argument("--json", action="store_true", help="Print benchmark results as JSON")
+    return parser.parse_args()
+
+
+def parse_route_latency(values: list[str]) -> dict[str, float]:
+    latency: dict[str, float] = {}
+    for value in values:
+        kind, _, ms = value.partition("=")
+        if kind not in ROUTE_KINDS or not ms:
+            raise SystemExit(f"Invalid --route-latency {value!r}; expected KIND=MS with KIND in {', '.join(ROUTE_KINDS)}")
+        latency[kind] = float(ms) / 1000.0
+    return latency
+
+
+def benchmark(server: MockSonarServer, core_props: Path, rounds: int) -> list[dict[str, Any]]:
+    """Median/p95 wall time and server requests per call for the operations the apps poll and write."""
+    results: list[dict[str, Any]] = []
+
+    def run(name: str, call: Callable[[int], Any], count: int) -> None:
+        timings: list[float] = []
+        errors = 0
+        server.reset_counts()
+        for index in range(count):
+            started = time.perf_counter()
+            try:
+                call(index)
+            except ArctisNovaError:
+                errors += 1
+            timings.append((time.perf_counter() - started) * 1000.0)
+        requests = sum(server.request_counts().values())
+        ordered = sorted(timings)
+        results.append(
+            {
+                "operation": name,
+                "calls": count,
+                "median_ms": round(statistics.median(ordered), 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                "requests_per_call": round(requests / count, 2),
+                "errors": errors,
+            }
+        )
+
+    clients: list[SonarClient] = []
+
+    def discover(_: int) -> None:
+        clients.append(SonarClient(core_props_path=core_props, sonar_db_path=server.sonar_db_path))
+
+    run("discovery", discover, min(rounds, 10))
+    for extra in clients[1:]:
+        extra.close()
+    if not clients:
+        return results
+    client = clients[0]
+    try:
+        run("volume_snapshot", lambda _: client.get_volume_snapshot(), rounds)
+        run("set_volume", lambda i: client.set_channel_volume(SonarChannel.GAME, (i % 100) / 100.0), rounds)
+        run(
+            "set_volume_all_modes",
+            lambda i: client.set_channel_volume_all_modes(SonarChannel.MEDIA, (i % 100) / 100.0),
+            rounds,
+        )
+        run("set_mute", lambda i: client.set_channel_mute(SonarChannel.CHAT_CAPTURE, i % 2 == 0), rounds)
+        run("chat_mix", lambda i: client.set_chat_mix(((i % 21) - 10) / 10.0), rounds)
+        run("routing", lambda _: client.get_routed_apps_by_channel(), rounds)
+        if server.sonar_db_path is not None:
+            names = ("Default", "Flat")
+            run("select_preset", lambda i: client.select_preset_for_channel(PresetChannel.GAMING, names[i % 2]), rounds)
+    finally:
+        client.close()
+    return results
+
+
+def print_table(profile: str, results: list[dict[str, Any]]) -> None:
+    print(f"profile {profile}")
+    for row in results:
+        print(
+            f"  {row['operation']:<22} median {row['median_ms']:>8.2f} ms  p95 {row['p95_ms']:>8.2f} ms  "
+            f"requests/call {row['requests_per_call']:>5.2f}  errors {row['errors']}"
+        )
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="mock-sonar-") as scratch:
+        core_props_path = args.core_props
+        sonar_db = args.sonar_db
+        if args.programdata is not None:
+            # Same layout as core.DEFAULT_CORE_PROPS_PATH and DEFAULT_SONAR_DB_PATH.
+            core_props_path = args.programdata / "SteelSeries" / "SteelSeries Engine 3" / "coreProps.json"
+            sonar_db = args.programdata / "SteelSeries" / "GG" / "apps" / "sonar" / "db" / "database.db"
+        if sonar_db is None and args.bench:
+            sonar_db = Path(scratch) / "database.db"
+        if sonar_db is not None:
+            try:
+                write_sonar_database(sonar_db, overwrite=args.force)
+            except FileExistsError as exc:
+                raise SystemExit(f"{exc}; pass --force to replace it")
+        server = MockSonarServer(
+            profile=args.profile,
+            host=args.host,
+            port=args.port,
+            latency=args.latency / 1000.0,
+            jitter=args.jitter / 1000.0,
+            route_latency=parse_route_latency(args.route_latency),
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            seed=args.seed,
+            sonar_db_path=sonar_db,
+        )
+        with server:
+            try:
+                core_props = server.write_core_props(
+                    core_props_path or Path(scratch) / "coreProps.json", overwrite=args.force
+                )
+            except FileExistsError as exc:
+                raise SystemExit(f"{exc}; pass --force to replace it")
+            if args.bench:
+                results = benchmark(server, core_props, args.bench)
+                if args.json:
+                    print(json.dumps({"profile": args.profile, "results": results}, indent=2))
+                else:
+                    print_table(args.profile, results)
+                return 0
+            print(f"Mock Sonar server ({args.profile}) listening on {server.url}; coreProps at {core_props}")
+            try:
+                while True:
+                    time.sleep(1.0)
+            except KeyboardInterrupt:
+                print("Stopping", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,59 +4,84 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from arctis_nova_api.capture_parser import load_capture, split_time_windows, summarize_windows, top_unknown_types
+from arctis_nova_api.capture_parser import (
+    UnknownTypeCounter,
+    export_capture_jsonl,
+    import_jsonl_capture,
+    iter_captures,
+    iter_window_summaries,
+)
+from arctis_nova_api.capture_format import is_capture_file
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Parse HID sniffer JSONL logs and group unknown reports into likely action windows."
+        description="Parse HID sniffer logs (JSONL or binary capture) and group unknown reports into likely action windows."
+    )
+    parser.add_argument(
+        "capture",
+        type=Path,
+        nargs="+",
+        help="JSONL or binary capture file(s) from src/APIs/arctis_nova_api/tools/hid_sniffer.py; several are merged by time",
     )
-    parser.add_argument("capture", type=Path, help="Path to JSONL capture file from src/APIs/arctis_nova_api/tools/hid_sniffer.py")
     parser.add_argument("--gap-seconds", type=float, default=2.0, help="New window starts after this inactivity gap")
     parser.add_argument("--top", type=int, default=10, help="Top N unknown report types to print")
     parser.add_argument("--min-unknown", type=int, default=1, help="Only print windows with at least this many unknown reports")
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Mine byte positions, change points and profile value-index candidates per command (needs numpy)",
+    )
+    parser.add_argument("--to-capture", type=Path, help="Convert a JSONL log to the binary capture format and exit")
+    parser.add_argument("--to-jsonl", type=Path, help="Convert a binary capture to JSONL and exit")
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    records = load_capture(args.capture)
-    if not records:
-        print("No records found in capture.")
-        return 1
-
-    print(f"Loaded {len(records)} records from {args.capture}")
-    print(f"Capture span: {records[0].ts.isoformat()} -> {records[-1].ts.isoformat()}")
+    if args.to_capture or args.to_jsonl:
+        return convert(args)
+    if args.analyze:
+        return analyze(args)
 
-    unknowns = top_unknown_types(records)
-    print("\nTop unknown report types:")
-    if not unknowns:
-        print("  none")
-    else:
-        for report_type, count, sample_hex in unknowns[: args.top]:
-            print(f"  {report_type}: count={count}, sample={sample_hex[:20]}...")
-
-    windows = split_time_windows(records, gap_seconds=args.gap_seconds)
-    summaries = summarize_windows(windows)
-
-    print(f"\nWindows (gap > {args.gap_seconds}s): {len(summaries)}")
+    # Records are streamed and windows printed as they close, so memory stays flat for long captures.
+    totals = UnknownTypeCounter()
+    records = iter_captures(args.capture)
+    print(f"Windows (gap > {args.gap_seconds}s):")
+    window_count = 0
     printed = 0
-    for idx, summary in enumerate(summaries, start=1):
+    for summary in iter_window_summaries(records, gap_seconds=args.gap_seconds, totals=totals):
+        window_count += 1
         if summary.unknown_records < args.min_unknown:
             continue
         printed += 1
         duration = (summary.end - summary.start).total_seconds()
         print(
-            f"\nWindow {idx}: {summary.start.isoformat()} -> {summary.end.isoformat()} "
+            f"\nWindow {window_count}: {summary.start.isoformat()} -> {summary.end.isoformat()} "
             f"({duration:.2f}s), total={summary.total_records}, unknown={summary.unknown_records}"
         )
         for report_type, count in summary.unknown_by_type.items():
             sample = summary.sample_hex_by_type.get(report_type, "")
             print(f"  {report_type}: count={count}, sample={sample[:20]}...")
 
+    if totals.start is None or totals.end is None:
+        print("No records found in capture.")
+        return 1
     if printed == 0:
         print("\nNo windows matched the unknown-report filter.")
 
+    sources = ", ".join(str(path) for path in args.capture)
+    print(f"\nLoaded {totals.total_records} records in {window_count} windows from {sources}")
+    print(f"Capture span: {totals.start.isoformat()} -> {totals.end.isoformat()}")
+
+    unknowns = totals.top(args.top)
+    print("\nTop unknown report types:")
+    if not unknowns:
+        print("  none")
+    else:
+        for report_type, count, sample_hex in unknowns:
+            print(f"  {report_type}: count={count}, sample={sample_hex[:20]}...")
+
     print(
         "\nTip: Start capture, toggle one control, wait 3-5 seconds, toggle next control. "
         "This creates clean windows for ANC/USB mapping."
@@ -64,5 +89,59 @@ def main() -> int:
     return 0
 
 
+def analyze(args: argparse.Namespace) -> int:
+    from arctis_nova_api.capture_analysis import (
+        change_points,
+        command_counts,
+        load_report_matrix,
+        position_entropy,
+        position_histograms,
+        value_index_candidates,
+    )
+
+    source = args.capture[0] if len(args.capture) == 1 else iter_captures(args.capture)
+    matrix = load_report_matrix(source)
+    if len(matrix) == 0:
+        print("No records found in capture.")
+        return 1
+
+    print(f"Loaded {len(matrix)} reports into a {matrix.reports.shape[0]}x{matrix.reports.shape[1]} matrix")
+    for command, count in list(command_counts(matrix).items())[: args.top]:
+        entropy = position_entropy(position_histograms(matrix, command))
+        varying = [f"{index}:{entropy[index]:.2f}" for index in range(2, len(entropy)) if entropy[index] > 0]
+        print(f"\nCommand 0x{command:02x}: count={count}")
+        print(f"  varying bytes (index:entropy bits): {', '.join(varying) or 'none'}")
+        for point in change_points(matrix, command, gap_seconds=args.gap_seconds):
+            diffs = ", ".join(f"[{i}] {b}->{a}" for i, b, a in zip(point.positions, point.before, point.after))
+            print(f"  window {point.window_before + 1} -> {point.window_after + 1}: {diffs}")
+        for candidate in value_index_candidates(matrix, command, gap_seconds=args.gap_seconds)[:3]:
+            print(
+                f"  candidate value_index={candidate.value_index} values={list(candidate.values)} "
+                f"stability={candidate.stability:.2f} -> {candidate.profile_fields('<name>')}"
+            )
+    return 0
+
+
+def convert(args: argparse.Namespace) -> int:
+    if len(args.capture) != 1:
+        print("Conversion takes exactly one capture file.")
+        return 1
+    source = args.capture[0]
+    binary = is_capture_file(source)
+    if args.to_capture:
+        if binary:
+            print(f"{source} is already a binary capture.")
+            return 1
+        count = import_jsonl_capture(source, args.to_capture)
+        print(f"Wrote {count} records to {args.to_capture}")
+    if args.to_jsonl:
+        if not binary:
+            print(f"{source} is not a binary capture.")
+            return 1
+        count = export_capture_jsonl(source, args.to_jsonl)
+        print(f"Wrote {count} records to {args.to_jsonl}")
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
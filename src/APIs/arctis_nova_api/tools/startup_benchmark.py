@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[4]
+API_SRC = ROOT / "src" / "APIs" / "arctis_nova_api" / "src"
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_THRESHOLDS = TOOLS_DIR / "startup_thresholds.json"
+DEFAULT_HISTORY = TOOLS_DIR / "startup_history.jsonl"
+# Expensive imports reported per entry point; thresholds can forbid them with "forbid".
+HEAVY_MODULES: tuple[str, ...] = ("requests", "sqlite3", "asyncio", "numpy", "PySide6", "fastapi")
+
+
+@dataclass(frozen=True)
+class EntryPoint:
+    name: str
+    module: str
+    paths: tuple[Path, ...]
+
+
+# Each entry point is imported (not run) in a fresh interpreter: what a user waits for
+# before the process can do any work, without needing a headset or SteelSeries GG.
+ENTRY_POINTS: tuple[EntryPoint, ...] = (
+    EntryPoint("package", "arctis_nova_api", (API_SRC,)),
+    EntryPoint("bridge", "backend_bridge", (ROOT / "src" / "Apps" / "arctis-centre-app" / "scripts", API_SRC)),
+    EntryPoint("tray_app", "main", (ROOT / "src" / "Apps" / "tray_dashboard", API_SRC)),
+    EntryPoint("native_backend", "main", (ROOT / "src" / "Apps" / "native_windows_dashboard" / "backend", API_SRC)),
+    EntryPoint("hid_sniffer", "hid_sniffer", (TOOLS_DIR, API_SRC)),
+    EntryPoint("parse_hid_capture", "parse_hid_capture", (TOOLS_DIR, API_SRC)),
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start and import time of each arctis_nova_api entry point and check thresholds."
+    )
+    parser.add_argument("entry", nargs="*", help="Entry points to measure (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point; the median is reported")
+    parser.add_argument("--top", type=int, default=8, help="Slowest modules (self time) to list per entry point")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS, help="JSON thresholds file")
+    parser.add_argument("--record", action="store_true", help=f"Append results to the history file ({DEFAULT_HISTORY.name})")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSONL history file used with --record")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    return parser.parse_args()
+
+
+def run_once(entry: EntryPoint, importtime: bool) -> tuple[float, str, int]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([*(str(path) for path in entry.paths), env.get("PYTHONPATH", "")])
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", f"import {entry.module}"]
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return elapsed_ms, result.stderr, result.returncode
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, float, float]]:
+    """(module, self ms, cumulative ms) for each line of `-X importtime` output."""
+    rows: list[tuple[str, float, float]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            rows.append((name.strip(), int(self_us) / 1000.0, int(cumulative_us) / 1000.0))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(entry: EntryPoint, runs: int, top: int) -> dict[str, Any]:
+    baseline = statistics.median(run_once(EntryPoint("python", "sys", ()), importtime=False)[0] for _ in range(runs))
+    cold: list[float] = []
+    for _ in range(runs):
+        elapsed_ms, stderr, code = run_once(entry, importtime=False)
+        if code != 0:
+            missing = stderr.strip().splitlines()[-1] if stderr.strip() else f"exit code {code}"
+            return {"entry": entry.name, "skipped": missing}
+        cold.append(elapsed_ms)
+    _, stderr, _ = run_once(entry, importtime=True)
+    rows = parse_importtime(stderr)
+    top_level = next((cumulative for name, _, cumulative in rows if name == entry.module), None)
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        "entry": entry.name,
+        "cold_start_ms": round(statistics.median(cold), 1),
+        "interpreter_ms": round(baseline, 1),
+        "import_ms": round(top_level, 1) if top_level is not None else None,
+        "modules": len(rows),
+        "heavy_modules": sorted(name for name in HEAVY_MODULES if any(row[0] == name for row in rows)),
+        "slowest": [{"module": name, "self_ms": round(self_ms, 2)} for name, self_ms, _ in slowest],
+    }
+
+
+def check(results: list[dict[str, Any]], thresholds: dict[str, dict[str, Any]]) -> list[str]:
+    """Threshold entries hold millisecond limits per metric and an optional "forbid" list of heavy modules."""
+    failures: list[str] = []
+    for result in results:
+        limits = dict(thresholds.get(result["entry"], {}))
+        for module in set(limits.pop("forbid", [])) & set(result.get("heavy_modules", [])):
+            failures.append(f"{result['entry']}: imports {module}")
+        for metric, limit in limits.items():
+            value = result.get(metric)
+            if isinstance(value, (int, float)) and value > limit:
+                failures.append(f"{result['entry']}: {metric} {value:.1f} ms exceeds threshold {limit:.1f} ms")
+    return failures
+
+
+def record(history: Path, results: list[dict[str, Any]]) -> None:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [{key: value for key, value in result.items() if key != "slowest"} for result in results],
+    }
+    with history.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    for result in results:
+        if "skipped" in result:
+            print(f"{result['entry']:<18} skipped: {result['skipped']}")
+            continue
+        import_ms = f"{result['import_ms']:.1f}" if result["import_ms"] is not None else "-"
+        heavy = ", ".join(result["heavy_modules"]) or "none"
+        print(
+            f"{result['entry']:<18} cold start {result['cold_start_ms']:>7.1f} ms "
+            f"(interpreter {result['interpreter_ms']:.1f} ms)  import {import_ms:>7} ms  "
+            f"modules {result['modules']:>4}  heavy: {heavy}"
+        )
+        for row in result["slowest"]:
+            print(f"    {row['self_ms']:>8.2f} ms  {row['module']}")
+
+
+def main() -> int:
+    args = parse_args()
+    entries = [entry for entry in ENTRY_POINTS if not args.entry or entry.name in args.entry]
+    unknown = set(args.entry) - {entry.name for entry in ENTRY_POINTS}
+    if unknown:
+        print(f"Unknown entry points: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    results = [measure(entry, args.runs, args.top) for entry in entries]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+    if args.record:
+        record(args.history, results)
+    thresholds = json.loads(args.thresholds.read_text(encoding="utf-8")) if args.thresholds.exists() else {}
+    failures = check(results, thresholds)
+    for failure in failures:
+        print(f"THRESHOLD: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
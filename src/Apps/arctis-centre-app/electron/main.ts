@@ -6,8 +6,8 @@ import { execFile } from "node:child_process";
 import { BackendBridge } from "./services/backend";
 import { createFlyoutWindow, positionBottomRight, saveWindowBounds } from "./window";
 import { buildTrayIcon, createTray } from "./tray";
-import { DEFAULT_SETTINGS, mergeSettings, mergeState } from "../shared/settings.js";
-import type { AppState, BackendCommand, ChannelKey, PresetMap, UiSettings } from "../shared/types";
+import { DEFAULT_SETTINGS, applyStatePatch, mergeSettings, mergeState } from "../shared/settings.js";
+import type { AppState, BackendCommand, ChannelKey, PresetMap, StateDelta, UiSettings } from "../shared/types";
 
 let mainWindow: BrowserWindow | null = null;
 let settingsWindow: BrowserWindow | null = null;
@@ -407,10 +407,12 @@ function harmonizeLiveState(previous: AppState, incoming: AppState): AppState {
     bluetooth: keep(next.bluetooth, previous.bluetooth),
     chat_mix_balance: keep(next.chat_mix_balance, previous.chat_mix_balance),
     oled_brightness: keep(next.oled_brightness, previous.oled_brightness),
+    active_usb_input: keep(next.active_usb_input, previous.active_usb_input),
     updated_at: keep(next.updated_at, previous.updated_at),
     channel_volume: { ...previous.channel_volume, ...next.channel_volume },
     channel_mute: { ...previous.channel_mute, ...next.channel_mute },
     channel_preset: { ...previous.channel_preset, ...next.channel_preset },
+    channel_preset_name: { ...previous.channel_preset_name, ...next.channel_preset_name },
     channel_apps: { ...previous.channel_apps, ...next.channel_apps },
   };
 }
@@ -536,6 +538,19 @@ function wireBackend(): void {
       win.webContents.send("backend:state", cachedState);
     }
   });
+  backend.on("state_delta", (delta: StateDelta) => {
+    const previous = cachedState;
+    cachedState = applyStatePatch(cachedState, delta.ops);
+    if (hasSeenLiveState) {
+      notifyStateChanges(previous, cachedState);
+    } else {
+      hasSeenLiveState = true;
+    }
+    schedulePersist();
+    for (const win of allWindows()) {
+      win.webContents.send("backend:state-delta", delta);
+    }
+  });
   backend.on("presets", (presets: PresetMap) => {
     cachedPresets = presets;
     schedulePersist();
@@ -999,6 +1014,9 @@ async function createApp(): Promise<void> {
       hideFlyout();
     }
   });
+  // Lets the bridge back off (or pause) Sonar polling while nobody is looking at the flyout.
+  mainWindow.on("show", () => backend?.send({ name: "visibility", payload: { visible: true } }));
+  mainWindow.on("hide", () => backend?.send({ name: "visibility", payload: { visible: false } }));
   mainWindow.on("resized", () => {
     if (!mainWindow) {
       return;
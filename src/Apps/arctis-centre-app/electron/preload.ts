@@ -1,5 +1,5 @@
 import { contextBridge, ipcRenderer } from "electron";
-import type { AppState, BackendCommand, PresetMap, UiSettings } from "@shared/types";
+import type { AppState, BackendCommand, PresetMap, StateDelta, UiSettings } from "@shared/types";
 
 interface InitialPayload {
   state: AppState;
@@ -38,6 +38,11 @@ const api = {
     ipcRenderer.on("backend:state", fn);
     return () => ipcRenderer.removeListener("backend:state", fn);
   },
+  onStateDelta: (cb: (delta: StateDelta) => void): (() => void) => {
+    const fn = (_: unknown, payload: StateDelta) => cb(payload);
+    ipcRenderer.on("backend:state-delta", fn);
+    return () => ipcRenderer.removeListener("backend:state-delta", fn);
+  },
   onPresets: (cb: (presets: PresetMap) => void): (() => void) => {
     const fn = (_: unknown, payload: PresetMap) => cb(payload);
     ipcRenderer.on("backend:presets", fn);
@@ -2,37 +2,71 @@ import { ChildProcessWithoutNullStreams, spawn, spawnSync } from "node:child_pro
 import * as fs from "node:fs";
 import * as path from "node:path";
 import { EventEmitter } from "node:events";
-import type { AppState, BackendCommand, PresetMap } from "../../shared/types";
-import { mergeState } from "../../shared/settings.js";
+import type { AppState, BackendCommand, CommandResult, PresetMap, StateDelta } from "../../shared/types";
+import { applyStatePatch, mergeState } from "../../shared/settings.js";
+import { decodeMsgpack, encodeMsgpack } from "./msgpack.js";
 
 type BridgeEvent =
-  | { type: "state"; payload: AppState }
+  | { type: "hello"; payload: { protocol: "framed"; codec: FrameCodec } }
+  | { type: "state"; payload: AppState; seq?: number }
+  | { type: "state_delta"; payload: StateDelta }
   | { type: "presets"; payload: PresetMap }
+  | { type: "result"; payload: CommandResult; id: number }
   | { type: "status"; payload: string }
   | { type: "error"; payload: string };
 
+// "framed": length-prefixed batches of MessagePack (or JSON) messages; "lines": legacy JSON lines.
+export type BridgeProtocol = "framed" | "lines";
+type FrameCodec = "msgpack" | "json";
+
+const FRAME_HEADER_BYTES = 4;
+const COALESCED_COMMANDS = new Set<BackendCommand["name"]>(["set_channel_volume", "set_channel_mute"]);
+
+function coalesceKey(cmd: BackendCommand): string | null {
+  return COALESCED_COMMANDS.has(cmd.name) ? `${cmd.name}:${String(cmd.payload.channel)}` : null;
+}
+
 export class BackendBridge extends EventEmitter {
   private child: ChildProcessWithoutNullStreams | null = null;
-  private pending = "";
+  private pending: Buffer = Buffer.alloc(0);
   private scriptPath: string;
   private projectRoot: string;
+  private protocol: BridgeProtocol;
   private launchedWith = "";
   private lastState: AppState = mergeState();
+  private lastSeq: number | null = null;
+  private resyncRequested = false;
   private lastPresets: PresetMap = {};
+  // Framed mode state: negotiated codec (null until the bridge's hello), queued commands and stdin backpressure.
+  private codec: FrameCodec | null = null;
+  private awaitingHello = false;
+  private outbox: BackendCommand[] = [];
+  private flushScheduled = false;
+  private stdinBlocked = false;
+  private nextRequestId = 1;
+  private requests = new Map<number, (result: CommandResult) => void>();
 
-  constructor(scriptPath: string, projectRoot: string) {
+  constructor(scriptPath: string, projectRoot: string, protocol?: BridgeProtocol) {
     super();
     this.scriptPath = path.normalize(scriptPath);
     this.projectRoot = path.normalize(projectRoot);
+    this.protocol = protocol ?? (process.env.ARCTIS_BRIDGE_PROTOCOL === "lines" ? "lines" : "framed");
   }
 
   public start(): void {
     if (this.child) {
       return;
     }
+    this.pending = Buffer.alloc(0);
+    this.codec = null;
+    this.awaitingHello = this.protocol === "framed";
+    this.stdinBlocked = false;
     this.child = this.spawnPython();
-    this.child.stdout.setEncoding("utf-8");
-    this.child.stdout.on("data", (chunk) => this.onStdout(chunk));
+    this.child.stdout.on("data", (chunk: Buffer) => this.onStdout(chunk));
+    this.child.stdin.on("drain", () => {
+      this.stdinBlocked = false;
+      this.flushOutbox();
+    });
     this.child.stderr.setEncoding("utf-8");
     this.child.stderr.on("data", (chunk) => this.emit("error", chunk.toString().trim()));
     this.child.on("exit", (code) => {
@@ -43,6 +77,10 @@ export class BackendBridge extends EventEmitter {
         this.emit("status", `backend exited with code ${codeText}`);
       }
       this.child = null;
+      this.lastSeq = null;
+      this.resyncRequested = false;
+      this.outbox = [];
+      this.failRequests("backend exited");
     });
   }
 
@@ -58,7 +96,23 @@ export class BackendBridge extends EventEmitter {
     if (!this.child) {
       return;
     }
-    this.child.stdin.write(`${JSON.stringify(cmd)}\n`);
+    if (this.protocol === "lines") {
+      this.child.stdin.write(`${JSON.stringify(cmd)}\n`);
+      return;
+    }
+    this.enqueue(cmd);
+  }
+
+  /** Sends `cmd` with a request id; resolves with the bridge's result for it. */
+  public request(cmd: BackendCommand): Promise<CommandResult> {
+    if (!this.child) {
+      return Promise.resolve({ status: "failed", detail: "backend not running" });
+    }
+    const id = this.nextRequestId++;
+    return new Promise((resolve) => {
+      this.requests.set(id, resolve);
+      this.send({ ...cmd, id });
+    });
   }
 
   public getState(): AppState {
@@ -96,6 +150,8 @@ export class BackendBridge extends EventEmitter {
         cwd: this.projectRoot,
         env: {
           ...process.env,
+          ARCTIS_BRIDGE_PROTOCOL: this.protocol,
+          ARCTIS_BRIDGE_CODECS: "msgpack,json",
           PYTHONPATH: this.joinPythonPath([
             path.join(this.projectRoot, "src", "APIs", "arctis_nova_api", "src"),
             path.join(this.projectRoot, "src"),
@@ -126,35 +182,153 @@ export class BackendBridge extends EventEmitter {
     return parts.filter((x) => x.trim().length > 0).join(path.delimiter);
   }
 
-  private onStdout(chunk: string): void {
-    this.pending += chunk;
-    let idx = this.pending.indexOf("\n");
-    while (idx >= 0) {
-      const line = this.pending.slice(0, idx).trim();
-      this.pending = this.pending.slice(idx + 1);
+  private enqueue(cmd: BackendCommand): void {
+    // Queued volume/mute writes for the same channel collapse to the newest value before they are framed.
+    const key = coalesceKey(cmd);
+    const index = key === null ? -1 : this.outbox.findIndex((queued) => coalesceKey(queued) === key);
+    if (index >= 0) {
+      this.resolveRequest(this.outbox[index].id, { status: "superseded", detail: "" });
+      this.outbox[index] = cmd;
+    } else {
+      this.outbox.push(cmd);
+    }
+    if (!this.flushScheduled) {
+      // Commands issued in the same event-loop turn share one frame.
+      this.flushScheduled = true;
+      setImmediate(() => {
+        this.flushScheduled = false;
+        this.flushOutbox();
+      });
+    }
+  }
+
+  private flushOutbox(): void {
+    if (!this.child || this.codec === null || this.stdinBlocked || this.outbox.length === 0) {
+      return;
+    }
+    const batch = this.outbox;
+    this.outbox = [];
+    const body = this.codec === "msgpack" ? encodeMsgpack(batch) : Buffer.from(JSON.stringify(batch), "utf-8");
+    const header = Buffer.alloc(FRAME_HEADER_BYTES);
+    header.writeUInt32BE(body.length, 0);
+    // Until "drain", further commands stay in the outbox where they keep coalescing.
+    this.stdinBlocked = !this.child.stdin.write(Buffer.concat([header, body]));
+  }
+
+  private onStdout(chunk: Buffer): void {
+    this.pending = this.pending.length === 0 ? chunk : Buffer.concat([this.pending, chunk]);
+    while (this.codec === null) {
+      // Line mode: legacy protocol, and the framed protocol up to and including the hello line.
+      const idx = this.pending.indexOf(0x0a);
+      if (idx < 0) {
+        return;
+      }
+      const line = this.pending.subarray(0, idx).toString("utf-8").trim();
+      this.pending = this.pending.subarray(idx + 1);
       if (line) {
         this.consumeLine(line);
       }
-      idx = this.pending.indexOf("\n");
+    }
+    while (this.pending.length >= FRAME_HEADER_BYTES) {
+      const size = this.pending.readUInt32BE(0);
+      if (this.pending.length < FRAME_HEADER_BYTES + size) {
+        return;
+      }
+      const body = this.pending.subarray(FRAME_HEADER_BYTES, FRAME_HEADER_BYTES + size);
+      this.pending = this.pending.subarray(FRAME_HEADER_BYTES + size);
+      this.consumeFrame(body);
     }
   }
 
-  private consumeLine(line: string): void {
+  private consumeFrame(body: Buffer): void {
     try {
-      const event = JSON.parse(line) as BridgeEvent;
-      if (event.type === "state") {
-        this.lastState = mergeState(event.payload);
-        this.emit("state", this.lastState);
-        return;
+      const decoded = this.codec === "msgpack" ? decodeMsgpack(body) : JSON.parse(body.toString("utf-8"));
+      const events = (Array.isArray(decoded) ? decoded : [decoded]) as BridgeEvent[];
+      for (const event of events) {
+        this.consumeEvent(event);
       }
-      if (event.type === "presets") {
-        this.lastPresets = event.payload ?? {};
-        this.emit("presets", this.lastPresets);
-        return;
-      }
-      this.emit(event.type, event.payload);
+    } catch (err) {
+      this.emit("error", `invalid bridge frame: ${String(err)}`);
+    }
+  }
+
+  private consumeLine(line: string): void {
+    let event: BridgeEvent;
+    try {
+      event = JSON.parse(line) as BridgeEvent;
     } catch {
       this.emit("status", line);
+      return;
+    }
+    this.consumeEvent(event);
+  }
+
+  private consumeEvent(event: BridgeEvent): void {
+    if (event.type === "hello") {
+      if (this.awaitingHello) {
+        this.awaitingHello = false;
+        this.codec = event.payload.codec;
+        this.flushOutbox();
+      }
+      return;
+    }
+    if (event.type === "state") {
+      this.lastState = mergeState(event.payload);
+      this.lastSeq = event.seq ?? null;
+      this.resyncRequested = false;
+      this.emit("state", this.lastState);
+      return;
+    }
+    if (event.type === "state_delta") {
+      this.consumeDelta(event.payload);
+      return;
+    }
+    if (event.type === "presets") {
+      this.lastPresets = event.payload ?? {};
+      this.emit("presets", this.lastPresets);
+      return;
+    }
+    if (event.type === "result") {
+      this.resolveRequest(event.id, event.payload);
+      return;
+    }
+    this.emit(event.type, event.payload);
+  }
+
+  private resolveRequest(id: number | undefined, result: CommandResult): void {
+    if (id === undefined) {
+      return;
+    }
+    const resolve = this.requests.get(id);
+    if (resolve) {
+      this.requests.delete(id);
+      resolve(result);
+    }
+  }
+
+  private failRequests(detail: string): void {
+    const pending = [...this.requests.values()];
+    this.requests.clear();
+    for (const resolve of pending) {
+      resolve({ status: "failed", detail });
+    }
+  }
+
+  private consumeDelta(delta: StateDelta): void {
+    if (this.lastSeq !== null && delta.seq <= this.lastSeq) {
+      // Already covered by a full state the bridge sent after shedding a backlog.
+      return;
+    }
+    if (this.lastSeq === null || delta.base !== this.lastSeq) {
+      // Missed a version (or never saw a full state): drop the delta and ask for a full resync.
+      if (!this.resyncRequested) {
+        this.resyncRequested = true;
+        this.send({ name: "resync", payload: {} });
+      }
+      return;
     }
+    this.lastSeq = delta.seq;
+    this.lastState = applyStatePatch(this.lastState, delta.ops);
+    this.emit("state_delta", delta, this.lastState);
   }
 }
@@ -0,0 +1,293 @@
+// Minimal MessagePack codec for the JSON-compatible values exchanged with the Python bridge:
+// null, booleans, numbers, strings, arrays, plain objects (and binary on decode).
+
+const textEncoder = new TextEncoder();
+const textDecoder = new TextDecoder();
+
+class ByteWriter {
+  private buffer = new Uint8Array(256);
+  private view = new DataView(this.buffer.buffer);
+  private length = 0;
+
+  public bytes(): Uint8Array {
+    return this.buffer.subarray(0, this.length);
+  }
+
+  public u8(value: number): void {
+    this.reserve(1);
+    this.view.setUint8(this.length, value);
+    this.length += 1;
+  }
+
+  public u16(value: number): void {
+    this.reserve(2);
+    this.view.setUint16(this.length, value);
+    this.length += 2;
+  }
+
+  public u32(value: number): void {
+    this.reserve(4);
+    this.view.setUint32(this.length, value);
+    this.length += 4;
+  }
+
+  public i8(value: number): void {
+    this.reserve(1);
+    this.view.setInt8(this.length, value);
+    this.length += 1;
+  }
+
+  public i16(value: number): void {
+    this.reserve(2);
+    this.view.setInt16(this.length, value);
+    this.length += 2;
+  }
+
+  public i32(value: number): void {
+    this.reserve(4);
+    this.view.setInt32(this.length, value);
+    this.length += 4;
+  }
+
+  public i64(value: number): void {
+    this.reserve(8);
+    this.view.setBigInt64(this.length, BigInt(value));
+    this.length += 8;
+  }
+
+  public f64(value: number): void {
+    this.reserve(8);
+    this.view.setFloat64(this.length, value);
+    this.length += 8;
+  }
+
+  public raw(bytes: Uint8Array): void {
+    this.reserve(bytes.length);
+    this.buffer.set(bytes, this.length);
+    this.length += bytes.length;
+  }
+
+  private reserve(size: number): void {
+    if (this.length + size <= this.buffer.length) {
+      return;
+    }
+    let capacity = this.buffer.length * 2;
+    while (capacity < this.length + size) {
+      capacity *= 2;
+    }
+    const next = new Uint8Array(capacity);
+    next.set(this.buffer.subarray(0, this.length));
+    this.buffer = next;
+    this.view = new DataView(next.buffer);
+  }
+}
+
+export function encodeMsgpack(value: unknown): Uint8Array {
+  const writer = new ByteWriter();
+  writeValue(writer, value);
+  return writer.bytes();
+}
+
+function writeValue(writer: ByteWriter, value: unknown): void {
+  if (value === null || value === undefined) {
+    writer.u8(0xc0);
+  } else if (typeof value === "boolean") {
+    writer.u8(value ? 0xc3 : 0xc2);
+  } else if (typeof value === "number") {
+    writeNumber(writer, value);
+  } else if (typeof value === "string") {
+    const bytes = textEncoder.encode(value);
+    writeHeader(writer, bytes.length, 0xa0, 32, 0xd9, 0xda, 0xdb);
+    writer.raw(bytes);
+  } else if (value instanceof Uint8Array) {
+    writeHeader(writer, value.length, -1, 0, 0xc4, 0xc5, 0xc6);
+    writer.raw(value);
+  } else if (Array.isArray(value)) {
+    writeHeader(writer, value.length, 0x90, 16, -1, 0xdc, 0xdd);
+    for (const item of value) {
+      writeValue(writer, item);
+    }
+  } else if (typeof value === "object") {
+    // Like JSON.stringify, keys with undefined or function values are left out.
+    const entries = Object.entries(value as Record<string, unknown>).filter(
+      ([, item]) => item !== undefined && typeof item !== "function",
+    );
+    writeHeader(writer, entries.length, 0x80, 16, -1, 0xde, 0xdf);
+    for (const [key, item] of entries) {
+      writeValue(writer, key);
+      writeValue(writer, item);
+    }
+  } else {
+    throw new TypeError(`Cannot encode ${typeof value} as MessagePack`);
+  }
+}
+
+function writeNumber(writer: ByteWriter, value: number): void {
+  if (!Number.isSafeInteger(value)) {
+    writer.u8(0xcb);
+    writer.f64(value);
+  } else if (value >= 0 && value < 0x80) {
+    writer.u8(value);
+  } else if (value < 0 && value >= -0x20) {
+    writer.i8(value);
+  } else if (value >= -0x80 && value < 0x80) {
+    writer.u8(0xd0);
+    writer.i8(value);
+  } else if (value >= -0x8000 && value < 0x8000) {
+    writer.u8(0xd1);
+    writer.i16(value);
+  } else if (value >= -0x80000000 && value < 0x80000000) {
+    writer.u8(0xd2);
+    writer.i32(value);
+  } else {
+    writer.u8(0xd3);
+    writer.i64(value);
+  }
+}
+
+// Writes the smallest length header: a fix-format byte (when `fixLimit` allows), then 8/16/32-bit forms.
+function writeHeader(
+  writer: ByteWriter,
+  length: number,
+  fixBase: number,
+  fixLimit: number,
+  tag8: number,
+  tag16: number,
+  tag32: number,
+): void {
+  if (length < fixLimit) {
+    writer.u8(fixBase | length);
+  } else if (tag8 >= 0 && length < 0x100) {
+    writer.u8(tag8);
+    writer.u8(length);
+  } else if (length < 0x10000) {
+    writer.u8(tag16);
+    writer.u16(length);
+  } else {
+    writer.u8(tag32);
+    writer.u32(length);
+  }
+}
+
+export function decodeMsgpack(bytes: Uint8Array): unknown {
+  const reader = new ByteReader(bytes);
+  const value = reader.value();
+  if (reader.offset !== bytes.length) {
+    throw new Error("Trailing bytes after MessagePack value");
+  }
+  return value;
+}
+
+class ByteReader {
+  public offset = 0;
+  private view: DataView;
+
+  constructor(private bytes: Uint8Array) {
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  }
+
+  public value(): unknown {
+    const tag = this.u8();
+    if (tag < 0x80) return tag;
+    if (tag >= 0xe0) return tag - 0x100;
+    if (tag >= 0xa0 && tag <= 0xbf) return this.str(tag & 0x1f);
+    if (tag >= 0x90 && tag <= 0x9f) return this.array(tag & 0x0f);
+    if (tag >= 0x80 && tag <= 0x8f) return this.map(tag & 0x0f);
+    switch (tag) {
+      case 0xc0:
+        return null;
+      case 0xc2:
+        return false;
+      case 0xc3:
+        return true;
+      case 0xc4:
+        return this.bin(this.u8());
+      case 0xc5:
+        return this.bin(this.u16());
+      case 0xc6:
+        return this.bin(this.u32());
+      case 0xca:
+        return this.read(4, (at) => this.view.getFloat32(at));
+      case 0xcb:
+        return this.read(8, (at) => this.view.getFloat64(at));
+      case 0xcc:
+        return this.u8();
+      case 0xcd:
+        return this.u16();
+      case 0xce:
+        return this.u32();
+      case 0xcf:
+        return Number(this.read(8, (at) => this.view.getBigUint64(at)));
+      case 0xd0:
+        return this.read(1, (at) => this.view.getInt8(at));
+      case 0xd1:
+        return this.read(2, (at) => this.view.getInt16(at));
+      case 0xd2:
+        return this.read(4, (at) => this.view.getInt32(at));
+      case 0xd3:
+        return Number(this.read(8, (at) => this.view.getBigInt64(at)));
+      case 0xd9:
+        return this.str(this.u8());
+      case 0xda:
+        return this.str(this.u16());
+      case 0xdb:
+        return this.str(this.u32());
+      case 0xdc:
+        return this.array(this.u16());
+      case 0xdd:
+        return this.array(this.u32());
+      case 0xde:
+        return this.map(this.u16());
+      case 0xdf:
+        return this.map(this.u32());
+      default:
+        throw new Error(`Unsupported MessagePack type 0x${tag.toString(16)}`);
+    }
+  }
+
+  private u8(): number {
+    return this.read(1, (at) => this.view.getUint8(at));
+  }
+
+  private u16(): number {
+    return this.read(2, (at) => this.view.getUint16(at));
+  }
+
+  private u32(): number {
+    return this.read(4, (at) => this.view.getUint32(at));
+  }
+
+  private read<T>(size: number, get: (at: number) => T): T {
+    if (this.offset + size > this.bytes.length) {
+      throw new Error("Truncated MessagePack value");
+    }
+    const value = get(this.offset);
+    this.offset += size;
+    return value;
+  }
+
+  private bin(length: number): Uint8Array {
+    return this.read(length, (at) => this.bytes.slice(at, at + length));
+  }
+
+  private str(length: number): string {
+    return this.read(length, (at) => textDecoder.decode(this.bytes.subarray(at, at + length)));
+  }
+
+  private array(length: number): unknown[] {
+    const items: unknown[] = [];
+    for (let i = 0; i < length; i += 1) {
+      items.push(this.value());
+    }
+    return items;
+  }
+
+  private map(length: number): Record<string, unknown> {
+    const result: Record<string, unknown> = {};
+    for (let i = 0; i < length; i += 1) {
+      const key = this.value();
+      result[String(key)] = this.value();
+    }
+    return result;
+  }
+}
@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useRef, useState } from "react";
 import { CHANNELS, type AppState, type PresetMap, type UiSettings } from "@shared/types";
-import { mergeState } from "@shared/settings";
+import { applyStatePatch, mergeState } from "@shared/settings";
 
 export interface MixerApp {
   id: string;
@@ -26,6 +26,7 @@ export function useBridgeState() {
   const [logs, setLogs] = useState<string[]>([]);
   const [mixerData, setMixerData] = useState<MixerData>({ outputs: [], selectedOutputId: "default", apps: [] });
   const lockedUntilRef = useRef<Record<string, number>>({});
+  const backendStateRef = useRef<AppState>(mergeState());
   const addLog = (text: string) =>
     setLogs((prev) => [`${new Date().toLocaleTimeString()}  ${text}`, ...prev].slice(0, 200));
   const windowMode = useMemo(() => {
@@ -36,11 +37,33 @@ export function useBridgeState() {
     return "dashboard";
   }, []);
 
+  // Channels the user just edited keep their optimistic values until the lock expires.
+  const withChannelLocks = (prev: AppState, next: AppState): AppState => {
+    const now = Date.now();
+    const locked = CHANNELS.filter((ch) => (lockedUntilRef.current[ch] ?? 0) > now);
+    if (!locked.length) {
+      return next;
+    }
+    const merged = {
+      ...next,
+      channel_volume: { ...next.channel_volume },
+      channel_mute: { ...next.channel_mute },
+      channel_preset: { ...next.channel_preset },
+    };
+    for (const ch of locked) {
+      merged.channel_volume[ch] = prev.channel_volume[ch];
+      merged.channel_mute[ch] = prev.channel_mute[ch];
+      merged.channel_preset[ch] = prev.channel_preset[ch];
+    }
+    return merged;
+  };
+
   useEffect(() => {
     let disposed = false;
     window.arctisBridge.getInitial().then(async (payload) => {
       if (disposed) return;
-      setState(mergeState(payload.state));
+      backendStateRef.current = mergeState(payload.state);
+      setState(backendStateRef.current);
       setPresets(payload.presets ?? {});
       setSettingsState(payload.settings);
       setTheme(payload.theme);
@@ -57,19 +80,13 @@ export function useBridgeState() {
       }
     });
     const offState = window.arctisBridge.onState((next) => {
-      setState((prev) => {
-        const merged = mergeState(next);
-        const now = Date.now();
-        const lockedUntil = lockedUntilRef.current;
-        for (const ch of CHANNELS) {
-          if ((lockedUntil[ch] ?? 0) > now) {
-            merged.channel_volume[ch] = prev.channel_volume[ch];
-            merged.channel_mute[ch] = prev.channel_mute[ch];
-            merged.channel_preset[ch] = prev.channel_preset[ch];
-          }
-        }
-        return merged;
-      });
+      backendStateRef.current = mergeState(next);
+      setState((prev) => withChannelLocks(prev, backendStateRef.current));
+    });
+    const offStateDelta = window.arctisBridge.onStateDelta((delta) => {
+      // Patching keeps untouched slices identical, so only components reading changed fields re-render.
+      backendStateRef.current = applyStatePatch(backendStateRef.current, delta.ops);
+      setState((prev) => withChannelLocks(prev, backendStateRef.current));
     });
     const offPresets = window.arctisBridge.onPresets((next) => setPresets(next));
     const offStatus = window.arctisBridge.onStatus((text) => {
@@ -87,6 +104,7 @@ export function useBridgeState() {
     return () => {
       disposed = true;
       offState();
+      offStateDelta();
       offPresets();
       offStatus();
       offError();
@@ -1,6 +1,6 @@
 /// <reference types="vite/client" />
 
-import type { AppState, BackendCommand, PresetMap, UiSettings } from "@shared/types";
+import type { AppState, BackendCommand, PresetMap, StateDelta, UiSettings } from "@shared/types";
 
 declare global {
   interface Window {
@@ -31,6 +31,7 @@ declare global {
       openAboutWindow: () => void;
       setSettings: (settings: Partial<UiSettings>) => Promise<UiSettings>;
       onState: (cb: (state: AppState) => void) => () => void;
+      onStateDelta: (cb: (delta: StateDelta) => void) => () => void;
       onPresets: (cb: (presets: PresetMap) => void) => () => void;
       onStatus: (cb: (text: string) => void) => () => void;
       onError: (cb: (text: string) => void) => () => void;
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import json
-import queue
 import sys
 import threading
-import time
 import warnings
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -22,192 +20,135 @@ if str(ROOT) not in sys.path:
 warnings.filterwarnings("ignore", category=urllib3.exceptions.InsecureRequestWarning)
 
 from arctis_nova_api import (  # type: ignore
-    AncMode,
-    AncStatus,
+    AdaptiveScheduler,
     ArctisNovaProApi,
-    BatteryStatus,
-    ExperimentalCommandProfile,
-    HeadsetConnectionStatus,
-    MicStatus,
-    OledBrightnessStatus,
-    SidetoneStatus,
-    StreamerSlider,
-    VolumeKnobEvent,
+    HeadsetStateEngine,
+    StateDelta,
 )
+from arctis_nova_api.endpoints import DEFAULT_ENDPOINT_CACHE_PATH  # type: ignore
 from arctis_nova_api.errors import UnsupportedFeatureError  # type: ignore
+from arctis_nova_api.state import (  # type: ignore
+    CHANNEL_MAP,
+    DEFAULT_INTERVALS,
+    DEFAULT_WRITE_INTERVAL,
+    PRESET_CHANNEL_MAP,
+    coalesce_key,
+    default_api_factory,
+)
+from bridge_protocol import FramedTransport, LineTransport, open_transport  # type: ignore
+
+
+# Replaced in main() when Electron negotiates the framed protocol.
+TRANSPORT: LineTransport | FramedTransport = LineTransport()
 
-CHANNELS: tuple[str, ...] = ("master", "game", "chatRender", "media", "aux", "chatCapture")
-
-DEFAULT_STATE: dict[str, Any] = {
-    "headset_battery_percent": None,
-    "base_battery_percent": None,
-    "headset_volume_percent": None,
-    "anc_mode": None,
-    "mic_mute": None,
-    "sidetone_level": None,
-    "connected": None,
-    "wireless": None,
-    "bluetooth": None,
-    "chat_mix_balance": None,
-    "oled_brightness": None,
-    "channel_volume": {},
-    "channel_mute": {},
-    "channel_preset": {},
-    "channel_apps": {},
-    "updated_at": None,
-}
-
-
-def extract_chat_mix_balance(payload: Any) -> float | None:
-    if isinstance(payload, (int, float)):
-        return float(payload)
-    if not isinstance(payload, dict):
-        return None
-    for key in ("balance", "chatMix", "value"):
-        value = payload.get(key)
-        if isinstance(value, (int, float)):
-            return float(value)
-    return None
-
-
-def emit(event_type: str, payload: Any) -> None:
-    line = json.dumps({"type": event_type, "payload": payload})
-    print(line, flush=True)
-
-
-def build_command_profile() -> ExperimentalCommandProfile:
-    return ExperimentalCommandProfile(
-        anc_event_command_id=0xBD,
-        anc_value_index=2,
-        anc_value_map={0: AncMode.OFF, 1: AncMode.TRANSPARENCY, 2: AncMode.ANC},
-        mic_event_command_id=0xBB,
-        mic_value_index=2,
-        mic_muted_values={1},
-        sidetone_event_command_id=0x39,
-        sidetone_value_index=2,
-        sidetone_label_map={"off": 0, "low": 1, "med": 2, "high": 3},
-    )
+
+def emit(event_type: str, payload: Any, **fields: Any) -> None:
+    TRANSPORT.send({"type": event_type, "payload": payload, **fields})
 
 
 class BridgeService:
-    def __init__(self) -> None:
-        self._api: ArctisNovaProApi | None = None
-        self._state: dict[str, Any] = dict(DEFAULT_STATE)
-        self._queue: queue.Queue[dict[str, Any]] = queue.Queue()
-        self._stop = threading.Event()
+    def __init__(self, write_interval: float = DEFAULT_WRITE_INTERVAL, pause_sonar_when_hidden: bool = False) -> None:
+        # Sonar keeps polling (backed off) while the flyout is hidden by default: preset and
+        # chat mix notifications are driven by state changes.
+        scheduler = AdaptiveScheduler(DEFAULT_INTERVALS, pause_when_hidden=("sonar",) if pause_sonar_when_hidden else ())
+        self._engine = HeadsetStateEngine(
+            partial(default_api_factory, endpoint_cache_path=DEFAULT_ENDPOINT_CACHE_PATH),
+            scheduler=scheduler,
+            write_interval=write_interval,
+            on_error=self._on_command_error,
+        )
+        self._engine.subscribe(self._on_delta)
+        self._engine.subscribe_presets(self._on_presets)
         self._presets_cache: dict[str, list[tuple[str, str]]] = {}
+        self._queued_lock = threading.Lock()
+        self._queued: dict[tuple[str, str], dict[str, Any]] = {}
 
     def enqueue(self, cmd: dict[str, Any]) -> None:
-        self._queue.put(cmd)
+        if cmd.get("name") == "visibility":
+            self._engine.set_visible(bool((cmd.get("payload") or {}).get("visible")))
+            _reply(cmd, "succeeded")
+            return
+        key = coalesce_key(str(cmd.get("name", "")), cmd.get("payload"))
+        if key is not None:
+            with self._queued_lock:
+                previous = self._queued.get(key)
+                self._queued[key] = cmd
+            if previous is not None:
+                # The engine replaces the queued write; only the newest value is sent to Sonar.
+                _reply(previous, "superseded")
+        self._engine.submit(partial(self._run_command, cmd, key), key=key)
+
+    def resync_message(self) -> dict[str, Any]:
+        resync = self._engine.resync()
+        return {"type": "state", "payload": resync["state"], "seq": resync["seq"]}
 
     def run(self) -> None:
-        self._api = ArctisNovaProApi(command_profile=build_command_profile())
-        self._api.base_station.connect()
-        self._load_presets_once()
-        self._refresh_all(force_emit=True)
-        last_fast = 0.0
-        last_sonar = 0.0
-        last_hw = 0.0
-
-        while not self._stop.is_set():
-            self._drain_commands()
-            now = time.monotonic()
-            changed = False
-            if now - last_fast >= 0.12:
-                changed |= self._refresh_events()
-                last_fast = now
-            if now - last_sonar >= 0.6:
-                changed |= self._refresh_sonar()
-                last_sonar = now
-            if now - last_hw >= 0.8:
-                changed |= self._refresh_hw()
-                last_hw = now
-            if changed:
-                self._state["updated_at"] = time.strftime("%H:%M:%S")
-                emit("state", dict(self._state))
-            time.sleep(0.02)
+        try:
+            self._engine.open()
+            self._engine.refresh()
+            self._publish_resync()
+            self._engine.loop()
+        finally:
+            self._engine.close()
 
     def stop(self) -> None:
-        self._stop.set()
-        if self._api:
-            try:
-                self._api.base_station.close()
-            except Exception:
-                pass
-
-    def _load_presets_once(self) -> None:
-        if not self._api:
-            return
-        cache: dict[str, list[tuple[str, str]]] = {}
-        for channel, preset_channel in self._preset_map().items():
-            try:
-                presets = self._api.sonar.list_favorite_presets(preset_channel)
-                cache[channel] = [(preset.preset_id, preset.name) for preset in presets]
-            except Exception:
-                cache[channel] = []
-        self._presets_cache = cache
-        emit("presets", cache)
-
-    def _drain_commands(self) -> None:
-        if not self._api:
-            return
-        while True:
-            try:
-                cmd = self._queue.get_nowait()
-            except queue.Empty:
-                break
-            try:
-                self._handle_command(cmd)
-            except UnsupportedFeatureError as exc:
-                emit("status", str(exc))
-            except Exception as exc:
-                emit("error", str(exc))
-
-    def _handle_command(self, cmd: dict[str, Any]) -> None:
-        assert self._api is not None
+        self._engine.stop()
+
+    def _on_delta(self, delta: StateDelta) -> None:
+        emit("state_delta", delta.to_dict())
+
+    def _on_presets(self, presets: dict[str, Any]) -> None:
+        self._presets_cache = {
+            channel: [(preset.preset_id, preset.name) for preset in items] for channel, items in presets.items()
+        }
+        emit("presets", self._presets_cache)
+
+    @staticmethod
+    def _on_command_error(exc: Exception) -> None:
+        if isinstance(exc, UnsupportedFeatureError):
+            emit("status", str(exc))
+        else:
+            emit("error", str(exc))
+
+    def _run_command(self, cmd: dict[str, Any], key: tuple[str, str] | None, api: ArctisNovaProApi) -> None:
+        if key is not None:
+            with self._queued_lock:
+                if self._queued.get(key) is not cmd:
+                    return  # Superseded after the engine drained it; already answered.
+                del self._queued[key]
+        try:
+            ok, detail = self._handle_command(cmd, api)
+        except Exception as exc:
+            _reply(cmd, "failed", str(exc))
+            raise
+        if detail:
+            emit("status", detail)
+        _reply(cmd, "succeeded" if ok else "failed", detail)
+
+    def _handle_command(self, cmd: dict[str, Any], api: ArctisNovaProApi) -> tuple[bool, str]:
+        """Run one command on the engine thread; returns whether it applied and a status message."""
         name = str(cmd.get("name", ""))
         payload = cmd.get("payload", {}) or {}
-        channel_map = self._channel_map()
-        preset_map = self._preset_map()
 
         if name == "set_channel_volume":
-            channel = channel_map[str(payload["channel"])]
+            channel = CHANNEL_MAP[str(payload["channel"])]
             value = max(0, min(100, int(payload["value"])))
-            errors: list[str] = []
-            for kwargs in (
-                {"streamer": False},
-                {"streamer": True, "streamer_slider": StreamerSlider.STREAMING},
-                {"streamer": True, "streamer_slider": StreamerSlider.MONITORING},
-            ):
-                try:
-                    self._api.sonar.set_channel_volume(channel, value / 100.0, **kwargs)
-                except Exception as exc:
-                    errors.append(str(exc))
-            applied = int(round(self._api.sonar.get_channel_volume(channel) * 100))
-            suffix = " (partial mode sync)" if errors else ""
-            emit("status", f"{channel.value} volume {applied}%{suffix}")
-            self._refresh_sonar()
-            emit("state", dict(self._state))
-            return
+            result = api.sonar.set_channel_volume_all_modes(channel, value / 100.0)
+            self._engine.refresh("sonar")
+            if result.applied:
+                suffix = " (partial mode sync)" if result.partial else ""
+                return True, f"{channel.value} volume {value}%{suffix}"
+            return False, f"{channel.value} volume write failed"
 
         if name == "set_channel_mute":
-            channel = channel_map[str(payload["channel"])]
+            channel = CHANNEL_MAP[str(payload["channel"])]
             muted = bool(payload["value"])
-            errors: list[str] = []
-            for kwargs in (
-                {"streamer": False},
-                {"streamer": True, "streamer_slider": StreamerSlider.STREAMING},
-                {"streamer": True, "streamer_slider": StreamerSlider.MONITORING},
-            ):
-                try:
-                    self._api.sonar.set_channel_mute(channel, muted, **kwargs)
-                except Exception as exc:
-                    errors.append(str(exc))
-            suffix = " (partial mode sync)" if errors else ""
-            emit("status", f"{channel.value} {'muted' if muted else 'unmuted'}{suffix}")
-            self._refresh_sonar()
-            emit("state", dict(self._state))
-            return
+            result = api.sonar.set_channel_mute_all_modes(channel, muted)
+            self._engine.refresh("sonar")
+            if result.applied:
+                suffix = " (partial mode sync)" if result.partial else ""
+                return True, f"{channel.value} {'muted' if muted else 'unmuted'}{suffix}"
+            return False, f"{channel.value} mute write failed"
 
         if name == "set_preset":
             channel = str(payload["channel"])
@@ -218,184 +159,57 @@ class BridgeService:
                     selected_name = pname
                     break
             if selected_name:
-                self._api.sonar.select_preset_for_channel(preset_map[channel], selected_name)
+                api.sonar.select_preset_for_channel(PRESET_CHANNEL_MAP[channel], selected_name)
             else:
-                self._api.sonar.select_preset(preset_id)
-            self._refresh_sonar()
-            emit("status", f"{channel} preset set")
-            emit("state", dict(self._state))
-
-    def _refresh_all(self, force_emit: bool = False) -> None:
-        changed = self._refresh_events()
-        changed |= self._refresh_sonar()
-        changed |= self._refresh_hw()
-        if changed or force_emit:
-            self._state["updated_at"] = time.strftime("%H:%M:%S")
-            emit("state", dict(self._state))
-
-    def _refresh_events(self) -> bool:
-        if not self._api:
-            return False
-        changed = False
-        events = self._api.base_station.get_pending_events()
-        for event in events:
-            if isinstance(event, BatteryStatus):
-                changed |= self._set("headset_battery_percent", int(round(event.headset_percent)))
-                changed |= self._set("base_battery_percent", int(round(event.charging_percent)))
-            elif isinstance(event, VolumeKnobEvent):
-                changed |= self._set("headset_volume_percent", int(round(event.volume_percent)))
-            elif isinstance(event, AncStatus):
-                changed |= self._set("anc_mode", event.mode.value)
-            elif isinstance(event, MicStatus):
-                changed |= self._set("mic_mute", not event.enabled)
-            elif isinstance(event, SidetoneStatus):
-                changed |= self._set("sidetone_level", event.level)
-            elif isinstance(event, OledBrightnessStatus):
-                changed |= self._set("oled_brightness", event.level)
-            elif isinstance(event, HeadsetConnectionStatus):
-                changed |= self._set("connected", event.wireless)
-                changed |= self._set("wireless", event.wireless)
-                changed |= self._set("bluetooth", event.bluetooth)
-                if event.wireless:
-                    changed |= self._set("anc_mode", "off")
-        return changed
-
-    def _refresh_sonar(self) -> bool:
-        if not self._api:
-            return False
-        changed = False
-        channel_volume = dict(self._state.get("channel_volume", {}))
-        channel_mute = dict(self._state.get("channel_mute", {}))
-        channel_preset = dict(self._state.get("channel_preset", {}))
-        channel_map = self._channel_map()
-        preset_map = self._preset_map()
-        for channel in CHANNELS:
-            try:
-                channel_volume[channel] = int(round(self._api.sonar.get_channel_volume(channel_map[channel]) * 100))
-            except Exception:
-                pass
-            try:
-                channel_mute[channel] = bool(self._api.sonar.get_channel_mute(channel_map[channel]))
-            except Exception:
-                pass
-            try:
-                selected = self._api.sonar.get_selected_preset(preset_map[channel])
-                channel_preset[channel] = selected.preset_id if selected else None
-            except Exception:
-                pass
-        changed |= self._set("channel_volume", channel_volume)
-        changed |= self._set("channel_mute", channel_mute)
-        changed |= self._set("channel_preset", channel_preset)
-        try:
-            apps = self._api.sonar.get_routed_apps_by_channel()
-            changed |= self._set("channel_apps", apps)
-        except Exception:
-            pass
-        try:
-            chat_mix_payload = self._api.sonar.get_chat_mix()
-            chat_mix = extract_chat_mix_balance(chat_mix_payload)
-            if chat_mix is not None:
-                chat_mix = max(-1.0, min(1.0, float(chat_mix)))
-                changed |= self._set("chat_mix_balance", int(round((chat_mix + 1.0) * 50)))
-        except Exception:
-            pass
-        return changed
-
-    def _refresh_hw(self) -> bool:
-        if not self._api:
-            return False
-        changed = False
-        try:
-            brightness = self._api.base_station.get_oled_brightness()
-            if brightness is not None:
-                changed |= self._set("oled_brightness", int(brightness))
-        except Exception:
-            pass
-        try:
-            volume_pct = self._api.base_station.get_headset_volume_percentage()
-            if volume_pct is not None:
-                changed |= self._set("headset_volume_percent", int(round(volume_pct)))
-        except Exception:
-            pass
-        try:
-            anc = self._api.base_station.get_anc_status()
-            if anc is not None:
-                changed |= self._set("anc_mode", anc.mode.value)
-        except Exception:
-            pass
-        try:
-            mic = self._api.base_station.get_mic_status()
-            if mic is not None:
-                changed |= self._set("mic_mute", not mic.enabled)
-        except Exception:
-            pass
-        try:
-            sidetone = self._api.base_station.get_sidetone_status()
-            if sidetone is not None:
-                changed |= self._set("sidetone_level", sidetone.level)
-        except Exception:
-            pass
-        try:
-            battery = self._api.base_station.get_battery_status()
-            if battery is not None:
-                changed |= self._set("headset_battery_percent", int(round(battery.headset_percent)))
-                changed |= self._set("base_battery_percent", int(round(battery.charging_percent)))
-        except Exception:
-            pass
-        return changed
-
-    def _set(self, key: str, value: Any) -> bool:
-        if self._state.get(key) != value:
-            self._state[key] = value
-            return True
-        return False
+                api.sonar.select_preset(preset_id)
+            self._engine.refresh("sonar")
+            return True, f"{channel} preset set"
 
-    @staticmethod
-    def _channel_map() -> dict[str, Any]:
-        from arctis_nova_api import SonarChannel  # type: ignore
-
-        return {
-            "master": SonarChannel.MASTER,
-            "game": SonarChannel.GAME,
-            "chatRender": SonarChannel.CHAT_RENDER,
-            "media": SonarChannel.MEDIA,
-            "aux": SonarChannel.AUX,
-            "chatCapture": SonarChannel.CHAT_CAPTURE,
-        }
+        if name == "resync":
+            self._publish_resync()
+            return True, ""
 
-    @staticmethod
-    def _preset_map() -> dict[str, Any]:
-        from arctis_nova_api import PresetChannel  # type: ignore
-
-        return {
-            "master": PresetChannel.MASTER,
-            "game": PresetChannel.GAMING,
-            "chatRender": PresetChannel.CHAT,
-            "media": PresetChannel.MEDIA,
-            "aux": PresetChannel.AUX,
-            "chatCapture": PresetChannel.MIC,
-        }
+        return False, f"unknown command: {name}"
+
+    def _publish_resync(self) -> None:
+        # Full state for startup and for clients that detected a sequence gap.
+        TRANSPORT.send(self.resync_message())
+
+
+def _reply(cmd: dict[str, Any], status: str, detail: str = "") -> None:
+    # Commands sent with an id get exactly one result: succeeded, failed or superseded.
+    if "id" in cmd:
+        emit("result", {"status": status, "detail": detail}, id=cmd["id"])
 
 
 def input_loop(service: BridgeService) -> None:
+    commands = TRANSPORT.read_commands()
     while True:
-        line = sys.stdin.readline()
-        if line == "":
+        try:
+            cmd = next(commands)
+        except StopIteration:
             service.stop()
             return
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            cmd = json.loads(line)
-            if isinstance(cmd, dict):
-                service.enqueue(cmd)
         except Exception as exc:
+            if isinstance(TRANSPORT, FramedTransport):
+                # A bad frame leaves the stream out of sync; there is no way to recover.
+                emit("error", f"bridge protocol error: {exc}")
+                service.stop()
+                return
             emit("error", str(exc))
+            commands = TRANSPORT.read_commands()
+            continue
+        if isinstance(cmd, dict):
+            service.enqueue(cmd)
 
 
 def main() -> int:
+    global TRANSPORT
     service = BridgeService()
+    TRANSPORT = open_transport()
+    if isinstance(TRANSPORT, FramedTransport):
+        TRANSPORT.resync = service.resync_message
+        TRANSPORT.start()
     t = threading.Thread(target=input_loop, args=(service,), daemon=True)
     t.start()
     try:
@@ -405,6 +219,7 @@ def main() -> int:
         return 1
     finally:
         service.stop()
+        TRANSPORT.close()
     return 0
 
 
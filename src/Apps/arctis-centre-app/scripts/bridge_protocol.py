@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import threading
+from collections.abc import Iterator, Mapping
+from typing import Any, BinaryIO, Callable, TextIO
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # Optional: framed mode falls back to JSON frames.
+    msgpack = None
+
+# Set by the Electron side: "framed" asks for the framed protocol, anything else keeps JSON lines.
+PROTOCOL_ENV = "ARCTIS_BRIDGE_PROTOCOL"
+# Codecs the Electron side can decode, in order of preference, e.g. "msgpack,json".
+CODECS_ENV = "ARCTIS_BRIDGE_CODECS"
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+# Messages waiting on a slow reader before queued state deltas are replaced by one full state.
+MAX_PENDING = 256
+
+Message = dict[str, Any]
+
+
+class Codec:
+    def __init__(self, name: str, encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]) -> None:
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _json_decode(data: bytes) -> Any:
+    return json.loads(data.decode("utf-8"))
+
+
+def available_codecs() -> dict[str, Codec]:
+    codecs = {"json": Codec("json", _json_encode, _json_decode)}
+    if msgpack is not None:
+        codecs["msgpack"] = Codec(
+            "msgpack",
+            lambda value: msgpack.packb(value, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False),
+        )
+    return codecs
+
+
+def negotiate(environ: Mapping[str, str] = os.environ) -> Codec | None:
+    """Codec for framed mode, or None when the client asked for legacy JSON lines."""
+    if environ.get(PROTOCOL_ENV, "").strip().lower() != "framed":
+        return None
+    codecs = available_codecs()
+    for name in environ.get(CODECS_ENV, "json").split(","):
+        codec = codecs.get(name.strip().lower())
+        if codec is not None:
+            return codec
+    return codecs["json"]
+
+
+class LineTransport:
+    """Legacy protocol: one compact JSON object per line in each direction."""
+
+    def __init__(self, stdin: TextIO | None = None, stdout: TextIO | None = None) -> None:
+        self._stdin = stdin or sys.stdin
+        self._stdout = stdout or sys.stdout
+
+    def send(self, message: Message) -> None:
+        print(json.dumps(message, separators=(",", ":")), file=self._stdout, flush=True)
+
+    def read_commands(self) -> Iterator[Any]:
+        while True:
+            line = self._stdin.readline()
+            if line == "":
+                return
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+    def close(self) -> None:
+        pass
+
+
+class FramedTransport:
+    """
+    Framed protocol: each frame is a 4-byte big-endian length and a codec-encoded
+    list of messages.
+
+    `send` only queues; a writer thread packs everything queued since its
+    last write into one frame, so one engine tick costs one encode and one
+    write however many messages it produced. When the reader falls behind,
+    the blocking pipe write lets the queue grow; past `max_pending`
+    messages the queued state deltas are dropped and the next frame starts
+    with a full state from `resync` instead. Incoming frames may hold one
+    command or a list of commands.
+    """
+
+    def __init__(
+        self,
+        codec: Codec,
+        stdin: BinaryIO | None = None,
+        stdout: BinaryIO | None = None,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self.codec = codec
+        self.resync: Callable[[], Message] | None = None
+        self.max_pending = max_pending
+        self._stdin = stdin or sys.stdin.buffer
+        self._stdout = stdout or sys.stdout.buffer
+        self._cond = threading.Condition()
+        self._pending: list[Message] = []
+        self._needs_resync = False
+        self._closed = False
+        self.frames = 0
+        self.shed = 0
+        self._thread = threading.Thread(target=self._run, name="bridge-frame-writer", daemon=True)
+
+    def start(self) -> None:
+        # The hello line is the last line-delimited output; everything after it is framed.
+        hello = {"type": "hello", "payload": {"protocol": "framed", "codec": self.codec.name}}
+        self._write_all(_json_encode(hello) + b"\n")
+        self._thread.start()
+
+    def send(self, message: Message) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.append(message)
+            if len(self._pending) > self.max_pending and self.resync is not None:
+                kept = [item for item in self._pending if item.get("type") not in ("state", "state_delta")]
+                self.shed += len(self._pending) - len(kept)
+                self._pending = kept
+                self._needs_resync = True
+            self._cond.notify()
+
+    def read_commands(self) -> Iterator[Any]:
+        while True:
+            header = self._read_exact(FRAME_HEADER.size)
+            if header is None:
+                return
+            (size,) = FRAME_HEADER.unpack(header)
+            if size > MAX_FRAME_SIZE:
+                raise ValueError(f"Bridge frame too large: {size} bytes")
+            body = self._read_exact(size)
+            if body is None:
+                return
+            decoded = self.codec.decode(body)
+            yield from decoded if isinstance(decoded, list) else [decoded]
+
+    def close(self, timeout: float = 1.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._needs_resync and not self._closed:
+                    self._cond.wait()
+                if not self._pending and not self._needs_resync:
+                    return
+                batch, self._pending = self._pending, []
+                needs_resync, self._needs_resync = self._needs_resync, False
+            if needs_resync and self.resync is not None:
+                # The full state already covers any delta queued before it was taken.
+                batch = [self.resync()] + [item for item in batch if item.get("type") != "state_delta"]
+            try:
+                self._write_frame(self.codec.encode(batch))
+            except (OSError, ValueError):
+                # Electron closed the pipe; the input loop sees EOF and stops the bridge.
+                return
+
+    def _write_frame(self, body: bytes) -> None:
+        self._write_all(FRAME_HEADER.pack(len(body)) + body)
+        self.frames += 1
+
+    def _write_all(self, payload: bytes) -> None:
+        data = memoryview(payload)
+        while data:
+            # Unbuffered (-u) stdout is a raw file and may accept only part of a large write.
+            written = self._stdout.write(data)
+            data = data[written or 0 :]
+        self._stdout.flush()
+
+    def _read_exact(self, size: int) -> bytes | None:
+        chunks: list[bytes] = []
+        remaining = size
+        while remaining > 0:
+            chunk = self._stdin.read(remaining)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+def open_transport(environ: Mapping[str, str] = os.environ) -> LineTransport | FramedTransport:
+    codec = negotiate(environ)
+    if codec is None:
+        return LineTransport()
+    return FramedTransport(codec)
@@ -1,4 +1,4 @@
-import type { AppState, ChannelKey, UiSettings } from "./types";
+import type { AppState, ChannelKey, StatePatchOp, UiSettings } from "./types";
 
 const DEFAULT_CHANNELS: ChannelKey[] = ["master", "game", "chatRender", "media", "aux", "chatCapture"];
 
@@ -14,9 +14,11 @@ export const DEFAULT_STATE: AppState = {
   bluetooth: null,
   chat_mix_balance: null,
   oled_brightness: null,
+  active_usb_input: null,
   channel_volume: {},
   channel_mute: {},
   channel_preset: {},
+  channel_preset_name: {},
   channel_apps: {},
   updated_at: null,
 };
@@ -64,6 +66,10 @@ export function mergeState(partial?: Partial<AppState>): AppState {
       ...DEFAULT_STATE.channel_preset,
       ...(partial?.channel_preset ?? {}),
     },
+    channel_preset_name: {
+      ...DEFAULT_STATE.channel_preset_name,
+      ...(partial?.channel_preset_name ?? {}),
+    },
     channel_apps: {
       ...DEFAULT_STATE.channel_apps,
       ...(partial?.channel_apps ?? {}),
@@ -71,6 +77,43 @@ export function mergeState(partial?: Partial<AppState>): AppState {
   };
 }
 
+/**
+ * Apply backend state deltas without rebuilding the whole state: only the
+ * top-level fields and channel maps named in `ops` get new objects, so
+ * unchanged slices keep their identity for React and change detection.
+ */
+export function applyStatePatch(state: AppState, ops: StatePatchOp[]): AppState {
+  const next: Record<string, unknown> = { ...state };
+  const copied = new Set<string>();
+  for (const op of ops) {
+    const [key, subKey] = op.path.split("/").slice(1).map(unescapePointer);
+    if (subKey === undefined) {
+      if (op.op === "remove") {
+        next[key] = (DEFAULT_STATE as unknown as Record<string, unknown>)[key] ?? null;
+      } else {
+        next[key] = op.value;
+      }
+      copied.add(key);
+      continue;
+    }
+    if (!copied.has(key)) {
+      next[key] = { ...((next[key] as Record<string, unknown> | null) ?? {}) };
+      copied.add(key);
+    }
+    const target = next[key] as Record<string, unknown>;
+    if (op.op === "remove") {
+      delete target[subKey];
+    } else {
+      target[subKey] = op.value;
+    }
+  }
+  return next as unknown as AppState;
+}
+
+function unescapePointer(token: string): string {
+  return token.replace(/~1/g, "/").replace(/~0/g, "~");
+}
+
 export function mergeSettings(partial?: Partial<UiSettings>): UiSettings {
   const visibleChannels =
     partial?.visibleChannels?.filter((channel): channel is ChannelKey => DEFAULT_CHANNELS.includes(channel)) ??
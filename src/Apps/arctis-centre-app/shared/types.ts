@@ -33,9 +33,11 @@ export interface AppState {
   bluetooth: boolean | null;
   chat_mix_balance: number | null;
   oled_brightness: number | null;
+  active_usb_input: string | null;
   channel_volume: Partial<Record<ChannelKey, number>>;
   channel_mute: Partial<Record<ChannelKey, boolean>>;
   channel_preset: Partial<Record<ChannelKey, string | null>>;
+  channel_preset_name: Partial<Record<ChannelKey, string | null>>;
   channel_apps: Partial<Record<ChannelKey, string[]>>;
   updated_at: string | null;
 }
@@ -56,9 +58,29 @@ export interface UiSettings {
   notifications: Record<NotificationKey, boolean>;
 }
 
+/** JSON-patch style operation on AppState, e.g. `{ op: "replace", path: "/channel_volume/game", value: 40 }`. */
+export interface StatePatchOp {
+  op: "add" | "replace" | "remove";
+  path: string;
+  value?: unknown;
+}
+
+export interface StateDelta {
+  seq: number;
+  base: number;
+  ops: StatePatchOp[];
+}
+
 export interface BackendCommand {
-  name: "set_channel_volume" | "set_channel_mute" | "set_preset";
+  name: "set_channel_volume" | "set_channel_mute" | "set_preset" | "resync" | "visibility";
   payload: Record<string, unknown>;
+  // Set by BackendBridge.request(); the bridge answers with one CommandResult carrying the same id.
+  id?: number;
+}
+
+export interface CommandResult {
+  status: "succeeded" | "failed" | "superseded";
+  detail: string;
 }
 
 export interface PresetMap {
@@ -0,0 +1,72 @@
+import assert from "node:assert/strict";
+import { readFileSync } from "node:fs";
+import { join } from "node:path";
+import { test } from "node:test";
+import { decodeMsgpack, encodeMsgpack } from "../electron/services/msgpack.js";
+
+// Compiled to .test-build/tests/, so the fixtures live two levels up.
+const fixture = JSON.parse(
+  readFileSync(join(__dirname, "..", "..", "tests", "fixtures", "msgpack_batch.json"), "utf-8"),
+) as { value: unknown; python: string; electron: string };
+
+function hex(bytes: Uint8Array): string {
+  return Buffer.from(bytes).toString("hex");
+}
+
+function fromHex(value: string): Uint8Array {
+  return new Uint8Array(Buffer.from(value, "hex"));
+}
+
+test("encodes the cross-language fixture byte for byte", () => {
+  assert.equal(hex(encodeMsgpack(fixture.value)), fixture.electron);
+});
+
+test("decodes frames written by msgpack-python", () => {
+  assert.deepEqual(decodeMsgpack(fromHex(fixture.python)), fixture.value);
+});
+
+test("round-trips every size class", () => {
+  const values: unknown[] = [
+    null,
+    true,
+    false,
+    0,
+    127,
+    128,
+    -32,
+    -33,
+    255,
+    -129,
+    65536,
+    -2147483649,
+    2 ** 40,
+    0.5,
+    -1.25e-7,
+    "",
+    "é🎧",
+    "x".repeat(31),
+    "x".repeat(32),
+    "x".repeat(256),
+    "x".repeat(70000),
+    Array.from({ length: 16 }, (_, i) => i),
+    Array.from({ length: 70000 }, (_, i) => i % 3),
+    Object.fromEntries(Array.from({ length: 16 }, (_, i) => [`k${i}`, i])),
+    { nested: { list: [1, "two", null, { deep: [] }] } },
+  ];
+  for (const value of values) {
+    assert.deepEqual(decodeMsgpack(encodeMsgpack(value)), value);
+  }
+});
+
+test("leaves out undefined object fields like JSON", () => {
+  assert.deepEqual(decodeMsgpack(encodeMsgpack({ a: 1, b: undefined })), { a: 1 });
+});
+
+test("decodes binary and rejects truncated or trailing input", () => {
+  const bytes = new Uint8Array([1, 2, 3]);
+  assert.deepEqual(decodeMsgpack(encodeMsgpack(bytes)), bytes);
+  const encoded = encodeMsgpack({ type: "state", seq: 1 });
+  assert.throws(() => decodeMsgpack(encoded.subarray(0, encoded.length - 1)), /Truncated/);
+  assert.throws(() => decodeMsgpack(new Uint8Array([...encoded, 0xc0])), /Trailing/);
+  assert.throws(() => decodeMsgpack(new Uint8Array([0xc1])), /Unsupported/);
+});
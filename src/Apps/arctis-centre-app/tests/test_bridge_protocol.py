@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import bridge_protocol as protocol
+from bridge_protocol import FRAME_HEADER, FramedTransport, LineTransport, available_codecs, negotiate
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+JSON = available_codecs()["json"]
+
+
+class _TrickleSink:
+    """Raw-file stand-in that accepts at most `chunk` bytes per write, like a full pipe."""
+
+    def __init__(self, chunk: int = 7) -> None:
+        self.chunk = chunk
+        self.data = bytearray()
+
+    def write(self, data) -> int:
+        taken = bytes(data[: self.chunk])
+        self.data += taken
+        return len(taken)
+
+    def flush(self) -> None:
+        pass
+
+
+class _TrickleSource:
+    """Readable that returns at most `chunk` bytes per read, like a pipe mid-frame."""
+
+    def __init__(self, data: bytes, chunk: int = 3) -> None:
+        self._stream = io.BytesIO(data)
+        self.chunk = chunk
+
+    def read(self, size: int) -> bytes:
+        return self._stream.read(min(size, self.chunk))
+
+
+def _frame(codec, value) -> bytes:
+    body = codec.encode(value)
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def _split_output(codec, data: bytes) -> tuple[dict, list]:
+    hello, _, rest = bytes(data).partition(b"\n")
+    frames = []
+    while rest:
+        (size,) = FRAME_HEADER.unpack_from(rest)
+        frames.append(codec.decode(rest[FRAME_HEADER.size : FRAME_HEADER.size + size]))
+        rest = rest[FRAME_HEADER.size + size :]
+    return json.loads(hello), frames
+
+
+def test_negotiate_prefers_client_codec_order_and_falls_back_to_json():
+    assert negotiate({}) is None
+    assert negotiate({protocol.PROTOCOL_ENV: "lines"}) is None
+    assert negotiate({protocol.PROTOCOL_ENV: "Framed"}).name == "json"
+    assert negotiate({protocol.PROTOCOL_ENV: "framed", protocol.CODECS_ENV: "cbor, JSON"}).name == "json"
+    preferred = negotiate({protocol.PROTOCOL_ENV: "framed", protocol.CODECS_ENV: "msgpack,json"})
+    assert preferred.name == ("msgpack" if protocol.msgpack is not None else "json")
+
+
+def test_line_transport_round_trip():
+    stdout = io.StringIO()
+    transport = LineTransport(io.StringIO('{"id":1,"name":"refresh"}\n\n{"id":2}\n'), stdout)
+    transport.send({"type": "status", "payload": "ok"})
+    assert stdout.getvalue() == '{"type":"status","payload":"ok"}\n'
+    assert list(transport.read_commands()) == [{"id": 1, "name": "refresh"}, {"id": 2}]
+
+
+def test_framed_transport_batches_messages_through_partial_writes():
+    sink = _TrickleSink()
+    transport = FramedTransport(JSON, stdin=io.BytesIO(), stdout=sink)
+    # Queued before the writer starts, so all three go out as one frame.
+    messages = [{"type": "state_delta", "seq": seq, "payload": {"game": seq}} for seq in range(3)]
+    for message in messages:
+        transport.send(message)
+    transport.start()
+    transport.close()
+    hello, frames = _split_output(JSON, sink.data)
+    assert hello == {"type": "hello", "payload": {"protocol": "framed", "codec": "json"}}
+    assert frames == [messages]
+    assert transport.frames == 1
+
+
+def test_framed_transport_reads_split_frames_and_command_lists():
+    data = _frame(JSON, {"id": 1, "name": "refresh"}) + _frame(JSON, [{"id": 2}, {"id": 3}])
+    transport = FramedTransport(JSON, stdin=_TrickleSource(data), stdout=_TrickleSink())
+    assert [command["id"] for command in transport.read_commands()] == [1, 2, 3]
+
+    # EOF part-way through a frame ends the stream instead of yielding half a command.
+    truncated = FramedTransport(JSON, stdin=_TrickleSource(data[:-2]), stdout=_TrickleSink())
+    assert [command["id"] for command in truncated.read_commands()] == [1]
+
+
+def test_framed_transport_rejects_oversize_frames():
+    header = FRAME_HEADER.pack(protocol.MAX_FRAME_SIZE + 1)
+    transport = FramedTransport(JSON, stdin=io.BytesIO(header + b"x"), stdout=_TrickleSink())
+    with pytest.raises(ValueError, match="too large"):
+        list(transport.read_commands())
+
+
+def test_framed_transport_sheds_state_for_one_resync_when_reader_lags():
+    sink = _TrickleSink(chunk=1 << 20)
+    transport = FramedTransport(JSON, stdin=io.BytesIO(), stdout=sink, max_pending=3)
+    transport.resync = lambda: {"type": "state", "seq": 9, "payload": {"game": 9}}
+    transport.send({"type": "state", "seq": 1, "payload": {}})
+    transport.send({"type": "result", "id": 7, "payload": {"status": "succeeded"}})
+    for seq in range(2, 6):
+        transport.send({"type": "state_delta", "seq": seq, "payload": {"game": seq}})
+    transport.start()
+    transport.close()
+    _, frames = _split_output(JSON, sink.data)
+    # Command results are never dropped; the queued state updates become one full state.
+    assert frames == [[transport.resync(), {"type": "result", "id": 7, "payload": {"status": "succeeded"}}]]
+    # Shed on overflow (state and deltas 2-3); deltas 4-5 arrived later and are folded into the resync.
+    assert transport.shed == 3
+
+
+def test_msgpack_codec_matches_the_cross_language_fixture():
+    pytest.importorskip("msgpack")
+    codec = available_codecs()["msgpack"]
+    fixture = json.loads((FIXTURES / "msgpack_batch.json").read_text(encoding="utf-8"))
+    assert codec.encode(fixture["value"]) == bytes.fromhex(fixture["python"])
+    # Bytes written by electron/services/msgpack.ts decode to the same messages.
+    assert codec.decode(bytes.fromhex(fixture["electron"])) == fixture["value"]
+    assert codec.decode(codec.encode(fixture["value"])) == fixture["value"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+# Finished actions kept for `/actions/{id}` lookups before the oldest are forgotten.
+ACTION_HISTORY = 256
+
+
+@dataclass
+class ActionRecord:
+    id: str
+    action: str
+    channel: str
+    status: str = "queued"
+    detail: str = ""
+    superseded_by: str | None = None
+    key: Hashable | None = field(default=None, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "action": self.action,
+            "channel": self.channel,
+            "status": self.status,
+            "detail": self.detail,
+            "superseded_by": self.superseded_by,
+        }
+
+
+class ActionTracker:
+    """
+    Status of UI actions queued on the runtime's command executor.
+
+    An action moves from `queued` to `running` and then `succeeded` or
+    `failed`. A queued action with the same coalescing key as a newer one is
+    `superseded`: the executor drops it and only the newer value is written.
+    """
+
+    def __init__(self, history: int = ACTION_HISTORY) -> None:
+        self._history = history
+        self._lock = threading.Lock()
+        self._records: OrderedDict[str, ActionRecord] = OrderedDict()
+        self._queued: dict[Hashable, ActionRecord] = {}
+
+    def create(self, action: str, channel: str, key: Hashable | None) -> tuple[ActionRecord, ActionRecord | None]:
+        """Register a queued action; also returns the queued action it superseded, if any."""
+        record = ActionRecord(id=uuid.uuid4().hex, action=action, channel=channel, key=key)
+        superseded: ActionRecord | None = None
+        with self._lock:
+            if key is not None:
+                previous = self._queued.get(key)
+                if previous is not None and previous.status == "queued":
+                    previous.status = "superseded"
+                    previous.superseded_by = record.id
+                    superseded = previous
+                self._queued[key] = record
+            self._records[record.id] = record
+            while len(self._records) > self._history:
+                self._records.popitem(last=False)
+        return record, superseded
+
+    def start(self, record: ActionRecord) -> bool:
+        """Mark `record` running; False when it was superseded and must not run."""
+        with self._lock:
+            if record.status != "queued":
+                return False
+            record.status = "running"
+            if record.key is not None and self._queued.get(record.key) is record:
+                del self._queued[record.key]
+            return True
+
+    def finish(self, record: ActionRecord, status: str, detail: str = "") -> None:
+        with self._lock:
+            record.status = status
+            record.detail = detail
+
+    def describe(self, record: ActionRecord) -> dict[str, Any]:
+        with self._lock:
+            return record.to_dict()
+
+    def get(self, action_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            record = self._records.get(action_id)
+            return record.to_dict() if record is not None else None
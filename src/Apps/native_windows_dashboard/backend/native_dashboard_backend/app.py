@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Callable
 
-from .models import ChannelMuteRequest, ChannelPresetRequest, ChannelVolumeRequest, ServiceStatus
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from .models import ActionStatus, ChannelMuteRequest, ChannelPresetRequest, ChannelVolumeRequest, ServiceStatus
 from .runtime import CHANNELS, DashboardRuntime
+from .streaming import KEEPALIVE_INTERVAL, format_sse
 
 
 def create_app(runtime: DashboardRuntime | None = None) -> FastAPI:
@@ -20,36 +26,111 @@ def create_app(runtime: DashboardRuntime | None = None) -> FastAPI:
 
     @app.get("/health", response_model=ServiceStatus)
     def health() -> ServiceStatus:
-        state = app_runtime.get_state()
+        state = app_runtime.get_snapshot().state
         return ServiceStatus(ok=state.get("status") == "running", detail=state.get("last_error", ""))
 
     @app.get("/state")
-    def get_state() -> dict:
-        return app_runtime.get_state()
+    async def get_state(request: Request) -> Response:
+        snapshot = app_runtime.get_snapshot()
+        headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=snapshot.json, media_type="application/json", headers=headers)
+
+    @app.get("/events")
+    async def stream_events(request: Request) -> StreamingResponse:
+        subscription = app_runtime.events.subscribe()
+
+        async def stream() -> AsyncIterator[str]:
+            try:
+                while not await request.is_disconnected():
+                    try:
+                        message = await asyncio.wait_for(subscription.get(), timeout=KEEPALIVE_INTERVAL)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield format_sse(message)
+            finally:
+                app_runtime.events.unsubscribe(subscription)
+
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+    @app.websocket("/ws")
+    async def stream_websocket(websocket: WebSocket) -> None:
+        await websocket.accept()
+        subscription = app_runtime.events.subscribe()
+        closed = asyncio.ensure_future(_wait_closed(websocket))
+        try:
+            while True:
+                message = asyncio.ensure_future(subscription.get())
+                await asyncio.wait((message, closed), return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    message.cancel()
+                    break
+                await websocket.send_text(message.result().data)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # Runs on any exit, including send errors and cancellation, so no subscription outlives its socket.
+            closed.cancel()
+            app_runtime.events.unsubscribe(subscription)
 
     @app.get("/presets")
     def get_presets() -> dict:
         return app_runtime.get_presets()
 
-    @app.post("/actions/channel-volume", response_model=ServiceStatus)
-    def set_channel_volume(body: ChannelVolumeRequest) -> ServiceStatus:
-        if body.channel not in CHANNELS:
-            raise HTTPException(status_code=400, detail=f"Unsupported channel: {body.channel}")
-        app_runtime.set_channel_volume(body.channel, body.value)
-        return ServiceStatus(ok=True, detail="volume updated")
-
-    @app.post("/actions/channel-mute", response_model=ServiceStatus)
-    def set_channel_mute(body: ChannelMuteRequest) -> ServiceStatus:
-        if body.channel not in CHANNELS:
-            raise HTTPException(status_code=400, detail=f"Unsupported channel: {body.channel}")
-        app_runtime.set_channel_mute(body.channel, body.muted)
-        return ServiceStatus(ok=True, detail="mute updated")
-
-    @app.post("/actions/channel-preset", response_model=ServiceStatus)
-    def set_channel_preset(body: ChannelPresetRequest) -> ServiceStatus:
-        if body.channel not in CHANNELS:
-            raise HTTPException(status_code=400, detail=f"Unsupported channel: {body.channel}")
-        app_runtime.set_channel_preset(body.channel, body.preset_id)
-        return ServiceStatus(ok=True, detail="preset updated")
+    # Actions only queue work on the runtime's engine thread, so they answer 202 without a threadpool worker.
+    @app.post("/actions/channel-volume", response_model=ActionStatus, status_code=202)
+    async def set_channel_volume(body: ChannelVolumeRequest, response: Response) -> dict:
+        _require_channel(body.channel)
+        return _accepted(response, lambda: app_runtime.set_channel_volume(body.channel, body.value))
+
+    @app.post("/actions/channel-mute", response_model=ActionStatus, status_code=202)
+    async def set_channel_mute(body: ChannelMuteRequest, response: Response) -> dict:
+        _require_channel(body.channel)
+        return _accepted(response, lambda: app_runtime.set_channel_mute(body.channel, body.muted))
+
+    @app.post("/actions/channel-preset", response_model=ActionStatus, status_code=202)
+    async def set_channel_preset(body: ChannelPresetRequest, response: Response) -> dict:
+        _require_channel(body.channel)
+        return _accepted(response, lambda: app_runtime.set_channel_preset(body.channel, body.preset_id))
+
+    @app.get("/actions/{action_id}", response_model=ActionStatus)
+    async def get_action(action_id: str) -> dict:
+        action = app_runtime.get_action(action_id)
+        if action is None:
+            raise HTTPException(status_code=404, detail=f"Unknown action: {action_id}")
+        return action
 
     return app
+
+
+def _require_channel(channel: str) -> None:
+    if channel not in CHANNELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported channel: {channel}")
+
+
+def _accepted(response: Response, submit: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    try:
+        action = submit()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from None
+    response.headers["Location"] = f"/actions/{action['id']}"
+    return action
+
+
+async def _wait_closed(websocket: WebSocket) -> None:
+    # Clients only listen; reading their frames is how a close is noticed while the stream is idle.
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires.
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
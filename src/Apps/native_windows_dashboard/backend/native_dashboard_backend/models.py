@@ -21,3 +21,12 @@ class ChannelPresetRequest(BaseModel):
 class ServiceStatus(BaseModel):
     ok: bool
     detail: str = ""
+
+
+class ActionStatus(BaseModel):
+    id: str
+    action: str
+    channel: str
+    status: str
+    detail: str = ""
+    superseded_by: str | None = None
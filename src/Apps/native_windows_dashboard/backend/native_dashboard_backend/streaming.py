@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import threading
+from typing import Any, Callable
+
+from arctis_nova_api.models import event_details
+
+# Messages a client may fall behind by before its backlog is replaced with a resync.
+DEFAULT_QUEUE_SIZE = 64
+# Seconds between SSE keep-alive comments on an idle stream.
+KEEPALIVE_INTERVAL = 15.0
+
+
+@dataclasses.dataclass(frozen=True)
+class StreamMessage:
+    type: str
+    data: str
+
+
+class Subscription:
+    """
+    One connected push client: a bounded queue owned by the client's event loop.
+
+    Messages are offered from the runtime thread through `call_soon_threadsafe`.
+    When the queue is full the client is too slow to follow deltas, so its
+    backlog is dropped and replaced by a single full-state resync message;
+    HID events in the dropped backlog are lost, state never is.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        resync: Callable[[], StreamMessage],
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self._loop = loop
+        self._resync = resync
+        self._queue: asyncio.Queue[StreamMessage] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    async def get(self) -> StreamMessage:
+        return await self._queue.get()
+
+    def offer(self, message: StreamMessage) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The client's loop has shut down; the endpoint will unsubscribe it.
+            pass
+
+    def _put(self, message: StreamMessage) -> None:
+        if not self._queue.full():
+            self._queue.put_nowait(message)
+            return
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(self._resync())
+
+
+class EventHub:
+    """
+    Fan-out of runtime messages to SSE and WebSocket clients.
+
+    Each message is serialised once in `publish` and shared by every
+    subscriber. New subscribers start with a full-state message so they can
+    apply the `state_delta` messages that follow by `seq`.
+    """
+
+    def __init__(self, resync: Callable[[], StreamMessage], queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self._resync = resync
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: list[Subscription] = []
+
+    def subscribe(self) -> Subscription:
+        """Register a client on the running event loop; call from that loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self._resync, self._queue_size)
+        with self._lock:
+            subscription._put(self._resync())
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, message_type: str, payload: dict[str, Any]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        if not subscriptions:
+            return
+        message = make_message(message_type, payload)
+        for subscription in subscriptions:
+            subscription.offer(message)
+
+
+def make_message(message_type: str, payload: dict[str, Any]) -> StreamMessage:
+    data = json.dumps({"type": message_type, **payload}, separators=(",", ":"), default=dict)
+    return StreamMessage(message_type, data)
+
+
+def event_payload(event: object) -> dict[str, Any]:
+    """Describe a decoded HID event as JSON-ready fields, e.g. {"event": "VolumeKnobEvent", "volume": 28}."""
+    payload: dict[str, Any] = {"event": type(event).__name__}
+    if dataclasses.is_dataclass(event):
+        payload.update(event_details(event))
+    return payload
+
+
+def format_sse(message: StreamMessage) -> str:
+    return f"event: {message.type}\ndata: {message.data}\n\n"
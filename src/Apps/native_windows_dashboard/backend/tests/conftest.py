@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+API_SRC = BACKEND_DIR.parents[2] / "APIs" / "arctis_nova_api" / "src"
+for path in (BACKEND_DIR, API_SRC):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
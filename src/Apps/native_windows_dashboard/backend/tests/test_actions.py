@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from native_dashboard_backend.actions import ActionTracker
+
+
+def test_newer_action_with_same_key_supersedes_queued_one():
+    tracker = ActionTracker()
+    first, superseded = tracker.create("channel-volume", "game", key=("volume", "game"))
+    assert superseded is None
+    second, superseded = tracker.create("channel-volume", "game", key=("volume", "game"))
+    assert superseded is first
+    assert tracker.get(first.id)["status"] == "superseded"
+    assert tracker.get(first.id)["superseded_by"] == second.id
+
+    # The executor drops the superseded command and runs the newer one.
+    assert tracker.start(first) is False
+    assert tracker.start(second) is True
+    tracker.finish(second, "succeeded", "game=40")
+    assert tracker.get(second.id) == {
+        "id": second.id,
+        "action": "channel-volume",
+        "channel": "game",
+        "status": "succeeded",
+        "detail": "game=40",
+        "superseded_by": None,
+    }
+
+
+def test_running_or_unkeyed_actions_are_never_superseded():
+    tracker = ActionTracker()
+    running, _ = tracker.create("channel-volume", "game", key=("volume", "game"))
+    assert tracker.start(running)
+    # Once running, the write is under way; a newer value queues behind it instead.
+    _, superseded = tracker.create("channel-volume", "game", key=("volume", "game"))
+    assert superseded is None
+    assert tracker.get(running.id)["status"] == "running"
+
+    first, _ = tracker.create("channel-preset", "game", key=None)
+    _, superseded = tracker.create("channel-preset", "game", key=None)
+    assert superseded is None
+    assert tracker.start(first)
+
+
+def test_other_channels_do_not_supersede_each_other():
+    tracker = ActionTracker()
+    game, _ = tracker.create("channel-mute", "game", key=("mute", "game"))
+    _, superseded = tracker.create("channel-mute", "media", key=("mute", "media"))
+    assert superseded is None
+    assert tracker.describe(game)["status"] == "queued"
+
+
+def test_history_forgets_oldest_actions():
+    tracker = ActionTracker(history=2)
+    records = [tracker.create("channel-volume", "game", key=None)[0] for _ in range(3)]
+    assert tracker.get(records[0].id) is None
+    assert [tracker.get(record.id)["id"] for record in records[1:]] == [record.id for record in records[1:]]
+    assert tracker.get("unknown") is None
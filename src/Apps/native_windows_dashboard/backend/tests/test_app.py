@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from arctis_nova_api.state_store import StateSnapshot  # noqa: E402
+from native_dashboard_backend.actions import ActionTracker  # noqa: E402
+from native_dashboard_backend.app import _etag_matches, create_app  # noqa: E402
+from native_dashboard_backend.streaming import EventHub, make_message  # noqa: E402
+
+
+class _FakeRuntime:
+    def __init__(self):
+        self.snapshot = StateSnapshot(seq=3, epoch="abc", state={"status": "running", "last_error": ""})
+        self.actions = ActionTracker()
+        self.events = EventHub(lambda: make_message("state", {"seq": self.snapshot.seq}))
+        self.running = True
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def get_snapshot(self):
+        return self.snapshot
+
+    def get_presets(self):
+        return {}
+
+    def set_channel_volume(self, channel, value):
+        if not self.running:
+            raise RuntimeError("Backend service is not running (status: starting).")
+        record, _ = self.actions.create("channel-volume", channel, ("channel-volume", channel))
+        return self.actions.describe(record)
+
+    def get_action(self, action_id):
+        return self.actions.get(action_id)
+
+
+@pytest.fixture
+def runtime():
+    return _FakeRuntime()
+
+
+@pytest.fixture
+def client(runtime):
+    return TestClient(create_app(runtime))
+
+
+def test_etag_matches_weak_lists_and_wildcard():
+    etag = '"abc-3"'
+    assert _etag_matches('"abc-3"', etag)
+    assert _etag_matches('W/"abc-3"', etag)
+    assert _etag_matches('"abc-2", W/"abc-3"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"abc-2"', etag)
+    assert not _etag_matches("", etag)
+    assert not _etag_matches(None, etag)
+
+
+def test_state_answers_304_for_current_etag(client, runtime):
+    response = client.get("/state")
+    assert response.status_code == 200
+    assert response.headers["etag"] == runtime.snapshot.etag
+    assert response.json()["status"] == "running"
+
+    cached = client.get("/state", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    runtime.snapshot = StateSnapshot(seq=4, epoch="abc", state={"status": "running"})
+    assert client.get("/state", headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+
+
+def test_actions_answer_202_with_location_and_status_lookup(client):
+    response = client.post("/actions/channel-volume", json={"channel": "game", "value": 40})
+    assert response.status_code == 202
+    action = response.json()
+    assert action["status"] == "queued"
+    assert response.headers["location"] == f"/actions/{action['id']}"
+
+    lookup = client.get(response.headers["location"])
+    assert lookup.status_code == 200
+    assert lookup.json()["id"] == action["id"]
+
+    newer = client.post("/actions/channel-volume", json={"channel": "game", "value": 50}).json()
+    assert client.get(f"/actions/{action['id']}").json()["superseded_by"] == newer["id"]
+
+
+def test_action_errors_map_to_http_status(client, runtime):
+    assert client.get("/actions/unknown").status_code == 404
+    assert client.post("/actions/channel-volume", json={"channel": "bogus", "value": 40}).status_code == 400
+    runtime.running = False
+    assert client.post("/actions/channel-volume", json={"channel": "game", "value": 40}).status_code == 503
+
+
+def test_websocket_sends_state_first_and_unsubscribes_on_close(client, runtime):
+    with client.websocket_connect("/ws") as websocket:
+        assert websocket.receive_json() == {"type": "state", "seq": 3}
+        assert len(runtime.events._subscriptions) == 1
+    assert runtime.events._subscriptions == []
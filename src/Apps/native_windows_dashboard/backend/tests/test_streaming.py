@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+from arctis_nova_api.models import AncMode, AncStatus, BatteryStatus, VolumeKnobEvent
+from native_dashboard_backend.streaming import (
+    EventHub,
+    StreamMessage,
+    Subscription,
+    event_payload,
+    format_sse,
+    make_message,
+)
+
+
+def _hub(queue_size: int = 8) -> EventHub:
+    resyncs = iter(range(1000))
+    return EventHub(lambda: make_message("state", {"seq": next(resyncs)}), queue_size=queue_size)
+
+
+def _drain(subscription: Subscription) -> list[dict]:
+    messages = []
+    while not subscription._queue.empty():
+        messages.append(json.loads(subscription._queue.get_nowait().data))
+    return messages
+
+
+def test_subscribers_start_with_state_and_share_published_messages():
+    async def scenario():
+        hub = _hub()
+        first, second = hub.subscribe(), hub.subscribe()
+        assert [message["type"] for message in _drain(first)] == ["state"]
+        _drain(second)
+
+        hub.publish("state_delta", {"seq": 7, "changes": {"game": 40}})
+        await asyncio.sleep(0)
+        a, b = await first.get(), await second.get()
+        # Serialised once and shared by every subscriber.
+        assert a is b
+        assert json.loads(a.data) == {"type": "state_delta", "seq": 7, "changes": {"game": 40}}
+
+        hub.unsubscribe(second)
+        hub.unsubscribe(second)
+        hub.publish("action", {"id": "x"})
+        await asyncio.sleep(0)
+        assert [message["type"] for message in _drain(first)] == ["action"]
+        assert _drain(second) == []
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drops_backlog_for_one_resync():
+    async def scenario():
+        hub = _hub(queue_size=3)
+        slow, fast = hub.subscribe(), hub.subscribe()
+        _drain(fast)
+        received = []
+        for seq in range(5):
+            hub.publish("state_delta", {"seq": seq})
+            await asyncio.sleep(0)
+            received.extend(_drain(fast))
+
+        # Delta 2 found the slow queue full (initial state, deltas 0 and 1): that backlog became one resync.
+        backlog = _drain(slow)
+        assert [(message["type"], message["seq"]) for message in backlog] == [
+            ("state", 2),
+            ("state_delta", 3),
+            ("state_delta", 4),
+        ]
+        assert slow.dropped == 3
+        # A slow subscriber never holds back the others.
+        assert [message["seq"] for message in received] == [0, 1, 2, 3, 4]
+        assert fast.dropped == 0
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_another_thread_reaches_the_loop():
+    async def scenario():
+        hub = _hub()
+        subscription = hub.subscribe()
+        _drain(subscription)
+        thread = threading.Thread(target=hub.publish, args=("event", {"event": "MicStatus", "enabled": True}))
+        thread.start()
+        message = await asyncio.wait_for(subscription.get(), timeout=1.0)
+        thread.join()
+        return message
+
+    message = asyncio.run(scenario())
+    assert message.type == "event"
+    assert json.loads(message.data) == {"type": "event", "event": "MicStatus", "enabled": True}
+
+
+def test_offer_after_loop_closed_is_ignored():
+    async def scenario():
+        return _hub().subscribe()
+
+    subscription = asyncio.run(scenario())
+    subscription.offer(make_message("action", {}))
+
+
+def test_event_payload_and_sse_format():
+    assert event_payload(VolumeKnobEvent(volume=28)) == {"event": "VolumeKnobEvent", "volume": 28}
+    assert event_payload(BatteryStatus(headset=4, charging=8)) == {"event": "BatteryStatus", "headset": 4, "charging": 8}
+    assert event_payload(AncStatus(mode=AncMode.TRANSPARENCY)) == {
+        "event": "AncStatus",
+        "mode": "transparency",
+    }
+    assert event_payload(object()) == {"event": "object"}
+    assert format_sse(StreamMessage("state_delta", '{"seq":1}')) == 'event: state_delta\ndata: {"seq":1}\n\n'
@@ -19,8 +19,11 @@ public partial class MainWindow : Window
     private readonly Dictionary<string, ChannelRow> _rows = new();
     private readonly CancellationTokenSource _cts = new();
     private readonly DispatcherTimer _pollTimer;
+    private static readonly TimeSpan FastPollInterval = TimeSpan.FromMilliseconds(250);
+    private static readonly TimeSpan StreamPollInterval = TimeSpan.FromSeconds(2);
     private bool _suspendUpdates;
     private bool _refreshInProgress;
+    private bool _refreshPending;
     private int _presetTickCounter;
     private string _lastStateRenderKey = "";
     private string _lastPresetsRenderKey = "";
@@ -32,24 +35,17 @@ public partial class MainWindow : Window
         BuildRows();
         Loaded += OnLoaded;
         Closed += (_, _) => _cts.Cancel();
-        _pollTimer = new DispatcherTimer { Interval = TimeSpan.FromMilliseconds(250) };
+        _pollTimer = new DispatcherTimer { Interval = FastPollInterval };
         _pollTimer.Tick += async (_, _) =>
         {
+            // The timer is only a fallback; a refresh already under way covers this tick.
             if (_refreshInProgress) return;
-            _refreshInProgress = true;
-            try
-            {
-                await RefreshAsync();
-                _presetTickCounter++;
-                if (_presetTickCounter >= 8)
-                {
-                    _presetTickCounter = 0;
-                    await LoadPresetsAsync();
-                }
-            }
-            finally
+            await RequestRefreshAsync();
+            _presetTickCounter++;
+            if (_presetTickCounter >= 8)
             {
-                _refreshInProgress = false;
+                _presetTickCounter = 0;
+                await LoadPresetsAsync();
             }
         };
     }
@@ -68,6 +64,54 @@ public partial class MainWindow : Window
         MoveToBottomRight();
         await LoadPresetsAsync();
         _pollTimer.Start();
+        _ = ListenForEventsAsync();
+    }
+
+    private async Task ListenForEventsAsync()
+    {
+        // While the event stream is up, state is fetched when the backend reports a change and
+        // the poll timer only acts as a slow safety net; it returns to fast polling otherwise.
+        while (!_cts.IsCancellationRequested)
+        {
+            try
+            {
+                await _api.ListenForEventsAsync(OnBackendEventAsync, _cts.Token);
+            }
+            catch (OperationCanceledException)
+            {
+                return;
+            }
+            catch (Exception)
+            {
+                // Backend starting up or restarting; retry below.
+            }
+            _pollTimer.Interval = FastPollInterval;
+            try
+            {
+                await Task.Delay(TimeSpan.FromSeconds(2), _cts.Token);
+            }
+            catch (OperationCanceledException)
+            {
+                return;
+            }
+        }
+    }
+
+    private async Task OnBackendEventAsync(string eventType)
+    {
+        switch (eventType)
+        {
+            case "state":
+                _pollTimer.Interval = StreamPollInterval;
+                await RequestRefreshAsync();
+                break;
+            case "state_delta":
+                await RequestRefreshAsync();
+                break;
+            case "presets":
+                await LoadPresetsAsync();
+                break;
+        }
     }
 
     private async Task LoadPresetsAsync()
@@ -109,6 +153,31 @@ public partial class MainWindow : Window
         }
     }
 
+    // Timer and event refreshes share this guard, so only one GET /state is in flight: an older
+    // response can never render after a newer one or leave its stale ETag behind. Requests made
+    // meanwhile collapse into one more refresh once the current one finishes.
+    private async Task RequestRefreshAsync()
+    {
+        if (_refreshInProgress)
+        {
+            _refreshPending = true;
+            return;
+        }
+        _refreshInProgress = true;
+        try
+        {
+            do
+            {
+                _refreshPending = false;
+                await RefreshAsync();
+            } while (_refreshPending && !_cts.IsCancellationRequested);
+        }
+        finally
+        {
+            _refreshInProgress = false;
+        }
+    }
+
     private async Task RefreshAsync()
     {
         try
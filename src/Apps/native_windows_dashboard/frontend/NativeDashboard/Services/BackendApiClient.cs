@@ -1,4 +1,6 @@
+using System.Net;
 using System.Net.Http;
+using System.Net.Http.Headers;
 using System.Net.Http.Json;
 using NativeDashboard.Models;
 
@@ -7,6 +9,8 @@ namespace NativeDashboard.Services;
 public sealed class BackendApiClient
 {
     private readonly HttpClient _http;
+    private readonly HttpClient _stream;
+    private EntityTagHeaderValue? _stateETag;
 
     public BackendApiClient(string baseUrl)
     {
@@ -15,11 +19,49 @@ public sealed class BackendApiClient
             BaseAddress = new Uri(baseUrl),
             Timeout = TimeSpan.FromSeconds(8),
         };
+        _stream = new HttpClient
+        {
+            BaseAddress = new Uri(baseUrl),
+            Timeout = Timeout.InfiniteTimeSpan,
+        };
     }
 
+    /// <summary>
+    /// Reads the backend's server-sent event stream and reports each event type
+    /// ("state", "state_delta", "hid_event", "presets") until the stream ends.
+    /// </summary>
+    public async Task ListenForEventsAsync(Func<string, Task> onEvent, CancellationToken ct)
+    {
+        using var request = new HttpRequestMessage(HttpMethod.Get, "/events");
+        request.Headers.Accept.Add(new MediaTypeWithQualityHeaderValue("text/event-stream"));
+        using var resp = await _stream.SendAsync(request, HttpCompletionOption.ResponseHeadersRead, ct);
+        resp.EnsureSuccessStatusCode();
+        using var reader = new StreamReader(await resp.Content.ReadAsStreamAsync(ct));
+        while (await reader.ReadLineAsync(ct) is { } line)
+        {
+            if (line.StartsWith("event: ", StringComparison.Ordinal))
+            {
+                await onEvent(line["event: ".Length..]);
+            }
+        }
+    }
+
+    /// <summary>Returns null when the state has not changed since the previous call (HTTP 304).</summary>
     public async Task<DashboardState?> GetStateAsync(CancellationToken ct)
     {
-        return await _http.GetFromJsonAsync<DashboardState>("/state", ct);
+        using var request = new HttpRequestMessage(HttpMethod.Get, "/state");
+        if (_stateETag is not null)
+        {
+            request.Headers.IfNoneMatch.Add(_stateETag);
+        }
+        using var resp = await _http.SendAsync(request, ct);
+        if (resp.StatusCode == HttpStatusCode.NotModified)
+        {
+            return null;
+        }
+        resp.EnsureSuccessStatusCode();
+        _stateETag = resp.Headers.ETag;
+        return await resp.Content.ReadFromJsonAsync<DashboardState>(cancellationToken: ct);
     }
 
     public async Task<Dictionary<string, List<PresetItem>>> GetPresetsAsync(CancellationToken ct)
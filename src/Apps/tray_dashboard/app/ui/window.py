@@ -7,6 +7,8 @@ from typing import Any
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from arctis_nova_api import StateDelta, apply_state_patch
+
 from ..backend.service import HeadsetBackendService
 from ..constants import CHANNELS, SIDETONE_LABELS
 from ..models import WorkerCommand
@@ -27,6 +29,11 @@ class TrayDashboardWindow(QtWidgets.QWidget):
         self._updating_ui = False
         self._channel_edit_until: dict[str, float] = {channel: 0.0 for channel in CHANNELS}
         self._channel_widgets: dict[str, dict[str, Any]] = {}
+        self._state: dict[str, Any] = {}
+        self._state_seq: int | None = None
+        self._resync_requested = False
+        # Set when a locked channel skipped an update, so the next delta refreshes channels regardless.
+        self._channel_refresh_pending = False
 
         self._build_ui()
         self._build_backend()
@@ -187,7 +194,8 @@ class TrayDashboardWindow(QtWidgets.QWidget):
         self._service = HeadsetBackendService()
         self._service.moveToThread(self._thread)
         self._thread.started.connect(self._service.run)
-        self._service.state_updated.connect(self._apply_state)
+        self._service.state_resync.connect(self._on_state_resync)
+        self._service.state_delta.connect(self._on_state_delta)
         self._service.presets_loaded.connect(self._apply_presets)
         self._service.status.connect(self._set_status)
         self._service.error.connect(self._set_error)
@@ -249,33 +257,69 @@ class TrayDashboardWindow(QtWidgets.QWidget):
             self._updating_ui = False
 
     @QtCore.Slot(dict)
-    def _apply_state(self, state: dict[str, Any]) -> None:
+    def _on_state_resync(self, payload: dict[str, Any]) -> None:
+        self._state = payload["state"]
+        self._state_seq = payload["seq"]
+        self._resync_requested = False
+        self._apply_state(self._state)
+
+    @QtCore.Slot(dict)
+    def _on_state_delta(self, payload: dict[str, Any]) -> None:
+        delta = StateDelta(seq=payload["seq"], base=payload["base"], ops=tuple(payload["ops"]))
+        if self._state_seq is not None and delta.seq <= self._state_seq:
+            # Already covered by a full state sent after this delta was queued.
+            return
+        if self._state_seq is None or delta.base != self._state_seq:
+            # Missed a version: drop the delta and ask for one full state until it arrives.
+            if not self._resync_requested:
+                self._resync_requested = True
+                self._service.submit(WorkerCommand("resync", {}))
+            return
+        self._state = apply_state_patch(self._state, delta.ops)
+        self._state_seq = delta.seq
+        self._apply_state(self._state, set(delta.keys))
+
+    def _apply_state(self, state: dict[str, Any], changed: set[str] | None = None) -> None:
+        """Refresh widgets for the `changed` top-level keys, or all of them when None."""
+
+        def touched(*keys: str) -> bool:
+            return changed is None or not changed.isdisjoint(keys)
+
         self._updating_ui = True
         try:
-            headset_batt = int(state.get("headset_battery_percent") or 0)
-            base_batt = int(state.get("base_battery_percent") or 0)
-            self.battery_line.set_values(headset_batt, base_batt)
-            self.lbl_conn.setText(
-                f"connected={_yn(state.get('connected'))}  wireless={_yn(state.get('wireless'))}  bluetooth={_yn(state.get('bluetooth'))}"
-            )
-            sidetone = state.get("sidetone_level")
-            sidetone_label = SIDETONE_LABELS.get(int(sidetone), str(sidetone)) if sidetone is not None else "N/A"
-            self.lbl_modes.setText(
-                f"ANC: {state.get('anc_mode') or 'N/A'}  mute: {_yn(state.get('mic_mute'))}  sidetone: {sidetone_label}"
-            )
-            self.lbl_updated.setText(f"updated: {state.get('updated_at') or '--:--:--'}")
-            chat_mix = state.get("chat_mix_balance")
-            brightness = state.get("oled_brightness")
-            self.lbl_live.setText(
-                f"chat mix: {chat_mix if isinstance(chat_mix, int) else 'N/A'}%   OLED brightness: {brightness if isinstance(brightness, int) else 'N/A'}"
-            )
-            headset_volume = state.get("headset_volume_percent")
-            if isinstance(headset_volume, int):
-                self.pb_headset_volume.setValue(max(0, min(100, headset_volume)))
-                self.lbl_headset_volume.setText(f"Headset volume: {headset_volume}%")
-            else:
-                self.pb_headset_volume.setValue(0)
-                self.lbl_headset_volume.setText("Headset volume: N/A")
+            if touched("headset_battery_percent", "base_battery_percent"):
+                headset_batt = int(state.get("headset_battery_percent") or 0)
+                base_batt = int(state.get("base_battery_percent") or 0)
+                self.battery_line.set_values(headset_batt, base_batt)
+            if touched("connected", "wireless", "bluetooth"):
+                self.lbl_conn.setText(
+                    f"connected={_yn(state.get('connected'))}  wireless={_yn(state.get('wireless'))}  bluetooth={_yn(state.get('bluetooth'))}"
+                )
+            if touched("sidetone_level", "anc_mode", "mic_mute"):
+                sidetone = state.get("sidetone_level")
+                sidetone_label = SIDETONE_LABELS.get(int(sidetone), str(sidetone)) if sidetone is not None else "N/A"
+                self.lbl_modes.setText(
+                    f"ANC: {state.get('anc_mode') or 'N/A'}  mute: {_yn(state.get('mic_mute'))}  sidetone: {sidetone_label}"
+                )
+            if touched("updated_at"):
+                self.lbl_updated.setText(f"updated: {state.get('updated_at') or '--:--:--'}")
+            if touched("chat_mix_balance", "oled_brightness"):
+                chat_mix = state.get("chat_mix_balance")
+                brightness = state.get("oled_brightness")
+                self.lbl_live.setText(
+                    f"chat mix: {chat_mix if isinstance(chat_mix, int) else 'N/A'}%   OLED brightness: {brightness if isinstance(brightness, int) else 'N/A'}"
+                )
+            if touched("headset_volume_percent"):
+                headset_volume = state.get("headset_volume_percent")
+                if isinstance(headset_volume, int):
+                    self.pb_headset_volume.setValue(max(0, min(100, headset_volume)))
+                    self.lbl_headset_volume.setText(f"Headset volume: {headset_volume}%")
+                else:
+                    self.pb_headset_volume.setValue(0)
+                    self.lbl_headset_volume.setText("Headset volume: N/A")
+            if not (self._channel_refresh_pending or touched("channel_volume", "channel_mute", "channel_preset", "channel_apps")):
+                return
+            self._channel_refresh_pending = False
 
             channel_volume = state.get("channel_volume", {})
             channel_mute = state.get("channel_mute", {})
@@ -289,6 +333,8 @@ class TrayDashboardWindow(QtWidgets.QWidget):
                 preset: QtWidgets.QComboBox = widgets["preset"]
                 apps: QtWidgets.QLabel = widgets["apps"]
 
+                if self._is_channel_locked(channel) or slider.isSliderDown():
+                    self._channel_refresh_pending = True
                 vol = channel_volume.get(channel)
                 if isinstance(vol, int) and not slider.isSliderDown() and not self._is_channel_locked(channel):
                     slider.blockSignals(True)
@@ -408,6 +454,14 @@ class TrayDashboardWindow(QtWidgets.QWidget):
         except Exception:
             pass
 
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        self._service.set_visible(True)
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        super().hideEvent(event)
+        self._service.set_visible(False)
+
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         event.ignore()
         self.hide()